@@ -0,0 +1 @@
+"""Benchmarks of the simplexers runnable with asv or benchmarks/run.py."""
@@ -0,0 +1,137 @@
+"""Benchmarks of the run time and peak memory of every method of the positive
+and capped simplexers across batch shapes, sum constraints, dtypes and axes.
+
+The suites follow the asv conventions so they run with 'asv run' from the
+repository root. They also run without asv with 'python benchmarks/run.py'.
+
+Classes:
+    PositiveSuite:
+        Benchmarks of the positive_simplexer.
+    CappedSuite:
+        Benchmarks of the capped_simplexer.
+    ImportSuite:
+        Benchmarks of the time to import the simplexers in a fresh
+        interpreter.
+"""
+
+# asv passes every parameter to each benchmark method
+# pylint: disable=unused-argument
+
+from typing import Tuple
+
+import numpy as np
+
+from simplexers import capped
+from simplexers import positive
+from simplexers.core import compiled
+
+# (vectors, components) shapes of at most 1e6 elements
+SHAPES = [
+    (rows, components)
+    for rows in (1, 100, 10_000)
+    for components in (10, 100, 1_000, 10_000, 1_000_000)
+    if rows * components <= 1_000_000
+]
+
+SUMS = [1, 5, 50]
+
+DTYPES = ['float32', 'float64']
+
+AXES = [0, 1]
+
+# methods whose cost grows quadratically with the number of components
+QUADRATIC = {'sort'}
+
+# the largest number of components benchmarked for quadratic methods, whose
+# NumPy implementations loop over the components of each vector in Python
+MAX_QUADRATIC = 1_000 if compiled.AVAILABLE else 100
+
+
+def _batch(
+    shape: Tuple[int, int],
+    dtype: str,
+    axis: int,
+) -> np.ndarray:
+    """Returns a reproducible batch of normal vectors with components along
+    axis."""
+
+    rng = np.random.default_rng(0)
+    arr = rng.normal(scale=2, size=shape).astype(dtype)
+    return arr if axis == 1 else np.ascontiguousarray(arr.T)
+
+
+class PositiveSuite:
+    """Benchmarks of each method of the positive_simplexer."""
+
+    params = [SHAPES, list(positive.METHODS), SUMS, DTYPES, AXES]
+    param_names = ['shape', 'method', 's', 'dtype', 'axis']
+    timeout = 300
+
+    def setup(self, shape, method, s, dtype, axis):
+        """Builds the batch to project."""
+
+        # pylint: disable-next=attribute-defined-outside-init
+        self.arr = _batch(shape, dtype, axis)
+
+    def time_projection(self, shape, method, s, dtype, axis):
+        """Times the projection of the batch."""
+
+        positive.positive_simplexer(self.arr, s, axis=axis, method=method)
+
+    def peakmem_projection(self, shape, method, s, dtype, axis):
+        """Measures the peak memory of the projection of the batch."""
+
+        positive.positive_simplexer(self.arr, s, axis=axis, method=method)
+
+
+class CappedSuite:
+    """Benchmarks of each method of the capped_simplexer."""
+
+    params = [SHAPES, list(capped.METHODS), SUMS, DTYPES, AXES]
+    param_names = ['shape', 'method', 's', 'dtype', 'axis']
+    timeout = 300
+
+    def setup(self, shape, method, s, dtype, axis):
+        """Builds the batch to project skipping infeasible sums & quadratic
+        methods on long vectors.
+
+        Raises:
+            A NotImplementedError, asv's signal to skip a benchmark, for
+            skipped parameters.
+        """
+
+        components = shape[1]
+        if s >= components:
+            raise NotImplementedError('s must be less than the components')
+        if method in QUADRATIC and components > MAX_QUADRATIC:
+            raise NotImplementedError('quadratic method on long vectors')
+
+        # pylint: disable-next=attribute-defined-outside-init
+        self.arr = _batch(shape, dtype, axis)
+
+    def time_projection(self, shape, method, s, dtype, axis):
+        """Times the projection of the batch."""
+
+        capped.capped_simplexer(self.arr, s, axis=axis, method=method)
+
+    def peakmem_projection(self, shape, method, s, dtype, axis):
+        """Measures the peak memory of the projection of the batch."""
+
+        capped.capped_simplexer(self.arr, s, axis=axis, method=method)
+
+
+class ImportSuite:
+    """Benchmarks of the time to import the simplexers in a fresh interpreter.
+
+    Each benchmark returns code that asv runs in a new process so no module
+    is cached from an earlier import.
+    """
+
+    params = [['simplexers', 'simplexers.positive', 'simplexers.capped']]
+    param_names = ['module']
+    timeout = 60
+
+    def timeraw_import(self, module):
+        """Returns the code importing module to be timed."""
+
+        return f'import {module}'
@@ -0,0 +1,183 @@
+"""Runs the simplexer benchmark suites without asv and records the best run
+time and the peak traced memory of every parameter combination and, with
+--imports, the time to import each simplexer module in a fresh interpreter.
+
+Typical usage example:
+    $ python benchmarks/run.py --suites capped --max-size 100000 \\
+        --imports --output results.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+# run.py is run as a script from within the benchmarks directory
+# pylint: disable-next=import-error
+from bench_simplexers import CappedSuite
+from bench_simplexers import ImportSuite  # pylint: disable=import-error
+from bench_simplexers import PositiveSuite  # pylint: disable=import-error
+
+SUITES = {'positive': PositiveSuite, 'capped': CappedSuite}
+
+
+def run_imports(repeat: int = 3) -> List[Dict]:
+    """Times the import of each module of the ImportSuite in a fresh
+    interpreter and returns a record of each module's best time in seconds.
+
+    Args:
+        repeat:
+            The number of timed imports of which the fastest is recorded.
+
+    Returns:
+        A list of dicts, one per module, of the suite name, the module and the
+        time of its import excluding the interpreter startup.
+    """
+
+    suite = ImportSuite()
+    records = []
+    for (module,) in itertools.product(*ImportSuite.params):
+        code = (
+            'import time\n'
+            'start = time.perf_counter()\n'
+            f'{suite.timeraw_import(module)}\n'
+            'print(time.perf_counter() - start)'
+        )
+        timings = []
+        for _ in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, '-c', code],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            timings.append(float(completed.stdout))
+
+        records.append(
+            {'suite': 'imports', 'module': module, 'seconds': min(timings)}
+        )
+        print(f'{"imports":>8} {module:>30} {min(timings):10.6f}s')
+
+    return records
+
+
+def _timeout(_signum, _frame) -> None:
+    """Raises a TimeoutError when the alarm of a benchmark expires."""
+
+    raise TimeoutError
+
+
+def run_suite(
+    name: str,
+    repeat: int = 3,
+    max_size: int = 1_000_000,
+    timeout: Optional[float] = None,
+) -> List[Dict]:
+    """Runs every parameter combination of a suite and returns a record of
+    each combination's best time in seconds and peak memory in bytes.
+
+    Args:
+        name:
+            The name of a suite in SUITES.
+        repeat:
+            The number of timed projections of which the fastest is recorded.
+        max_size:
+            The largest number of elements of the benchmarked batches.
+        timeout:
+            The seconds after which the benchmarks of a parameter combination
+            are abandoned. If None, the suite's timeout is used.
+
+    Returns:
+        A list of dicts, one per benchmarked parameter combination, of the
+        suite name, the parameters, and the time and peak memory or the
+        timeout of combinations that were abandoned.
+
+    Raises:
+        Any error raised by a projection so that failures are never recorded
+        as results.
+    """
+
+    suite_cls = SUITES[name]
+    timeout = suite_cls.timeout if timeout is None else timeout
+    signal.signal(signal.SIGALRM, _timeout)
+    records = []
+    for params in itertools.product(*suite_cls.params):
+        if math.prod(params[0]) > max_size:
+            continue
+
+        suite = suite_cls()
+        try:
+            suite.setup(*params)
+        except NotImplementedError:
+            continue
+
+        record = dict(zip(suite_cls.param_names, params))
+        record['suite'] = name
+        label = (
+            f'{name:>8} {str(params[0]):>14} {params[1]:>10} s={params[2]:<3}'
+            f' {params[3]:>7} axis={params[4]}'
+        )
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                suite.time_projection(*params)
+                timings.append(time.perf_counter() - start)
+
+            # numpy reports its allocations to tracemalloc
+            tracemalloc.start()
+            suite.peakmem_projection(*params)
+            _, peak = tracemalloc.get_traced_memory()
+        except TimeoutError:
+            record['timeout'] = timeout
+            records.append(record)
+            print(f'{label} timed out after {timeout}s')
+            continue
+        except Exception:
+            print(f'{label} failed')
+            raise
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            tracemalloc.stop()
+
+        record.update(seconds=min(timings), peak_bytes=peak)
+        records.append(record)
+        print(f'{label} {min(timings):10.6f}s {peak / 2**20:10.2f}MiB')
+
+    return records
+
+
+def main() -> None:
+    """Parses command line arguments, runs the suites and writes the records
+    to a JSON file."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--suites', nargs='+', default=list(SUITES), choices=list(SUITES)
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-size', type=int, default=1_000_000)
+    parser.add_argument('--timeout', type=float, default=None)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--imports', action='store_true')
+    args = parser.parse_args()
+
+    records = run_imports(args.repeat) if args.imports else []
+    for name in args.suites:
+        records.extend(
+            run_suite(name, args.repeat, args.max_size, args.timeout)
+        )
+
+    with open(args.output, 'w', encoding='utf-8') as outfile:
+        json.dump(records, outfile, indent=4, default=str)
+
+
+if __name__ == '__main__':
+    main()
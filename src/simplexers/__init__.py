@@ -1,3 +1,48 @@
-"""simplexers current version"""
+"""simplexers current version and projections onto positive and capped
+simplices.
+
+The simplexers are loaded on first access so importing the package stays fast.
+
+Functions:
+    positive_simplexer:
+        Computes the Euclidean projection of 1-D arrays onto the positive
+        simplex.
+    capped_simplexer:
+        Computes the Euclidean projection of 1-D array(s) onto the s-capped
+        simplex.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from simplexers.capped import capped_simplexer
+    from simplexers.positive import positive_simplexer
 
 __version__ = "1.0.0"
+
+__all__ = ['positive_simplexer', 'capped_simplexer']
+
+# the module of each lazily loaded attribute
+_LAZY = {
+    'positive_simplexer': 'simplexers.positive',
+    'capped_simplexer': 'simplexers.capped',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Returns a simplexer importing its module on first access."""
+
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    attr = getattr(importlib.import_module(_LAZY[name]), name)
+    # cache the simplexer so later accesses bypass this function
+    globals()[name] = attr
+    return attr
+
+
+def __dir__() -> List[str]:
+    """Returns the module attributes including the lazy simplexers."""
+
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,289 @@
+"""A simplexer that projects 1-D arrays onto weighted and box-constrained
+simplices.
+
+Functions:
+    boxed_simplexer:
+        Computes the Euclidean projection of 1-D array(s) onto the set of
+        vectors satisfying a weighted sum constraint and per-component bounds.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import arraytools
+from simplexers.core import roots
+from simplexers.core.workspace import Workspace
+
+
+def _flatten_param(
+    x: npt.ArrayLike,
+    shape: Tuple[int, ...],
+    axis: int,
+    dtype: npt.DTypeLike = float,
+) -> npt.NDArray:
+    """Returns a per-component parameter as a 0-D array if it is a scalar or
+    as a 2-D array aligned with the rows of flatten_along_axis otherwise.
+
+    Parameters shared across vectors are returned as views with zero strides
+    whenever possible so that they are never copied to the size of the batch.
+    """
+
+    x = np.asarray(x, dtype=dtype)
+    if not x.ndim:
+        return x
+
+    ax = arraytools.normalize_axis(axis, len(shape))
+    moved = np.moveaxis(np.broadcast_to(x, shape), ax, -1)
+    return moved.reshape(-1, shape[ax])
+
+
+def _take_rows(x: npt.NDArray, rows: npt.NDArray) -> npt.NDArray:
+    """Returns the rows of a 2-D parameter or the parameter if it is 0-D."""
+
+    return x[rows] if x.ndim else x
+
+
+def _brackets(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    weights: npt.NDArray,
+    lower: npt.NDArray,
+    upper: npt.NDArray,
+) -> Tuple[npt.NDArray, npt.NDArray]:
+    """Returns 1-D arrays of gammas at which the weighted sums of each vector's
+    clipped components are at least and at most its sum constraint.
+
+    Raises:
+        A ValueError is issued if the weighted sum constraint of any vector
+        can not be met within the bounds or if a vector has components that are
+        unbounded below and components that are unbounded above.
+    """
+
+    # the weighted mass each vector must place above its lower bounds & mass
+    # it must remove below its upper bounds
+    weighted_lower = np.sum(np.broadcast_to(weights * lower, arr.shape), axis=1)
+    weighted_upper = np.sum(np.broadcast_to(weights * upper, arr.shape), axis=1)
+    excess = s[:, 0] - weighted_lower
+    deficit = weighted_upper - s[:, 0]
+    if np.any(excess < 0) or np.any(deficit < 0):
+        msg = 'Sum constraint can not be met within the lower & upper bounds'
+        raise ValueError(msg)
+
+    # at gamma_low all components are at least ceiling & sum to at least s
+    # while at gamma_high all components are at most floor & sum to at most s
+    # fmin & fmax discard the nans of infinite bounds offset by infinite mass
+    with np.errstate(invalid='ignore'):
+        ceiling = np.fmin(upper, lower + excess[:, np.newaxis] / weights)
+        floor = np.fmax(lower, upper - deficit[:, np.newaxis] / weights)
+    gamma_lows = np.min((arr - ceiling) / weights, axis=1)
+    gamma_highs = np.max((arr - floor) / weights, axis=1)
+    if not np.all(np.isfinite(gamma_lows) & np.isfinite(gamma_highs)):
+        msg = 'Components can not be unbounded both above and below'
+        raise ValueError(msg)
+
+    return gamma_lows, gamma_highs
+
+
+def _bisection_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    weights: npt.NDArray,
+    lower: npt.NDArray,
+    upper: npt.NDArray,
+    *,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the Lagrange multiplier of the Euclidean projection of each
+    1-D array in arr onto a weighted box-constrained simplex.
+
+    The critical point of the projection's Lagrangian is the vector x with
+    components x_i = min(u_i, max(y_i - gamma * w_i, l_i)). The weighted sum of
+    these components is a non-increasing piecewise linear function of gamma so
+    the gamma meeting the sum constraint is located for all vectors at once
+    with a safeguarded Newton-Raphson method. This generalizes the critical
+    point method of the capped simplexer to arbitrary weights and bounds.
+
+    Args:
+        arr:
+            A 2-D numpy array of vectors to project. It is assumed the axis of
+            arr containing the vector elements to project is the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of weighted sum constraints one
+            per vector in arr.
+        weights:
+            A 0-D array or a 2-D array matching arr of positive weights.
+        lower:
+            A 0-D array or a 2-D array matching arr of lower bounds.
+        upper:
+            A 0-D array or a 2-D array matching arr of upper bounds.
+        xtol:
+            The absolute tolerance of the located gamma for each vector.
+        rtol:
+            The relative tolerance of the located gamma for each vector.
+        maxiter:
+            The maximum number of Newton or bisection iterations.
+        workspace:
+            A Workspace whose buffers hold the clipped components and the masks
+            of components strictly between their bounds. If None, the buffers
+            are allocated for this call only.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        gamma of each vector's projection.
+
+    Raises:
+        A ValueError is issued if the weighted sum constraint of any vector
+        can not be met within the bounds or if a vector has components that are
+        unbounded below and components that are unbounded above.
+    """
+
+    ws = Workspace() if workspace is None else workspace
+    shape = arr.shape
+    gamma_lows, gamma_highs = _brackets(arr, s, weights, lower, upper)
+
+    def omega_prime(gamma, rows):
+        """Derivative of the projection Lagrangian wrt gamma and its slope for
+        the vectors of arr at rows."""
+
+        w = _take_rows(weights, rows)
+        low, high = _take_rows(lower, rows), _take_rows(upper, rows)
+
+        # rows are valid so clip mode lets take write to clipped unbuffered
+        clipped = ws.get('clipped', shape, arr.dtype)[: len(rows)]
+        np.take(arr, rows, axis=0, out=clipped, mode='clip')
+        clipped -= gamma[:, np.newaxis] * w
+        np.clip(clipped, low, high, out=clipped)
+
+        interior = ws.get('mask', shape, bool)[: len(rows)]
+        below = ws.get('below', shape, bool)[: len(rows)]
+        np.greater(clipped, low, out=interior)
+        interior &= np.less(clipped, high, out=below)
+
+        clipped *= w
+        value = s[rows, 0] - np.sum(clipped, axis=1)
+        squared = np.broadcast_to(w * w, interior.shape)
+        slope = np.sum(squared, axis=1, where=interior)
+        return value, slope
+
+    gammas = roots.newton_bisect(
+        omega_prime,
+        gamma_lows,
+        gamma_highs,
+        xtol=xtol,
+        rtol=rtol,
+        maxiter=maxiter,
+    )
+
+    return gammas[:, np.newaxis]
+
+
+def boxed_simplexer(
+    arr: npt.NDArray,
+    s: npt.ArrayLike = 1,
+    axis: int = -1,
+    *,
+    weights: npt.ArrayLike = 1,
+    lower: npt.ArrayLike = 0,
+    upper: npt.ArrayLike = 1,
+    out: Optional[npt.NDArray] = None,
+    inplace: bool = False,
+    workspace: Optional[Workspace] = None,
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each 1-D array in arr onto
+    a weighted box-constrained simplex.
+
+    The weighted box-constrained simplex projection locates the vector x
+    closest to vector y subject to per-component bounds and a weighted sum
+    constraint:
+
+    minimize {||x - y||**2 subject to l_i <= x_i <= u_i and sum(w_i * x_i) = s}
+
+    With unit weights, zero lower bounds and unit upper bounds this is the
+    projection onto the s-capped simplex and with infinite upper bounds it is
+    the projection onto the positive simplex. The solution is found by
+    locating the Lagrangian's critical points (Ref. 1) for all vectors at once.
+
+    Args:
+        arr:
+            An N-D numpy array of vectors to project.
+        s:
+            The weighted sum constraint for each vector. A scalar applies the
+            same constraint to every vector while an array broadcastable to the
+            shape of arr with axis removed gives each vector its own constraint.
+        axis:
+            The axis of arr containing vector components to project. Any axis
+            may be given.
+        weights:
+            The positive weights of the sum constraint. A scalar or an array
+            broadcastable to the shape of arr.
+        lower:
+            The lower bounds of the components. A scalar or an array
+            broadcastable to the shape of arr. Bounds may be -np.inf provided
+            that no upper bound is np.inf.
+        upper:
+            The upper bounds of the components. A scalar or an array
+            broadcastable to the shape of arr. Bounds may be np.inf provided
+            that no lower bound is -np.inf.
+        out:
+            An optional float array with the same shape as arr in which to
+            store the projections.
+        inplace:
+            If True, arr is overwritten with its projections and out is
+            ignored. Arr must then be a float array.
+        workspace:
+            An optional Workspace whose buffers hold the intermediate arrays of
+            the method. Reusing one workspace across calls that project
+            same-shaped arrays avoids reallocating these arrays on every call.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the root finder.
+
+    Returns:
+        An array of vector projections with the same shape as arr. Floating
+        arrays keep their dtype and other arrays are projected in float64.
+
+    Raises:
+        A ValueError is issued if any weight is not positive, if the weighted
+        sum constraint of any vector can not be met within the bounds or if
+        a vector has components that are unbounded below and components that
+        are unbounded above.
+
+    References:
+        1. Andersen Ang, Jianzhu Ma, Nianjun Liu, Kun Huang, Yijie Wang, Fast
+           Projection onto the Capped Simplex with Applications to Sparse
+           Regression in Bioinformatics. arXiv:2110.08471 [math.OC]
+    """
+
+    # zero weights divide the brackets by 0 & negative weights make the
+    # weighted sum non-monotone in the multiplier
+    if not np.all(np.asarray(weights) > 0):
+        raise ValueError('weights must be positive')
+
+    dtype = arraytools.working_dtype(arr.dtype)
+    z = arraytools.flatten_along_axis(arr, axis, dtype)
+    sums = arraytools.flatten_batch(s, arr.shape, axis, dtype)
+    gammas = _bisection_simplexer(
+        z,
+        sums,
+        _flatten_param(weights, arr.shape, axis, dtype),
+        _flatten_param(lower, arr.shape, axis, dtype),
+        _flatten_param(upper, arr.shape, axis, dtype),
+        workspace=workspace,
+        **kwargs,
+    )
+
+    # project in arr's own memory layout by broadcasting the multipliers
+    gammas = arraytools.unflatten_along_axis(gammas, arr.shape, axis)
+    shifts = gammas * np.asarray(weights, dtype=dtype)
+    if out is None and not inplace:
+        # float16 projections are rounded once from float32 differences
+        out = np.empty_like(arr, dtype=arraytools.result_dtype(arr.dtype))
+    result: npt.NDArray = np.subtract(arr, shifts, out=arr if inplace else out)
+    np.clip(result, lower, upper, out=result)
+
+    return result
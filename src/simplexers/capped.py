@@ -6,17 +6,31 @@ Functions:
         simplex.
 """
 
+from concurrent.futures import Executor
 from functools import partial
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
-from scipy import optimize
 
+from simplexers.core import arrayapi
 from simplexers.core import arraytools
-
-
-def _sorting_simplexer(arr: npt.NDArray, s: int) -> npt.NDArray:
+from simplexers.core import compiled
+from simplexers.core import costs
+from simplexers.core import feasibility
+from simplexers.core import parallel
+from simplexers.core import profiling
+from simplexers.core import results
+from simplexers.core import roots
+from simplexers.core import support
+from simplexers.core.workspace import Workspace
+
+
+def _sorting_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
     """Computes the Euclidean projection of each 1-D array in arr onto the
     s-capped simplex via the sorting algorithm.
 
@@ -31,27 +45,68 @@ def _sorting_simplexer(arr: npt.NDArray, s: int) -> npt.NDArray:
             It is assumed the axis of arr containing the vector elements to
             project is the last axis.
         s:
-            The sum constraint of the simplex
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            A Workspace whose buffers hold the sorted components and their
+            cumulative sums. If None, the buffers are allocated for this call
+            only.
 
     Returns:
-        A 2-D array of projected vectors with shape matching arr.
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        gamma of each vector's projection, min(1, max(arr - gamma, 0)).
 
     References:
         Projection onto the capped simplex. Weiran Wang and Canyi Lu.
         arXiv:1503.01002v1 [cs.LG]
     """
 
-    # get the number of vector components and sort them
-    n = arr.shape[1]
-    sorting_idxs = np.argsort(arr, axis=-1)
-    z = np.take_along_axis(arr, sorting_idxs, axis=-1)
-    # compute the cumulative sums of the components padding with boundary cond.
-    csums = np.cumsum(z, axis=1)
-    z = arraytools.pad_along_axis(z, (0, 1), constant_values=np.inf)
+    ws = Workspace() if workspace is None else workspace
+    # get the number of vector components and sort them after a boundary pad
+    m, n = arr.shape
+    with profiling.phase('capped.sort.sort'):
+        z = ws.get('sorted', (m, n + 1), arr.dtype)
+        z[:, n] = np.inf
+        z[:, :n] = arr
+        z[:, :n].sort(axis=-1)
+    # cumulative sums are accumulated in float64 as float32 sums drift when
+    # vectors are padded with components far from their multipliers
+    with profiling.phase('capped.sort.cumsum'):
+        dtype = np.promote_types(arr.dtype, np.float64)
+        csums = ws.get('cumsum', (m, n), dtype)
+        np.cumsum(z[:, :n], axis=1, dtype=dtype, out=csums)
+
+    with profiling.phase('capped.sort.partition'):
+        gammas = _partitions(z, csums, s)
+
+    return gammas
+
+
+def _partitions(
+    z: npt.NDArray,
+    csums: npt.NDArray,
+    s: npt.NDArray,
+) -> npt.NDArray:
+    """Returns the multipliers of the partitions of each sorted vector of z
+    that satisfy the KKT conditions of the capped simplex projection.
+
+    Args:
+        z:
+            A 2-D array of sorted vectors each padded with a trailing inf.
+        csums:
+            The float64 cumulative sums of the unpadded components of each
+            vector.
+        s:
+            A 2-D array of shape (len(z), 1) of sum constraints one per vector.
+
+    Returns:
+        A 2-D array of shape (len(z), 1) of Lagrange multipliers.
+    """
 
+    n = csums.shape[1]
     # for each vector compute the a,b partition that satisfies KKT conditions
-    result = np.zeros_like(arr)
-    for idx, (y, csum) in enumerate(zip(z, csums)):
+    gammas = np.zeros((len(z), 1), dtype=z.dtype)
+    for idx, (y, csum, target) in enumerate(zip(z, csums, s[:, 0])):
 
         for a in range(0, n):
             # y[a-1] is -np.inf and csum[a-1] is 0
@@ -59,7 +114,7 @@ def _sorting_simplexer(arr: npt.NDArray, s: int) -> npt.NDArray:
             low_csum = 0 if a == 0 else csum[a - 1]
 
             for b in range(a + 1, n + 1):
-                gamma = (s + b - n - csum[b - 1] + low_csum) / (b - a)
+                gamma = (target + b - n - csum[b - 1] + low_csum) / (b - a)
 
                 conditions = [
                     low + gamma <= 0,
@@ -79,19 +134,125 @@ def _sorting_simplexer(arr: npt.NDArray, s: int) -> npt.NDArray:
             break
 
         else:
-            # no b > a so a == b == n - s
-            a = b = n - s
+            # no b > a so a == b == n - s & any gamma in [1 - y[a], -y[a-1]]
+            gamma = 1 - y[n - int(target)]
 
-        # add the sorted components to projection then unsort
-        proj = np.zeros(n)
-        proj[a:b] = y[a:b] + gamma
-        proj[b:] = 1
-        result[idx, sorting_idxs[idx]] = proj
+        # Wang & Lu shift by +gamma but this module's convention is -gamma
+        gammas[idx] = -gamma
 
-    return result
+    return gammas
 
 
-def _root_simplexer(arr: npt.NDArray, s: float, **kwargs) -> npt.NDArray:
+def _breakpoint_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each 1-D array in arr onto the
+    s-capped simplex via a search over the breakpoints of the Lagrangian's
+    derivative.
+
+    The sum of the projection's components, sum(min(1, max(y - gamma, 0))), is
+    a non-increasing piecewise linear function of gamma whose slope changes
+    only at the 2n breakpoints y_i - 1 and y_i. This method sorts the
+    breakpoints of every vector once and accumulates the sum at each breakpoint
+    with a cumulative scan. The gamma meeting the sum constraint is then
+    interpolated exactly on the linear piece bracketing s. The method is
+    O(n*log(n)) and is vectorized across all vectors of arr so it is suitable
+    for vectors with thousands of components.
+
+    Args:
+        arr:
+            A 2-D numpy array of vectors to project onto the s-capped simplex.
+            It is assumed the axis of arr containing the vector elements to
+            project is the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            A Workspace whose buffers hold the breakpoints, their slopes and the
+            component sums. If None, the buffers are allocated for this call
+            only.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        gamma of each vector's projection, min(1, max(arr - gamma, 0)).
+    """
+
+    ws = Workspace() if workspace is None else workspace
+    m, n = arr.shape
+    shape = (m, 2 * n)
+    with profiling.phase('capped.breakpoint.sort'):
+        # the first n breakpoints are where components leave the cap
+        unsorted = ws.get('unsorted', shape, arr.dtype)
+        np.subtract(arr, 1, out=unsorted[:, :n])
+        unsorted[:, n:] = arr
+        order = np.argsort(unsorted, axis=1)
+
+    with profiling.phase('capped.breakpoint.cumsum'):
+        # the number of uncapped nonzero components right of each breakpoint
+        slopes = ws.get('slopes', shape, np.intp)
+        np.multiply(order < n, 2, out=slopes)
+        slopes -= 1
+        np.cumsum(slopes, axis=1, out=slopes)
+
+        # sort the breakpoints by indexing the flattened unsorted breakpoints,
+        # indices are valid so clip mode lets take write to out unbuffered
+        order += np.arange(0, m * 2 * n, 2 * n)[:, np.newaxis]
+        breaks = ws.get('breaks', shape, arr.dtype)
+        np.take(unsorted, order, out=breaks, mode='clip')
+
+        # component sums at each breakpoint starting from n at the first are
+        # accumulated in float64 as float32 scans drift over long vectors
+        sums = ws.get('sums', shape, np.promote_types(arr.dtype, np.float64))
+        sums[:, 0] = n
+        np.subtract(
+            breaks[:, 1:], breaks[:, :-1], out=sums[:, 1:], dtype=sums.dtype
+        )
+        sums[:, 1:] *= slopes[:, :-1]
+        np.cumsum(sums[:, 1:], axis=1, out=sums[:, 1:])
+        np.subtract(n, sums[:, 1:], out=sums[:, 1:])
+
+    with profiling.phase('capped.breakpoint.partition'):
+        # locate the last breakpoint whose sum exceeds s & interpolate to s
+        exceeds = np.greater(sums, s, out=ws.get('mask', shape, bool))
+        k = np.count_nonzero(exceeds, axis=1, keepdims=True) - 1
+        k = np.maximum(k, 0)
+        low = np.take_along_axis(breaks, k, axis=1)
+        low_sum = np.take_along_axis(sums, k, axis=1)
+        slope = np.take_along_axis(slopes, k, axis=1)
+        gammas: npt.NDArray = low + np.divide(
+            low_sum - s, slope, dtype=arr.dtype
+        )
+
+    return gammas
+
+
+def _brentq(
+    func: Callable[[float], float],
+    low: float,
+    high: float,
+    **kwargs,
+) -> Tuple[float, Any]:
+    """Returns the root of func in [low, high] and the RootResults of scipy's
+    brentq, importing scipy on first use to keep importing simplexers fast."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from scipy import optimize
+
+    root: Tuple[float, Any] = optimize.brentq(
+        func, low, high, full_output=True, **kwargs
+    )
+    return root
+
+
+def _root_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+    full_output: bool = False,
+    **kwargs,
+) -> npt.NDArray:
     """Computes the Euclidean projection of each 1-D array in arr onto the
     s-capped simplex via the critical points of the Lagrangian.
 
@@ -109,38 +270,243 @@ def _root_simplexer(arr: npt.NDArray, s: float, **kwargs) -> npt.NDArray:
         arr:
             A 2-D numpy array of vectors to project onto the s-capped simplex.
         s:
-            The sum constraint for each vector.
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            A Workspace whose buffer holds the shifted components of a vector
+            during each evaluation of the Lagrangian's derivative. If None, the
+            buffer is allocated for this call only.
+        full_output:
+            If True, the iteration count and convergence flag reported by
+            brentq for each vector follow its multiplier as two extra columns.
         kwargs:
             Any valid keyword only arguments for scipy.optimize.brentq function
 
     Returns:
-        A 2-D array of vector projections one per vector in arr.
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        gamma of each vector's projection, min(1, max(arr - gamma, 0)).
     """
 
     gamma_lows = np.min(arr, axis=1) - 1
     gamma_highs = np.max(arr, axis=1)
     brackets = np.stack((gamma_lows, gamma_highs)).T
 
+    ws = Workspace() if workspace is None else workspace
+    shifted = ws.get('shifted', arr.shape[1:], arr.dtype)
+
     def omega_prime(gamma, y, s):
         """Derivative of the projection Largrangian wrt gamma at the critical
         point x* for a 1-D vector y."""
 
-        return s - np.sum(np.minimum(1, np.maximum(y - gamma, 0)))
+        np.subtract(y, gamma, out=shifted)
+        return s - np.sum(np.clip(shifted, 0, 1, out=shifted))
 
-    result = np.zeros_like(arr)
-    for idx, (bracket, y) in enumerate(zip(brackets, arr)):
-        func = partial(omega_prime, y=y, s=s)
-        gamma_star = optimize.brentq(func, *bracket, **kwargs)
-        result[idx] = np.minimum(1, np.maximum(y - gamma_star, 0))
+    gammas = np.zeros((len(arr), 1), dtype=arr.dtype)
+    iterations = np.zeros(len(arr), dtype=int)
+    converged = np.ones(len(arr), dtype=bool)
+    with profiling.phase('capped.root.brentq'):
+        for idx, (bracket, y, target) in enumerate(
+            zip(brackets, arr, s[:, 0])
+        ):
+            func = partial(omega_prime, y=y, s=target)
+            gammas[idx], status = _brentq(func, *bracket, **kwargs)
+            iterations[idx] = status.iterations
+            converged[idx] = status.converged
 
-    return result
+    if full_output:
+        return results.columns(gammas, iterations, converged)
+
+    return gammas
+
+
+def _bisection_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    *,
+    guess: Optional[npt.NDArray] = None,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+    full_output: bool = False,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each 1-D array in arr onto the
+    s-capped simplex by simultaneously locating the critical points of every
+    vector's Lagrangian.
+
+    This is the critical point method of Ref. 1 vectorized across all vectors
+    in arr. Rather than calling a scalar root finder once per vector, a
+    safeguarded Newton-Raphson method operates on the brackets of all vectors
+    at once falling back to bisection whenever a Newton step leaves the
+    bracket [min(vector) - 1, max(vector)]. Since the Lagrangian's derivative
+    is piecewise linear in gamma, the Newton steps are exact once a bracket
+    isolates the correct linear piece. Starting from a guess near the solution,
+    as when projecting nearly the same vectors repeatedly, this happens after
+    very few iterations.
+
+    Args:
+        arr:
+            A 2-D numpy array of vectors to project onto the s-capped simplex.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        guess:
+            An optional 2-D array of shape (len(arr), 1) of initial multipliers
+            such as those of a previous projection.
+        xtol:
+            The absolute tolerance of the located gamma for each vector.
+        rtol:
+            The relative tolerance of the located gamma for each vector.
+        maxiter:
+            The maximum number of Newton or bisection iterations.
+        full_output:
+            If True, the iteration count and convergence flag of each vector
+            follow its multiplier as two extra columns.
+        workspace:
+            A Workspace whose buffers hold the shifted components and the masks
+            of uncapped nonzero components of each iteration. If None, the
+            buffers are allocated for this call only.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        gamma of each vector's projection, min(1, max(arr - gamma, 0)).
+
+    References:
+        1. Andersen Ang, Jianzhu Ma, Nianjun Liu, Kun Huang, Yijie Wang, Fast
+           Projection onto the Capped Simplex with Applications to Sparse
+           Regression in Bioinformatics. arXiv:2110.08471 [math.OC]
+    """
+
+    ws = Workspace() if workspace is None else workspace
+
+    def omega_prime(gamma, rows):
+        """Derivative of the projection Lagrangian wrt gamma and its slope for
+        the vectors of arr at rows."""
+
+        # rows are valid so clip mode lets take write to shifted unbuffered
+        shifted = ws.get('shifted', arr.shape, arr.dtype)[: len(rows)]
+        np.take(arr, rows, axis=0, out=shifted, mode='clip')
+        shifted -= gamma[:, np.newaxis]
+        np.clip(shifted, 0, 1, out=shifted)
+        value = s[rows, 0] - np.sum(shifted, axis=1)
+
+        interior = ws.get('mask', arr.shape, bool)[: len(rows)]
+        below = ws.get('below', arr.shape, bool)[: len(rows)]
+        np.greater(shifted, 0, out=interior)
+        interior &= np.less(shifted, 1, out=below)
+        slope = np.count_nonzero(interior, axis=1)
+        return value, slope
+
+    iterations = np.zeros(len(arr), dtype=int)
+    with profiling.phase('capped.bisect.newton'):
+        gammas = roots.newton_bisect(
+            omega_prime,
+            np.min(arr, axis=1) - 1,
+            np.max(arr, axis=1),
+            guess=None if guess is None else guess[:, 0],
+            xtol=xtol,
+            rtol=rtol,
+            maxiter=maxiter,
+            iterations=iterations,
+        )
+
+    if full_output:
+        return results.columns(gammas, iterations)
+
+    return gammas[:, np.newaxis]
+
+
+# the algorithms of the capped_simplexer keyed on method name
+METHODS: Dict[str, Callable[..., npt.NDArray]] = {
+    'sort': _sorting_simplexer,
+    'root': _root_simplexer,
+    'bisect': _bisection_simplexer,
+    'breakpoint': _breakpoint_simplexer,
+}
+
+
+# the compiled algorithms of the capped_simplexer keyed on method name
+COMPILED_METHODS: Dict[str, Callable[..., npt.NDArray]] = {
+    'sort': compiled.capped_sort,
+    'root': compiled.capped_root,
+}
+
+
+def _select_algorithm(
+    method: str,
+    backend: str,
+    shape: Tuple[int, int],
+    k: Optional[int],
+    keywords: Iterable[str],
+) -> Callable[..., npt.NDArray]:
+    """Returns the algorithm of a method and backend selecting the method
+    predicted to be fastest for a batch of shape if method is 'auto'.
+
+    'Auto' selects among the methods accepting the keyword arguments named in
+    keywords only. Compiled methods replace the NumPy methods only if they
+    accept these keywords. The compiled 'root' method accepts no brentq
+    keyword arguments so it replaces a requested 'root' method only if the
+    'numba' backend is given.
+
+    Raises:
+        A ValueError is issued if no method accepts the keywords for 'auto' or
+        if the compiled method of the 'numba' backend does not accept them.
+    """
+
+    use_compiled = compiled.use_compiled(backend)
+    if method == 'root' and backend != 'numba':
+        use_compiled = False
+    if method == 'auto':
+        candidates = [
+            name
+            for name, func in METHODS.items()
+            if costs.accepts(func, keywords)
+        ]
+        if not candidates:
+            msg = f'No method accepts the keyword arguments {sorted(keywords)}'
+            raise ValueError(msg)
+
+        m, n = shape
+        method = costs.get_model().select(
+            'capped',
+            candidates,
+            m,
+            n if k is None else min(k, n),
+            'numba' if use_compiled else 'numpy',
+        )
+
+    if not use_compiled or method not in COMPILED_METHODS:
+        return METHODS[method]
+
+    if costs.accepts(COMPILED_METHODS[method], keywords):
+        return COMPILED_METHODS[method]
+
+    if backend == 'numba':
+        msg = (
+            f"The compiled '{method}' method does not accept the keyword "
+            f"arguments {sorted(keywords)}"
+        )
+        raise ValueError(msg)
 
+    return METHODS[method]
 
+
+@profiling.instrument('capped')
+# pylint: disable-next=too-many-arguments
 def capped_simplexer(
     arr: npt.NDArray,
-    s: int = 1,
+    s: npt.ArrayLike = 1,
     axis: int = -1,
     method: str = 'root',
+    *,
+    k: Optional[int] = None,
+    out: Optional[npt.NDArray] = None,
+    inplace: bool = False,
+    workspace: Optional[Workspace] = None,
+    n_jobs: Optional[int | Executor] = None,
+    backend: str = 'auto',
+    check_feasible: bool = True,
+    info: Optional[results.ProjectionInfo] = None,
     **kwargs,
 ) -> npt.NDArray:
     """Computes the Euclidean projection of each 1-D array in arr onto the
@@ -152,32 +518,95 @@ def capped_simplexer(
     minimize {||x - y||**2 subject to 0 <= x_i <= 1 and sum(x_i) = s}
 
     This method finds this solution by locating the Lagrangian's critical points
-    (Ref. 1) or the sort algorithm (Ref. 2).
+    (Ref. 1), either one vector at a time or for all vectors at once, by an
+    exact search over the breakpoints of the Lagrangian's derivative, or by the
+    sort algorithm (Ref. 2).
 
     Args:
         arr:
-            A 2-D numpy array of vectors to project onto the s-capped simplex.
+            An N-D numpy array of vectors to project onto the s-capped simplex.
+            Float32 and float64 arrays are projected in their own precision
+            while float16 arrays are projected with float32 multipliers.
+            Arrays of other array API libraries, such as CuPy, PyTorch or
+            JAX, are projected in their own namespace by the 'bisect'
+            method of simplexers.core.arrayapi.
         s:
-            The sum constraint for each vector.
+            The sum constraint for each vector. A scalar applies the same
+            constraint to every vector while an array broadcastable to the
+            shape of arr with axis removed gives each vector its own constraint.
         axis:
             The axis of arr containing vector components to project onto the
-            simplex.
+            simplex. Any axis may be given.
         method:
             A string method name specifying the algorithm used to make the
-            projection. Must be one of {'root', 'sort'}. The 'root' method finds
-            the roots of the derivative of the Lagrangian using Brents method.
-            This method is O(n) where n is the number of vector components to
-            project (See Ref. 1). 'Sort' uses the O(n**2) sorting algorithm
-            (Ref. 2). For vectors with very few components it will have a speed
-            advantage.
+            projection. Must be one of {'root', 'bisect', 'breakpoint',
+            'sort', 'auto'}. The 'root' method finds the roots of the
+            derivative of the Lagrangian using Brents method. This method is
+            O(n) where n is the number of vector components to project (See
+            Ref. 1). 'Bisect' finds the same roots for all vectors
+            simultaneously using a safeguarded Newton-Raphson method and is the
+            fastest choice for large batches of vectors. 'Breakpoint' is an
+            exact O(n*log(n)) method that sorts the 2n breakpoints of the
+            Lagrangian's derivative and is suitable for vectors with thousands
+            of components. 'Sort' uses the O(n**2) sorting algorithm (Ref. 2).
+            For vectors with very few components it will have a speed
+            advantage. 'Auto' selects the method, among those accepting the
+            given keyword arguments, predicted to be fastest for the shape of
+            the batch and the backend by the cost model of
+            simplexers.core.costs, which simplexers.tuning.calibrate fits to
+            this machine. The model ignores the dtype and the sum
+            constraints of the batch.
+        k:
+            An optional upper bound on the number of nonzero components in each
+            projection. If given, the method is applied to only the k largest
+            components of each vector and vectors whose projections turn out to
+            have more than k nonzero components are reprojected using all of
+            their components. Since each component is at most 1, bounds
+            smaller than any sum constraint are ignored.
+        out:
+            An optional float array with the same shape as arr in which to
+            store the projections.
+        inplace:
+            If True, arr is overwritten with its projections and out is
+            ignored. Arr must then be a float array.
+        workspace:
+            An optional Workspace whose buffers hold the intermediate arrays of
+            the method. Reusing one workspace across calls that project
+            same-shaped arrays avoids reallocating these arrays on every call.
+        n_jobs:
+            The number of worker threads or a concurrent.futures Executor
+            across which chunks of vectors are projected. A negative number
+            uses one thread per CPU. The vectorized methods release the GIL
+            in NumPy and scale with threads while methods that loop over
+            vectors in Python require a ProcessPoolExecutor. If None, the
+            vectors are projected in this thread.
+        backend:
+            The implementation of the method. One of 'auto', 'numpy' or
+            'numba'. The 'numba' backend runs compiled loops for the 'sort'
+            and 'root' methods and requires numba. 'Auto' uses the 'sort' loop
+            whenever numba is installed and the NumPy methods otherwise. The
+            'root' method runs brentq unless the 'numba' backend is given.
+            Other methods always run in NumPy.
+        check_feasible:
+            If True, vectors already lying on the simplex are detected in one
+            vectorized pass and returned without running the method. The pass
+            speeds up iterative solvers whose vectors are mostly feasible but
+            adds a few percent to the time of batches of infeasible vectors,
+            which may skip it by passing False.
+        info:
+            An optional ProjectionInfo that is filled with the multipliers,
+            support sizes, cap sizes, iteration counts and convergence flags
+            of the projections. Computing these costs one extra pass over the
+            projections rather than a second projection.
         kwargs:
             Any valid keyword only arguments for scipy.optimize.brentq function
+            if method is 'root' or the xtol, rtol and maxiter tolerances if
+            method is 'bisect'. The compiled 'root' method accepts only the
+            xtol, rtol and maxiter tolerances.
 
     Returns:
-        A 2-D array of vector projections one per vector in arr.
-
-    Raises:
-        A ValueError is issued if the input arr is not 1D or 2D.
+        An array of vector projections with the same shape as arr. Floating
+        arrays keep their dtype and other arrays are projected in float64.
 
     References:
         1. Andersen Ang, Jianzhu Ma, Nianjun Liu, Kun Huang, Yijie Wang, Fast
@@ -187,18 +616,52 @@ def capped_simplexer(
            arXiv:1503.01002v1 [cs.LG]
     """
 
-    if arr.ndim > 2:
-        msg = 'Array(s) to project must have at most 2 dimensions'
-        raise ValueError(msg)
-
-    methods: Dict[str, Callable] = {
-        'sort': _sorting_simplexer,
-        'root': _root_simplexer,
-    }
-    algorithm = methods[method]
+    if not isinstance(arr, np.ndarray):
+        # options requiring ndarrays are rejected by the array API methods
+        return arrayapi.project(
+            'capped',
+            arr,
+            s,
+            axis,
+            method,
+            k=k,
+            out=out,
+            inplace=inplace,
+            n_jobs=n_jobs,
+            info=info,
+            **kwargs,
+        )
+
+    with profiling.phase('capped.flatten'):
+        dtype = arraytools.working_dtype(arr.dtype)
+        z = arraytools.flatten_along_axis(arr, axis, dtype)
+        sums = arraytools.flatten_batch(s, arr.shape, axis, dtype)
+    # at least s components are nonzero so smaller bounds can't be satisfied
+    k = None if k is not None and k < np.max(sums) else k
+    algorithm = _select_algorithm(method, backend, z.shape, k, kwargs)
+    if check_feasible:
+        # vectors already on the simplex are their own projections
+        algorithm = partial(
+            feasibility.feasible_multipliers, algorithm, cap=1
+        )
+    if info is not None:
+        algorithm = partial(results.diagnose, algorithm)
+    algorithm = partial(support.topk_multipliers, algorithm, k=k, **kwargs)
+    with profiling.phase('capped.multipliers'):
+        diagnostics = parallel.map_rows(algorithm, z, sums, n_jobs, workspace)
+    with profiling.phase('capped.project'):
+        # project in arr's own memory layout by broadcasting the multipliers
+        gammas = arraytools.unflatten_along_axis(
+            diagnostics[:, :1], arr.shape, axis
+        )
+        if out is None and not inplace:
+            # float16 projections are rounded once from float32 differences
+            out = np.empty_like(arr, dtype=arraytools.result_dtype(arr.dtype))
+        result: npt.NDArray = np.subtract(
+            arr, gammas, out=arr if inplace else out
+        )
+        np.clip(result, 0, 1, out=result)
+    if info is not None:
+        info.record(diagnostics, result, axis, cap=1)
 
-    z = np.atleast_2d(arr)
-    z = z.T if axis == 0 else z
-    result: npt.NDArray = algorithm(z, s, **kwargs)
-
-    return result.T if axis == 0 else result
+    return result
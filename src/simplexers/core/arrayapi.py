@@ -0,0 +1,261 @@
+"""Module of projection methods written against the Python array API standard
+so that arrays of libraries other than NumPy are projected without being
+converted to NumPy arrays.
+
+The simplexers dispatch arrays that are not ndarrays to this module. Each
+method uses only functions of the array's own namespace, so CuPy arrays stay
+on their device and PyTorch or JAX arrays are never copied to and from NumPy.
+The methods are the fully vectorized methods of the simplexers. Options that
+rely on NumPy's memory model, such as out, inplace, workspaces and worker
+pools, are not available.
+
+Functions:
+    project:
+        Computes the Euclidean projection of each 1-D array of an array API
+        array along an axis onto the positive or s-capped simplex.
+"""
+
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from simplexers.core import arraytools
+
+# the component bounds of each simplex's projections
+BOUNDS: Dict[str, Tuple[float, Optional[float]]] = {
+    'positive': (0, None),
+    'capped': (0, 1),
+}
+
+# options of the simplexers that require ndarrays
+NUMPY_OPTIONS = ('k', 'out', 'inplace', 'n_jobs', 'info')
+
+
+def _positive_sort(xp: ModuleType, arr: Any, s: Any) -> Any:
+    """Returns the positive simplex multiplier of each row of arr using the
+    sorting algorithm of Ref. 1 of the positive simplexer."""
+
+    n = arr.shape[-1]
+    mus = xp.flip(xp.sort(arr, axis=-1), axis=-1)
+    css = xp.cumulative_sum(mus, axis=-1) - s
+    ranks = xp.arange(1, n + 1)
+    # mus descend so the count of positive shifted components is rho
+    positives = mus - css / xp.astype(ranks, arr.dtype) > 0
+    rho = xp.sum(xp.astype(positives, xp.int64), axis=-1, keepdims=True)
+    # select each row's cumulative sum at rho without take_along_axis
+    selected = xp.where(ranks == rho, css, xp.zeros_like(css))
+    return xp.sum(selected, axis=-1, keepdims=True) / xp.astype(rho, arr.dtype)
+
+
+def _newton_bisect(
+    xp: ModuleType,
+    func: Callable[[Any], Tuple[Any, Any]],
+    lows: Any,
+    highs: Any,
+    xtol: float,
+    rtol: float,
+    maxiter: int,
+) -> Any:
+    """Locates the root of each function in a batch of monotonically
+    increasing functions with the safeguarded Newton-Raphson method of
+    roots.newton_bisect.
+
+    Array API arrays may not support assignment to index arrays so every
+    function is evaluated on each iteration until all roots are located.
+
+    Raises:
+        A RuntimeError is issued if any function fails to converge within
+        maxiter iterations.
+    """
+
+    x = (lows + highs) / 2
+    # bracket ends not yet evaluated may themselves be roots
+    lows_open = xp.ones(x.shape, dtype=xp.bool)
+    highs_open = xp.ones(x.shape, dtype=xp.bool)
+    done = xp.zeros(x.shape, dtype=xp.bool)
+    for _ in range(maxiter):
+
+        fx, dfx = func(x)
+        lows = xp.where(fx < 0, x, lows)
+        highs = xp.where(fx > 0, x, highs)
+        lows_open = lows_open & (fx >= 0)
+        highs_open = highs_open & (fx <= 0)
+
+        # converged if the bracket or the Newton step is within tolerance
+        magnitude = xp.abs(x)
+        ulp = xp.nextafter(magnitude, xp.full_like(x, float('inf'))) - magnitude
+        tol = xp.maximum(xtol + rtol * magnitude, 4 * ulp)
+        sloped = dfx > 0
+        step = fx / xp.where(sloped, dfx, xp.ones_like(dfx))
+        newton = x - step
+        converged = (
+            (fx == 0) | (highs - lows <= tol) | (sloped & (xp.abs(step) <= tol))
+        )
+        above = (newton > lows) | ((newton == lows) & lows_open)
+        below = (newton < highs) | ((newton == highs) & highs_open)
+        inside = sloped & above & below
+        stepped = xp.where(inside, newton, (lows + highs) / 2)
+        x = xp.where(done | converged, x, stepped)
+
+        done = done | converged
+        if xp.all(done):
+            return x
+
+    msg = f'Failed to converge after {maxiter} iterations'
+    raise RuntimeError(msg)
+
+
+def _positive_bisect(
+    xp: ModuleType,
+    arr: Any,
+    s: Any,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+) -> Any:
+    """Returns the positive simplex multiplier of each row of arr located by
+    a vectorized safeguarded Newton-Raphson method."""
+
+    targets = s[:, 0]
+
+    def omega_prime(theta):
+        """Derivative of the projection Lagrangian wrt theta and its slope."""
+
+        shifted = arr - xp.expand_dims(theta, axis=1)
+        positives = shifted > 0
+        total = xp.sum(xp.where(positives, shifted, xp.zeros_like(arr)), axis=1)
+        slope = xp.sum(xp.astype(positives, arr.dtype), axis=1)
+        return targets - total, slope
+
+    maxima = xp.max(arr, axis=1)
+    thetas = _newton_bisect(
+        xp, omega_prime, maxima - targets, maxima, xtol, rtol, maxiter
+    )
+    return xp.expand_dims(thetas, axis=1)
+
+
+def _capped_bisect(
+    xp: ModuleType,
+    arr: Any,
+    s: Any,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+) -> Any:
+    """Returns the capped simplex multiplier of each row of arr located by
+    a vectorized safeguarded Newton-Raphson method."""
+
+    targets = s[:, 0]
+
+    def omega_prime(gamma):
+        """Derivative of the projection Lagrangian wrt gamma and its slope."""
+
+        shifted = xp.clip(arr - xp.expand_dims(gamma, axis=1), min=0, max=1)
+        interior = (shifted > 0) & (shifted < 1)
+        slope = xp.sum(xp.astype(interior, arr.dtype), axis=1)
+        return targets - xp.sum(shifted, axis=1), slope
+
+    lows = xp.min(arr, axis=1) - 1
+    gammas = _newton_bisect(
+        xp, omega_prime, lows, xp.max(arr, axis=1), xtol, rtol, maxiter
+    )
+    return xp.expand_dims(gammas, axis=1)
+
+
+# the array API methods of each simplex keyed on method name, the 'root'
+# method of the capped simplexer locates the same roots as 'bisect'
+METHODS: Dict[str, Dict[str, Callable[..., Any]]] = {
+    'positive': {
+        'sort': _positive_sort,
+        'bisect': _positive_bisect,
+        'auto': _positive_sort,
+    },
+    'capped': {
+        'root': _capped_bisect,
+        'bisect': _capped_bisect,
+        'auto': _capped_bisect,
+    },
+}
+
+
+def _working_dtype(xp: ModuleType, dtype: Any) -> Any:
+    """Returns the dtype in which arrays of dtype are projected."""
+
+    if not xp.isdtype(dtype, 'real floating'):
+        return xp.float64
+
+    # half precision sums are accumulated in float32
+    return xp.float32 if xp.finfo(dtype).bits < 32 else dtype
+
+
+def project(
+    simplex: str,
+    arr: Any,
+    s: Any = 1,
+    axis: int = -1,
+    method: str = 'auto',
+    **kwargs,
+) -> Any:
+    """Computes the Euclidean projection of each 1-D array of an array API
+    array along axis onto the positive or s-capped simplex.
+
+    Args:
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        arr:
+            An N-D array of any array API namespace.
+        s:
+            The sum constraint of each vector. A scalar or an array of the
+            namespace of arr broadcastable to the shape of arr with axis
+            removed.
+        axis:
+            The axis of arr containing vector components.
+        method:
+            The name of the method. One of {'sort', 'bisect', 'auto'} for the
+            positive simplex and one of {'root', 'bisect', 'auto'} for the
+            capped simplex.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the 'bisect' and 'root'
+            methods. The workspace and backend options of the simplexers are
+            accepted and ignored.
+
+    Returns:
+        An array of arr's namespace of the projections of arr. Floating arrays
+        keep their dtype and other arrays are projected in float64.
+
+    Raises:
+        A ValueError is issued if method is not available for array API arrays
+        or if an option requiring ndarrays is given.
+
+    Examples:
+        >>> import numpy as np
+        >>> x = np.array([[0.2, 1.9, 0.7, -0.4]])
+        >>> project('capped', x, 2)
+        array([[0.25, 1.  , 0.75, 0.  ]])
+    """
+
+    methods = METHODS[simplex]
+    if method not in methods:
+        msg = f'method must be one of {list(methods)} for array API arrays'
+        raise ValueError(msg)
+
+    for name in NUMPY_OPTIONS:
+        if kwargs.pop(name, None):
+            msg = f'{name} is only supported for NumPy arrays'
+            raise ValueError(msg)
+    kwargs.pop('workspace', None)
+    kwargs.pop('backend', None)
+
+    xp = arraytools.array_namespace(arr)
+    dtype = _working_dtype(xp, arr.dtype)
+    z = arraytools.flatten_along_axis(arr, axis, dtype)
+    sums = arraytools.flatten_batch(xp.asarray(s, dtype=dtype), arr.shape, axis)
+    multipliers = methods[method](xp, z, sums, **kwargs)
+    multipliers = arraytools.unflatten_along_axis(multipliers, arr.shape, axis)
+
+    low, high = BOUNDS[simplex]
+    result = xp.clip(xp.astype(arr, dtype) - multipliers, min=low, max=high)
+    if xp.isdtype(arr.dtype, 'real floating'):
+        result = xp.astype(result, arr.dtype)
+
+    return result
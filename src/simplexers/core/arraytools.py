@@ -1,10 +1,54 @@
-"""Module of tools for manipulating the size and values of ndarrays."""
+"""Module of tools for manipulating the size and values of ndarrays.
 
-from typing import Optional, Tuple
+The tools that reshape arrays also accept the arrays of any library that
+implements the Python array API standard, such as CuPy, JAX or PyTorch, and
+return arrays of the same library.
+"""
+
+from types import ModuleType
+from typing import Any, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+try:
+    import array_api_compat
+except ImportError:
+    array_api_compat = None
+
+
+def array_namespace(*arrays: Any) -> ModuleType:
+    """Returns the array API namespace shared by arrays.
+
+    Arrays that do not implement the array API standard, such as Python
+    scalars, belong to no namespace and NumPy is returned if no array does.
+    If array-api-compat is installed it supplies the namespaces of libraries,
+    like PyTorch, that do not implement the standard themselves.
+
+    Raises:
+        A TypeError is issued if arrays belong to more than one namespace.
+
+    Examples:
+        >>> array_namespace(np.ones(3), 2.0) is np
+        True
+    """
+
+    if array_api_compat is not None:
+        is_array = array_api_compat.is_array_api_obj
+        arrays = tuple(x for x in arrays if is_array(x))
+        return array_api_compat.array_namespace(*arrays) if arrays else np
+
+    namespaces = {
+        x.__array_namespace__()
+        for x in arrays
+        if hasattr(x, '__array_namespace__')
+    }
+    if len(namespaces) > 1:
+        msg = f'arrays belong to multiple namespaces {namespaces}'
+        raise TypeError(msg)
+
+    return namespaces.pop() if namespaces else np
+
 
 def is_array1D(x: npt.NDArray):
     """Returns True if x is an ndarray type and has one dim."""
@@ -30,7 +74,7 @@ def normalize_axis(axis: int, ndim: int):
     """
 
     axes = np.arange(ndim)
-    return axes[axis]
+    return int(axes[axis])
 
 
 def pad_along_axis(
@@ -141,7 +185,172 @@ def redim(x: npt.NDArray, shape: Tuple[int, ...], axis: int) -> npt.NDArray:
         raise ValueError(msg)
 
     ax = normalize_axis(axis, len(shape))
-    outshape = np.ones(len(shape), int)
-    outshape[ax] = len(x)
+    outshape = [1] * len(shape)
+    outshape[ax] = x.shape[0]
+
+    xp = array_namespace(x)
+    result: npt.NDArray = xp.reshape(x, tuple(outshape))
+    return result
+
+
+def result_dtype(dtype: npt.DTypeLike) -> np.dtype:
+    """Returns the dtype of the projections of an array of dtype.
+
+    Floating dtypes are preserved and all other dtypes are projected in
+    float64.
+
+    Examples:
+        >>> result_dtype(np.float32)
+        dtype('float32')
+        >>> result_dtype(int)
+        dtype('float64')
+    """
+
+    if np.issubdtype(dtype, np.floating):
+        return np.dtype(dtype)
+
+    return np.dtype(np.float64)
+
+
+def working_dtype(dtype: npt.DTypeLike) -> np.dtype:
+    """Returns the dtype in which the multipliers of the projections of an
+    array of dtype are computed.
+
+    This is the dtype of the projections except for float16 whose sums lose
+    all precision after a few thousand components. Float16 arrays are
+    therefore projected with float32 multipliers and their projections are
+    rounded to float16 once.
+
+    Examples:
+        >>> working_dtype(np.float16)
+        dtype('float32')
+        >>> working_dtype(np.float32)
+        dtype('float32')
+    """
+
+    return np.promote_types(result_dtype(dtype), np.float32)
+
+
+def flatten_along_axis(
+    arr: npt.NDArray,
+    axis: int = -1,
+    dtype: Optional[npt.DTypeLike] = None,
+) -> npt.NDArray:
+    """Returns a C-contiguous 2-D array whose rows are the 1-D slices of an
+    ndarray along axis.
+
+    The slices along axis are moved to the last axis and the remaining axes are
+    collapsed into the first. A copy is made only if the slices are not already
+    contiguous in memory or not of dtype so that operations along the rows of
+    the returned array never walk memory with large strides.
+
+    Args:
+        arr:
+            An ndarray of at least 1 dimension to flatten.
+        axis:
+            The axis of arr whose 1-D slices become the rows of the 2-D array.
+        dtype:
+            The dtype of the returned array. If None, the dtype of arr is kept.
+
+    Returns:
+        A 2-D array of shape (arr.size // arr.shape[axis], arr.shape[axis]).
+
+    Examples:
+        >>> import numpy as np
+        >>> x = np.arange(24).reshape(2, 3, 4)
+        >>> flatten_along_axis(x, axis=1).shape
+        (8, 3)
+    """
+
+    ax = normalize_axis(axis, arr.ndim)
+    if not isinstance(arr, np.ndarray):
+        xp = array_namespace(arr)
+        moved = xp.moveaxis(arr, ax, -1)
+        if dtype is not None:
+            moved = xp.astype(moved, dtype)
+        return xp.reshape(moved, (-1, arr.shape[ax]))
+
+    moved = np.moveaxis(arr, ax, -1)
+    return np.ascontiguousarray(moved, dtype=dtype).reshape(-1, arr.shape[ax])
+
+
+def unflatten_along_axis(
+    arr: npt.NDArray,
+    shape: Tuple[int, ...],
+    axis: int = -1,
+) -> npt.NDArray:
+    """Inverts flatten_along_axis by returning an ndarray whose 1-D slices
+    along axis are the rows of a 2-D array.
+
+    The number of columns of arr need not match shape[axis]. This allows
+    a per-row quantity, such as a column of multipliers, to be reshaped for
+    broadcasting against the array that was flattened.
+
+    Args:
+        arr:
+            A 2-D array whose rows are to be placed along axis.
+        shape:
+            The shape of the array that was flattened.
+        axis:
+            The axis along which the rows of arr will be placed.
+
+    Returns:
+        A view of arr whose shape matches shape except along axis where its
+        length is the number of columns of arr.
+
+    Examples:
+        >>> import numpy as np
+        >>> x = np.arange(24).reshape(2, 3, 4)
+        >>> y = flatten_along_axis(x, axis=1)
+        >>> np.array_equal(unflatten_along_axis(y, x.shape, axis=1), x)
+        True
+        >>> unflatten_along_axis(y[:, :1], x.shape, axis=1).shape
+        (2, 1, 4)
+    """
+
+    ax = normalize_axis(axis, len(shape))
+    batch_shape = shape[:ax] + shape[ax + 1 :]
+    xp = array_namespace(arr)
+    reshaped = xp.reshape(arr, (*batch_shape, arr.shape[-1]))
+    result: npt.NDArray = xp.moveaxis(reshaped, -1, ax)
+    return result
+
+
+def flatten_batch(
+    x: npt.ArrayLike,
+    shape: Tuple[int, ...],
+    axis: int = -1,
+    dtype: Optional[npt.DTypeLike] = None,
+) -> npt.NDArray:
+    """Returns a column of per-slice values aligned with the rows of
+    flatten_along_axis.
+
+    Args:
+        x:
+            A scalar or an array broadcastable to shape with axis removed
+            containing one value per 1-D slice along axis.
+        shape:
+            The shape of the array whose 1-D slices along axis the values of x
+            belong to.
+        axis:
+            The axis of the 1-D slices.
+        dtype:
+            The dtype of the returned array. If None, the dtype of x is kept.
+
+    Returns:
+        A 2-D array of shape (number of slices, 1).
 
-    return x.reshape(*outshape)
+    Examples:
+        >>> import numpy as np
+        >>> flatten_batch(np.array([1, 2, 3, 4]), (2, 3, 4), axis=1).ravel()
+        array([1, 2, 3, 4, 1, 2, 3, 4])
+    """
+
+    ax = normalize_axis(axis, len(shape))
+    batch_shape = shape[:ax] + shape[ax + 1 :]
+    xp = array_namespace(x)
+    values = xp.asarray(x, dtype=dtype)
+    result: npt.NDArray = xp.reshape(
+        xp.broadcast_to(values, batch_shape), (-1, 1)
+    )
+    return result
@@ -0,0 +1,366 @@
+"""Module of optional compiled kernels for the projection methods whose cost is
+dominated by Python loops over vectors and their components.
+
+Each kernel is written as plain loops over NumPy arrays. If Numba is installed
+the loops are compiled to machine code on first use, release the GIL and are
+cached to disk. Numba itself is only imported when a kernel is first called so
+importing the simplexers stays fast. Otherwise the kernels remain importable
+Python functions and the simplexers fall back to their NumPy methods. The
+kernels are compiled for each float dtype they are called with and return
+multipliers of that dtype.
+
+Functions:
+    use_compiled:
+        Returns True if the compiled kernels should be used for a backend.
+    positive_filter:
+        Computes the multipliers of positive simplex projections with Condat's
+        algorithm.
+    capped_sort:
+        Computes the multipliers of capped simplex projections with the
+        sorting algorithm of Wang & Lu.
+    capped_root:
+        Computes the multipliers of capped simplex projections with
+        a safeguarded Newton-Raphson method on each vector.
+"""
+
+import functools
+import importlib
+import importlib.util
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import results
+from simplexers.core.workspace import Workspace
+
+# True if numba is installed and the kernels are compiled
+AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# the names of the backends accepted by the simplexers
+BACKENDS = ('auto', 'numpy', 'numba')
+
+
+def _njit(func: Callable) -> Callable:
+    """Returns func compiled in nopython mode on its first call if numba is
+    installed and func unchanged otherwise."""
+
+    if not AVAILABLE:
+        return func
+
+    jitted: Optional[Callable] = None
+
+    @functools.wraps(func)
+    def dispatch(*args):
+        """Compiles func on the first call and calls the compiled func."""
+
+        nonlocal jitted
+        if jitted is None:
+            numba = importlib.import_module('numba')
+            jitted = numba.njit(cache=True, nogil=True)(func)
+
+        return jitted(*args)
+
+    return dispatch
+
+
+def use_compiled(backend: str) -> bool:
+    """Returns True if the compiled kernels should be used for backend.
+
+    Args:
+        backend:
+            One of 'auto', 'numpy' or 'numba'. 'Auto' uses the compiled kernels
+            whenever numba is installed.
+
+    Raises:
+        A ValueError is issued if backend is not a known backend and an
+        ImportError is issued if backend is 'numba' and numba is not installed.
+    """
+
+    if backend not in BACKENDS:
+        msg = f'backend must be one of {BACKENDS} not {backend}'
+        raise ValueError(msg)
+
+    if backend == 'numba' and not AVAILABLE:
+        msg = "The 'numba' backend requires numba to be installed"
+        raise ImportError(msg)
+
+    return AVAILABLE and backend != 'numpy'
+
+
+@_njit
+def _positive_filter_rows(arr, targets):
+    """Returns the positive simplex multiplier of each row of arr with the
+    expected O(n) algorithm of Condat (Ref. 4 of positive)."""
+
+    m, n = arr.shape
+    thetas = np.empty(m, arr.dtype)
+    # candidate components & components set aside by the first pass
+    kept = np.empty(n, arr.dtype)
+    waiting = np.empty(n, arr.dtype)
+    for i in range(m):
+        y = arr[i]
+        target = targets[i]
+        kept[0] = y[0]
+        nkept, nwaiting = 1, 0
+        rho = y[0] - target
+        for j in range(1, n):
+            if y[j] > rho:
+                rho += (y[j] - rho) / (nkept + 1)
+                if rho > y[j] - target:
+                    kept[nkept] = y[j]
+                    nkept += 1
+                else:
+                    waiting[nwaiting : nwaiting + nkept] = kept[:nkept]
+                    nwaiting += nkept
+                    kept[0] = y[j]
+                    nkept = 1
+                    rho = y[j] - target
+
+        for j in range(nwaiting):
+            if waiting[j] > rho:
+                kept[nkept] = waiting[j]
+                nkept += 1
+                rho += (waiting[j] - rho) / nkept
+
+        # remove candidates at or below rho until the candidates are stable
+        changed = True
+        while changed:
+            changed = False
+            size = nkept
+            count = 0
+            for j in range(nkept):
+                if kept[j] > rho:
+                    kept[count] = kept[j]
+                    count += 1
+                else:
+                    size -= 1
+                    # at s=0 every candidate is removed & rho is the maximum
+                    if size > 0:
+                        rho += (rho - kept[j]) / size
+                    changed = True
+            nkept = count
+        thetas[i] = rho
+
+    return thetas
+
+
+@_njit
+def _capped_sort_rows(arr, targets):
+    """Returns the capped simplex multiplier of each row of arr by searching
+    the a, b partitions of the sorted row (Ref. 2 of capped)."""
+
+    m, n = arr.shape
+    gammas = np.empty(m, arr.dtype)
+    # sorted components & their sums are accumulated in float64
+    y = np.empty(n + 1)
+    csum = np.empty(n)
+    for i in range(m):
+        y[:n] = np.sort(arr[i])
+        y[n] = np.inf
+        total = 0.0
+        for j in range(n):
+            total += y[j]
+            csum[j] = total
+
+        target = targets[i]
+        found = False
+        gamma = 0.0
+        for a in range(n):
+            low = -np.inf if a == 0 else y[a - 1]
+            low_csum = 0.0 if a == 0 else csum[a - 1]
+            for b in range(a + 1, n + 1):
+                gamma = (target + b - n - csum[b - 1] + low_csum) / (b - a)
+                if (
+                    low + gamma <= 0
+                    and y[a] + gamma > 0
+                    and y[b - 1] + gamma < 1
+                    and y[b] + gamma >= 1
+                ):
+                    found = True
+                    break
+            if found:
+                break
+
+        if not found:
+            gamma = 1 - y[n - int(target)]
+
+        # Ref. 2 shifts by +gamma but the simplexers shift by -gamma
+        gammas[i] = -gamma
+
+    return gammas
+
+
+@_njit
+def _capped_root_rows(arr, targets, xtol, rtol, maxiter, iterations):
+    """Returns the capped simplex multiplier of each row of arr located by
+    a safeguarded Newton-Raphson method within [min(y) - 1, max(y)] storing
+    the iterations taken for each row to iterations."""
+
+    m, n = arr.shape
+    gammas = np.empty(m, arr.dtype)
+    for i in range(m):
+        y = arr[i]
+        lo, hi = np.min(y) - 1, np.max(y)
+        # bracket ends not yet evaluated may themselves be roots
+        lo_open, hi_open = True, True
+        x = (lo + hi) / 2
+        converged = False
+        for iteration in range(maxiter):
+            iterations[i] = iteration + 1
+            value = targets[i]
+            slope = 0
+            for j in range(n):
+                shifted = y[j] - x
+                if shifted >= 1:
+                    value -= 1
+                elif shifted > 0:
+                    value -= shifted
+                    slope += 1
+
+            if value < 0:
+                lo, lo_open = x, False
+            elif value > 0:
+                hi, hi_open = x, False
+
+            # no bracket can be narrower than the spacing of floats at x
+            tol = max(xtol + rtol * abs(x), 4 * np.spacing(abs(x)))
+            if value == 0 or hi - lo <= tol:
+                converged = True
+                break
+
+            if slope > 0:
+                step = value / slope
+                if abs(step) <= tol:
+                    converged = True
+                    break
+
+                newton = x - step
+                above = newton > lo or (newton == lo and lo_open)
+                below = newton < hi or (newton == hi and hi_open)
+                x = newton if above and below else (lo + hi) / 2
+            else:
+                x = (lo + hi) / 2
+
+        if not converged:
+            raise RuntimeError('Failed to converge within maxiter iterations')
+        gammas[i] = x
+
+    return gammas
+
+
+def positive_filter(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the positive simplex multiplier of each 1-D array in arr with
+    Condat's expected O(n) algorithm in a compiled loop.
+
+    Args:
+        arr:
+            A 2-D float array of vectors whose components lie along the last
+            axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            Unused. The compiled loops allocate two vectors of scratch memory.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) of the Lagrange multipliers theta of
+        each vector's projection, max(arr - theta, 0).
+    """
+
+    del workspace
+    z = np.ascontiguousarray(arr)
+    targets = np.ascontiguousarray(s[:, 0], dtype=z.dtype)
+    multipliers: npt.NDArray = _positive_filter_rows(z, targets)
+    return multipliers[:, np.newaxis]
+
+
+def capped_sort(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the capped simplex multiplier of each 1-D array in arr with the
+    O(n**2) sorting algorithm of Wang & Lu in a compiled loop.
+
+    Args:
+        arr:
+            A 2-D float array of vectors whose components lie along the last
+            axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            Unused. The compiled loops allocate two vectors of scratch memory.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) of the Lagrange multipliers gamma of
+        each vector's projection, min(1, max(arr - gamma, 0)).
+    """
+
+    del workspace
+    z = np.ascontiguousarray(arr)
+    targets = np.ascontiguousarray(s[:, 0], dtype=z.dtype)
+    multipliers: npt.NDArray = _capped_sort_rows(z, targets)
+    return multipliers[:, np.newaxis]
+
+
+def capped_root(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+    full_output: bool = False,
+) -> npt.NDArray:
+    """Computes the capped simplex multiplier of each 1-D array in arr with
+    a safeguarded Newton-Raphson method in a compiled loop.
+
+    The compiled loop replaces the per-vector calls to scipy's brentq of the
+    root method and accepts the same xtol, rtol and maxiter tolerances but no
+    other brentq keyword arguments.
+
+    Args:
+        arr:
+            A 2-D float array of vectors whose components lie along the last
+            axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        workspace:
+            Unused. The compiled loops need no scratch memory.
+        xtol:
+            The absolute tolerance of the located gamma for each vector.
+        rtol:
+            The relative tolerance of the located gamma for each vector.
+        maxiter:
+            The maximum number of Newton or bisection iterations.
+        full_output:
+            If True, the iteration count and convergence flag of each vector
+            follow its multiplier as two extra columns.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) of the Lagrange multipliers gamma of
+        each vector's projection, min(1, max(arr - gamma, 0)).
+
+    Raises:
+        A RuntimeError is issued if any vector's multiplier is not located
+        within maxiter iterations.
+    """
+
+    del workspace
+    z = np.ascontiguousarray(arr)
+    targets = np.ascontiguousarray(s[:, 0], dtype=z.dtype)
+    iterations = np.zeros(len(z), dtype=np.int64)
+    gammas: npt.NDArray = _capped_root_rows(
+        z, targets, xtol, rtol, maxiter, iterations
+    )
+    if full_output:
+        return results.columns(gammas, iterations)
+
+    return gammas[:, np.newaxis]
@@ -0,0 +1,195 @@
+"""Module of cost models that predict the run time of each projection method
+from the shape of a batch so that the fastest method can be selected.
+
+The features of a batch are its number of vectors and components only. The
+dtype of the batch and its sum constraints are not model inputs, so float32
+batches and sums that change the support sizes of projections are predicted
+to cost the same as float64 batches of the same shape. The default
+coefficients were fitted on a single machine; simplexers.tuning.calibrate
+refits them on the machine that runs the projections.
+
+Classes:
+    CostModel:
+        A linear model of the run time of each method of each simplexer and
+        backend that can be saved to and loaded from JSON.
+
+Functions:
+    features:
+        Returns the cost features of a batch of m vectors of n components.
+    accepts:
+        Returns True if a method accepts each of a set of keyword arguments.
+    get_model:
+        Returns the cost model used to select methods.
+    set_model:
+        Sets the cost model used to select methods.
+"""
+
+import inspect
+import json
+import math
+import os
+from typing import Callable, Dict, Iterable, List, Sequence
+
+# seconds per feature fitted by simplexers.tuning.calibrate for each backend,
+# simplex and method on a 1-core x86-64 machine with numpy 2.4 & numba 0.68
+DEFAULT_COEFFICIENTS: Dict[str, Dict[str, Dict[str, List[float]]]] = {
+    'numpy': {
+        'positive': {
+            'sort': [9.39e-05, 8.73e-08, 1.80e-08, 1.72e-10, 1.86e-12],
+            'filter': [2.29e-04, 8.00e-07, 1.62e-08, 0.0, 0.0],
+            'bisect': [3.07e-04, 7.28e-07, 1.59e-08, 0.0, 0.0],
+        },
+        'capped': {
+            'sort': [8.64e-05, 8.08e-06, 0.0, 0.0, 6.73e-07],
+            'root': [1.46e-04, 1.12e-04, 2.32e-08, 0.0, 0.0],
+            'bisect': [3.15e-04, 4.59e-07, 2.62e-08, 1.16e-09, 6.04e-13],
+            'breakpoint': [1.78e-04, 2.09e-07, 4.31e-08, 3.99e-09, 0.0],
+        },
+    },
+    'numba': {
+        'positive': {
+            'sort': [1.15e-04, 1.29e-07, 3.29e-09, 1.20e-09, 0.0],
+            'filter': [3.12e-05, 7.24e-08, 3.98e-09, 0.0, 0.0],
+            'bisect': [2.04e-04, 5.25e-07, 1.34e-08, 0.0, 0.0],
+        },
+        'capped': {
+            'sort': [5.74e-05, 5.49e-07, 1.74e-08, 8.17e-09, 1.79e-09],
+            'root': [4.99e-05, 1.06e-07, 3.13e-08, 0.0, 3.93e-13],
+            'bisect': [6.71e-04, 6.11e-07, 4.11e-08, 1.29e-09, 2.83e-12],
+            'breakpoint': [1.69e-04, 2.71e-07, 4.98e-08, 5.65e-09, 0.0],
+        },
+    },
+}
+
+
+def features(m: int, n: int) -> List[float]:
+    """Returns the cost features of a batch of m vectors of n components.
+
+    The features are the constant cost of a call, the per-vector cost of
+    Python loops over vectors, the cost of linear passes over all components,
+    the cost of sorting each vector and the cost of quadratic searches over
+    each vector's components.
+
+    Examples:
+        >>> features(10, 8)
+        [1.0, 10.0, 80.0, 240.0, 640.0]
+    """
+
+    sorting = m * n * math.log2(max(n, 2))
+    return [1.0, float(m), float(m * n), sorting, float(m * n * n)]
+
+
+def accepts(func: Callable, keywords: Iterable[str]) -> bool:
+    """Returns True if func accepts each keyword argument in keywords.
+
+    Methods are only candidates of an automatic selection if they accept the
+    keyword arguments given to a simplexer.
+
+    Examples:
+        >>> accepts(lambda arr, s, xtol=0: arr, ['xtol'])
+        True
+        >>> accepts(lambda arr, s, **kwargs: arr, ['disp'])
+        True
+        >>> accepts(lambda arr, s: arr, ['xtol'])
+        False
+    """
+
+    parameters = inspect.signature(func).parameters
+    if any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+        return True
+
+    return set(keywords) <= set(parameters)
+
+
+class CostModel:
+    """A linear model of the run time of each projection method.
+
+    The predicted run time of a method on a batch is the dot product of the
+    batch's features with the method's nonnegative coefficients. A model is
+    fitted on the machine it will run on by simplexers.tuning.calibrate and
+    may be saved to and loaded from a JSON file.
+
+    Attributes:
+        coefficients:
+            A nested dict of seconds per feature keyed on backend, simplex and
+            method name.
+
+    Examples:
+        >>> model = CostModel(DEFAULT_COEFFICIENTS)
+        >>> model.select('capped', ['sort', 'root'], 10, 4)
+        'sort'
+    """
+
+    def __init__(
+        self,
+        coefficients: Dict[str, Dict[str, Dict[str, List[float]]]],
+    ) -> None:
+        """Initialize this model with coefficients of each method."""
+
+        self.coefficients = coefficients
+
+    def predict(
+        self,
+        simplex: str,
+        method: str,
+        m: int,
+        n: int,
+        backend: str = 'numpy',
+    ) -> float:
+        """Returns the predicted seconds to project m vectors of n components
+        onto simplex with method and backend.
+
+        Methods missing from this model are predicted to take infinite time.
+        """
+
+        coeffs = self.coefficients.get(backend, {}).get(simplex, {})
+        if method not in coeffs:
+            return math.inf
+
+        return sum(c * f for c, f in zip(coeffs[method], features(m, n)))
+
+    def select(
+        self,
+        simplex: str,
+        methods: Sequence[str],
+        m: int,
+        n: int,
+        backend: str = 'numpy',
+    ) -> str:
+        """Returns the method among methods predicted to be fastest at
+        projecting m vectors of n components onto simplex with backend."""
+
+        return min(
+            methods, key=lambda meth: self.predict(simplex, meth, m, n, backend)
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Saves the coefficients of this model to a JSON file at path."""
+
+        with open(path, 'w', encoding='utf-8') as outfile:
+            json.dump(self.coefficients, outfile, indent=4)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> 'CostModel':
+        """Returns a model whose coefficients are loaded from a JSON file at
+        path."""
+
+        with open(path, 'r', encoding='utf-8') as infile:
+            return cls(json.load(infile))
+
+
+# the model used by the simplexers to select methods for method='auto'
+_MODEL = CostModel(DEFAULT_COEFFICIENTS)
+
+
+def get_model() -> CostModel:
+    """Returns the cost model used to select methods for method='auto'."""
+
+    return _MODEL
+
+
+def set_model(model: CostModel) -> None:
+    """Sets the cost model used to select methods for method='auto'."""
+
+    global _MODEL  # pylint: disable=global-statement
+    _MODEL = model
@@ -0,0 +1,153 @@
+"""Module of tools that detect vectors already lying on a simplex so that only
+the remaining vectors are passed to a projection method.
+
+Iterative solvers such as projected gradient descent project the same vectors
+repeatedly and once they approach a solution most of their vectors already
+satisfy the simplex constraints. The projection of such a vector is the vector
+itself, i.e. its Lagrange multiplier is 0, and checking feasibility costs a
+single vectorized pass compared with the sorting or root finding of
+a projection method. Batches whose vectors rarely lie on the simplex pay for
+this pass without benefit and the simplexers skip it if check_feasible is
+False.
+
+Functions:
+    feasible_rows:
+        Returns a boolean mask of the rows of a 2-D array that lie on the
+        positive or capped simplex within the rounding error of their sums.
+    feasible_multipliers:
+        Computes the Lagrange multipliers of a batch with an algorithm applied
+        only to the vectors that do not already lie on the simplex.
+"""
+
+from functools import partial
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import profiling
+from simplexers.core import results
+
+# multiples of eps * sqrt(n) * max(|s|, 1) within which sums are equal to s
+SUM_TOLERANCE = 4
+
+
+def feasible_rows(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    cap: Optional[float] = None,
+) -> npt.NDArray:
+    """Returns a boolean mask of the rows of arr that lie on the simplex.
+
+    A row is feasible if its components lie within the bounds of the simplex
+    and its sum equals its sum constraint to within the rounding error of
+    summing its components, SUM_TOLERANCE * eps * sqrt(n) * max(|s|, 1). The
+    projections computed by the simplexers meet this tolerance so projecting
+    a projection skips its vectors.
+
+    Args:
+        arr:
+            A 2-D float array of vectors whose components lie along the last
+            axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        cap:
+            The upper bound of the components or None if they are unbounded
+            above as for the positive simplex.
+
+    Returns:
+        A 1-D boolean array of length len(arr).
+
+    Examples:
+        >>> x = np.array([[0.2, 0.3, 0.5], [0.2, 0.3, 0.4], [1.5, -0.5, 0]])
+        >>> feasible_rows(x, np.ones((3, 1)))
+        array([ True, False, False])
+    """
+
+    n = arr.shape[-1]
+    targets = s[:, 0]
+    eps = np.finfo(arr.dtype).eps
+    tol = SUM_TOLERANCE * eps * np.sqrt(n) * np.maximum(np.abs(targets), 1)
+    # a matrix-vector product sums short rows faster than a reduction
+    sums = arr @ np.ones(n, dtype=arr.dtype)
+    feasible: npt.NDArray = np.abs(sums - targets) <= tol
+    if not feasible.any():
+        return feasible
+
+    # bounds are only checked for the vectors with feasible sums
+    rows = np.flatnonzero(feasible)
+    candidates = arr[rows]
+    inside = np.min(candidates, axis=-1) >= 0
+    if cap is not None:
+        inside &= np.max(candidates, axis=-1) <= cap
+    feasible[rows] = inside
+
+    return feasible
+
+
+def feasible_multipliers(
+    algorithm: Callable[..., npt.NDArray],
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    cap: Optional[float] = None,
+    full_output: bool = False,
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the Lagrange multiplier of each vector's projection calling
+    algorithm only for the vectors that do not already lie on the simplex.
+
+    Args:
+        algorithm:
+            A callable accepting a 2-D array of vectors along its last axis,
+            the sum constraint s, and kwargs that returns a 2-D array of
+            multipliers with shape (len(arr), 1).
+        arr:
+            A 2-D array of vectors whose components lie along the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        cap:
+            The upper bound of the components of the simplex or None if they
+            are unbounded above.
+        full_output:
+            If True, the iteration counts and convergence flags of the
+            multipliers are returned as extra columns (see results.columns).
+            Feasible vectors take no iterations.
+        kwargs:
+            Any keyword arguments to pass to algorithm.
+
+    Returns:
+        A 2-D array of Lagrange multipliers of shape (len(arr), 1) with two
+        extra columns if full_output is True.
+
+    Examples:
+        >>> from simplexers.positive import METHODS
+        >>> x = np.array([[0.2, 0.3, 0.5], [0.2, 1.3, 0.4]])
+        >>> feasible_multipliers(METHODS['sort'], x, np.ones((2, 1)))
+        array([[0.  ],
+               [0.35]])
+    """
+
+    compute = algorithm
+    if full_output:
+        compute = partial(results.diagnose, algorithm)
+
+    if not arr.size:
+        return compute(arr, s, **kwargs)
+
+    with profiling.phase('feasibility'):
+        feasible = feasible_rows(arr, s, cap)
+    if not feasible.any():
+        return compute(arr, s, **kwargs)
+
+    # the projection of a feasible vector is the vector itself
+    multipliers = np.zeros((len(arr), 1), dtype=arr.dtype)
+    if full_output:
+        multipliers = results.columns(multipliers)
+
+    rows = np.flatnonzero(~feasible)
+    if rows.size:
+        multipliers[rows] = compute(arr[rows], s[rows], **kwargs)
+
+    return multipliers
@@ -0,0 +1,154 @@
+"""Module for splitting the vectors of a batch projection across the workers
+of a thread or process pool.
+
+Functions:
+    map_rows:
+        Computes the Lagrange multipliers of the rows of a 2-D array serially
+        or in chunks of rows distributed across workers.
+"""
+
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+import os
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core.workspace import Workspace
+
+# the number of chunks each worker receives to balance uneven chunk costs
+CHUNKS_PER_WORKER = 4
+
+
+def _shared_task(
+    func: Callable[..., npt.NDArray],
+    name: str,
+    shape: Tuple[int, ...],
+    dtype: npt.DTypeLike,
+    rows: slice,
+    s: npt.NDArray,
+) -> npt.NDArray:
+    """Applies func to rows of an array in the shared memory block name."""
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        result = func(arr[rows], s)
+        # views of the block must be released before it can be closed
+        del arr
+    finally:
+        block.close()
+
+    return result
+
+
+def _map_shared(
+    func: Callable[..., npt.NDArray],
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    executor: ProcessPoolExecutor,
+    bounds: npt.NDArray,
+) -> npt.NDArray:
+    """Applies func to chunks of rows of arr in a process pool that reads arr
+    from shared memory rather than copying it to each process."""
+
+    block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    try:
+        shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)
+        shared[...] = arr
+        futures = [
+            executor.submit(
+                _shared_task,
+                func,
+                block.name,
+                arr.shape,
+                arr.dtype,
+                slice(start, stop),
+                s[start:stop],
+            )
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        result = np.concatenate([future.result() for future in futures])
+        del shared
+    finally:
+        block.close()
+        block.unlink()
+
+    return result
+
+
+def map_rows(
+    func: Callable[..., npt.NDArray],
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    n_jobs: Optional[int | Executor] = None,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes func(arr, s) serially or by distributing chunks of the rows of
+    arr and s across the workers of a pool.
+
+    The rows of a batch are projected independently so the multipliers of
+    each chunk of rows are computed by a separate call to func and
+    concatenated. Threads suit the vectorized methods whose NumPy calls
+    release the GIL while processes suit methods that loop over rows in
+    Python. A process pool reads arr from a shared memory block so the batch
+    is copied once rather than pickled to every task.
+
+    Args:
+        func:
+            A picklable callable accepting a 2-D array of vectors along its
+            last axis and a 2-D array of sum constraints of shape (len(arr), 1)
+            that returns a 2-D array of multipliers of shape (len(arr), 1).
+        arr:
+            A 2-D array of vectors whose components lie along the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        n_jobs:
+            The number of worker threads or a concurrent.futures Executor to
+            submit chunks to. A negative number uses one thread per CPU. If
+            None or 1, func is called once on all rows in this thread.
+        workspace:
+            A Workspace passed to func when it is called once on all rows.
+            Workspaces can not be shared between workers so each worker
+            allocates its own intermediate arrays.
+
+    Returns:
+        A 2-D array of shape (len(arr), 1) of the multipliers computed by func.
+
+    Examples:
+        >>> from simplexers.positive import METHODS
+        >>> x = np.random.default_rng(0).normal(size=(8, 5))
+        >>> s = np.ones((8, 1))
+        >>> expected = METHODS['sort'](x, s)
+        >>> np.allclose(map_rows(METHODS['sort'], x, s, n_jobs=2), expected)
+        True
+    """
+
+    if n_jobs is None or n_jobs == 1 or len(arr) < 2:
+        return func(arr, s, workspace=workspace)
+
+    if isinstance(n_jobs, Executor):
+        executor, workers = n_jobs, os.cpu_count() or 1
+    else:
+        workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+        executor = ThreadPoolExecutor(workers)
+
+    chunks = min(len(arr), workers * CHUNKS_PER_WORKER)
+    bounds = np.linspace(0, len(arr), chunks + 1).astype(int)
+    try:
+        if isinstance(executor, ProcessPoolExecutor):
+            return _map_shared(func, arr, s, executor, bounds)
+
+        futures = [
+            executor.submit(func, arr[start:stop], s[start:stop])
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        return np.concatenate([future.result() for future in futures])
+    finally:
+        # pools created here are shut down while supplied pools stay open
+        if executor is not n_jobs:
+            executor.shutdown()
@@ -0,0 +1,343 @@
+"""Module of opt-in instrumentation that attributes the time of simplex
+projections to the phases of their algorithms.
+
+Instrumentation is off unless a profile is active. While off, each
+instrumented phase costs a single check of a module level list so projections
+run at full speed. While a profile is active, every projection made in this
+process is recorded into it, including projections made by worker threads.
+Projections made by the workers of a process pool and projections of arrays
+of other array API libraries are not recorded.
+
+Classes:
+    Profile:
+        A record of the phase timings, rows, solver iterations and peak
+        traced memory of the projections made while it is active.
+
+Functions:
+    profile:
+        A context manager that activates a Profile.
+    enabled:
+        Returns True if any profile is active.
+    phase:
+        Returns a context manager that times a named phase of a projection.
+    instrument:
+        Returns a decorator that records each call of a simplexer.
+"""
+
+import contextlib
+import functools
+import inspect
+import math
+import threading
+import time
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+# the profiles recording projections, innermost last
+_ACTIVE: List['Profile'] = []
+
+# guards the active profiles and their records across worker threads
+_LOCK = threading.Lock()
+
+# the type of the simplexer functions that instrument decorates
+Simplexer = Callable[..., npt.NDArray]
+
+# the context manager returned by phase while no profile is active
+_DISABLED: ContextManager[Any] = contextlib.nullcontext()
+
+
+class Profile:
+    """A record of the projections made while this profile is active.
+
+    Phases nest, e.g. the 'capped.multipliers' phase of a capped_simplexer
+    call contains the phases of the method that computed the multipliers, so
+    the seconds of nested phases should not be summed. Phases timed in worker
+    threads accumulate the seconds of every thread.
+
+    Attributes:
+        seconds:
+            A dict of the total seconds spent in each named phase.
+        counts:
+            A dict of the number of times each named phase was entered.
+        calls:
+            A list of dicts, one per simplexer call, of the simplexer name, the
+            method, the number of rows and components projected, the seconds
+            of the call, the solver iterations summed over rows if the call
+            was given a ProjectionInfo and, if memory is traced, the peak
+            bytes (see peak_bytes).
+        peak_bytes:
+            The tracemalloc high-water mark during a call less the traced
+            memory at its start. This bounds the memory the call held at
+            once, not the total bytes it allocated, and includes allocations
+            made by other threads during the call.
+        callback:
+            A callable receiving each call record as soon as its call ends or
+            None. Suited to forwarding records to a metrics system.
+        memory:
+            If True, the peak bytes of each call are traced with tracemalloc.
+            Tracing slows NumPy allocations noticeably.
+
+    Examples:
+        >>> import numpy as np
+        >>> from simplexers import capped
+        >>> x = np.random.default_rng(0).normal(size=(100, 10))
+        >>> with profile() as prof:
+        ...     p = capped.capped_simplexer(
+        ...         x, 2, method='sort', backend='numpy'
+        ...     )
+        >>> prof.rows
+        100
+        >>> 'capped.sort.partition' in prof.seconds
+        True
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        memory: bool = False,
+    ) -> None:
+        """Initialize this profile with no recorded projections."""
+
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.callback = callback
+        self.memory = memory
+
+    @property
+    def rows(self) -> int:
+        """Returns the number of rows projected by the recorded calls."""
+
+        return sum(record['rows'] for record in self.calls)
+
+    @property
+    def iterations(self) -> int:
+        """Returns the solver iterations summed over the recorded calls that
+        were given a ProjectionInfo."""
+
+        return sum(record['iterations'] for record in self.calls)
+
+    @property
+    def peak_bytes(self) -> Optional[int]:
+        """Returns the largest high-water mark of traced memory above its
+        level at the start of a recorded call or None if memory is not
+        traced."""
+
+        peaks = [record['peak_bytes'] for record in self.calls]
+        peaks = [peak for peak in peaks if peak is not None]
+        return max(peaks) if peaks else None
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """Adds the seconds of one pass through the phase name."""
+
+        self.seconds[name] = self.seconds.get(name, 0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def add_call(self, record: Dict[str, Any]) -> None:
+        """Adds the record of a simplexer call and passes it to callback."""
+
+        self.calls.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self) -> List[Tuple[str, int, float]]:
+        """Returns the (name, count, seconds) of each phase, slowest first."""
+
+        items = self.seconds.items()
+        phases = [(name, self.counts[name], t) for name, t in items]
+        return sorted(phases, key=lambda phase: phase[2], reverse=True)
+
+
+@contextlib.contextmanager
+def profile(
+    callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    memory: bool = False,
+) -> Iterator[Profile]:
+    """Activates a Profile recording the projections made within this context.
+
+    Args:
+        callback:
+            An optional callable receiving the record of each simplexer call
+            as soon as the call ends (see Profile.calls).
+        memory:
+            If True, the peak bytes of each call are traced with tracemalloc
+            (see Profile.peak_bytes). Tracing is stopped on exit if it was
+            started here.
+
+    Yields:
+        The active Profile.
+    """
+
+    prof = Profile(callback, memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    with _LOCK:
+        _ACTIVE.append(prof)
+    try:
+        yield prof
+    finally:
+        with _LOCK:
+            _ACTIVE.remove(prof)
+        if started:
+            tracemalloc.stop()
+
+
+def enabled() -> bool:
+    """Returns True if any profile is recording projections."""
+
+    return bool(_ACTIVE)
+
+
+class _Phase:
+    """A context manager adding its elapsed time to the active profiles."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize this phase with the name its time is recorded under."""
+
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        """Starts timing this phase."""
+
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        """Adds the elapsed time of this phase to each active profile."""
+
+        elapsed = time.perf_counter() - self.start
+        with _LOCK:
+            for prof in _ACTIVE:
+                prof.add_phase(self.name, elapsed)
+
+
+class _Call:
+    """A context manager recording a simplexer call to the active profiles.
+
+    Entering yields the call's record so that the size of the projected batch
+    and its solver iterations can be added before the call ends.
+    """
+
+    def __init__(self, simplexer: str, method: str) -> None:
+        """Initialize this call with the simplexer and method names."""
+
+        self.record: Dict[str, Any] = {
+            'simplexer': simplexer,
+            'method': method,
+            'rows': 0,
+            'components': 0,
+            'seconds': 0.0,
+            'iterations': 0,
+            'peak_bytes': None,
+        }
+        self.start = 0.0
+        self.traced = 0
+
+    def __enter__(self) -> Dict[str, Any]:
+        """Starts timing and, if traced, measuring the allocations of this
+        call."""
+
+        if tracemalloc.is_tracing() and any(p.memory for p in _ACTIVE):
+            tracemalloc.reset_peak()
+            self.traced, _ = tracemalloc.get_traced_memory()
+            self.record['peak_bytes'] = 0
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc_info) -> None:
+        """Adds the record of this call to each active profile."""
+
+        self.record['seconds'] = time.perf_counter() - self.start
+        if self.record['peak_bytes'] is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            self.record['peak_bytes'] = max(peak - self.traced, 0)
+
+        with _LOCK:
+            for prof in _ACTIVE:
+                prof.add_call(dict(self.record))
+
+
+def phase(name: str) -> ContextManager[Any]:
+    """Returns a context manager that times the phase name of a projection.
+
+    Args:
+        name:
+            The name the phase is recorded under. Names are dotted paths of the
+            simplexer, the method and the step, e.g. 'capped.root.brentq'.
+
+    Returns:
+        A context manager recording the phase to the active profiles or
+        a shared no-op context manager if no profile is active.
+    """
+
+    if not _ACTIVE:
+        return _DISABLED
+
+    return _Phase(name)
+
+
+def instrument(simplexer: str) -> Callable[[Simplexer], Simplexer]:
+    """Returns a decorator that records each call of a simplexer to the
+    active profiles.
+
+    Solver iterations are recorded only for calls given a ProjectionInfo so
+    that profiled calls run the same code as unprofiled ones. While no
+    profile is active, the simplexer is called directly.
+
+    Args:
+        simplexer:
+            The name of the simplexer, 'positive' or 'capped'. The decorated
+            function must accept arr, axis, method and info arguments.
+
+    Returns:
+        A decorator of a simplexer function.
+    """
+
+    def decorator(func: Simplexer) -> Simplexer:
+        """Returns func recording its calls to the active profiles."""
+
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def instrumented(*args, **kwargs) -> npt.NDArray:
+            """Calls func recording the call if a profile is active."""
+
+            if not _ACTIVE:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            arr = arguments['arr']
+            if not isinstance(arr, np.ndarray):
+                return func(*args, **kwargs)
+
+            info = arguments['info']
+            with _Call(simplexer, arguments['method']) as record:
+                shape = arr.shape
+                projection = func(*args, **kwargs)
+                axis = arguments['axis'] % len(shape)
+                record['components'] = shape[axis]
+                record['rows'] = math.prod(shape[:axis] + shape[axis + 1 :])
+                if info is not None:
+                    record['iterations'] = int(np.sum(info.iterations))
+
+            return projection
+
+        return instrumented
+
+    return decorator
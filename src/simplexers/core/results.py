@@ -0,0 +1,187 @@
+"""Module of the diagnostics of simplex projections that callers may request
+alongside the projections themselves.
+
+Classes:
+    ProjectionInfo:
+        A record of the Lagrange multipliers, support sizes, iteration counts
+        and convergence flags of a batch of projections.
+
+Functions:
+    columns:
+        Returns the multipliers of a batch followed by a column of iteration
+        counts and a column of convergence flags.
+    diagnose:
+        Computes the multipliers of a batch with an algorithm returning its
+        iteration counts and convergence flags as extra columns.
+"""
+
+import inspect
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import arraytools
+
+
+def columns(
+    multipliers: npt.NDArray,
+    iterations: npt.ArrayLike = 0,
+    converged: npt.ArrayLike = True,
+) -> npt.NDArray:
+    """Returns a 2-D array whose columns are the multipliers of a batch, the
+    number of iterations taken to locate each and a flag that is 1 if each
+    converged and 0 otherwise.
+
+    Diagnostics are carried as columns of the multipliers' array so that they
+    pass unchanged through the top-k support bound and the worker pools, which
+    only split and concatenate rows.
+
+    Args:
+        multipliers:
+            A 1-D or 2-D array of shape (m, 1) of Lagrange multipliers.
+        iterations:
+            A scalar or 1-D array of the iteration counts of each multiplier.
+        converged:
+            A scalar or 1-D boolean array of the convergence of each multiplier.
+
+    Returns:
+        A 2-D array of shape (m, 3) with the dtype of multipliers.
+
+    Examples:
+        >>> columns(np.array([0.5, 1.5]), [3, 4])
+        array([[0.5, 3. , 1. ],
+               [1.5, 4. , 1. ]])
+    """
+
+    multipliers = np.asarray(multipliers)
+    result = np.empty((len(multipliers), 3), dtype=multipliers.dtype)
+    result[:, 0] = multipliers.reshape(-1)
+    result[:, 1] = iterations
+    result[:, 2] = converged
+    return result
+
+
+def diagnose(
+    algorithm: Callable[..., npt.NDArray],
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the multipliers of each vector in arr with algorithm and
+    returns them with their iteration counts and convergence flags.
+
+    Iterative algorithms report their diagnostics when called with
+    full_output=True. Exact algorithms take no iterations and always converge.
+
+    Args:
+        algorithm:
+            A callable accepting a 2-D array of vectors along its last axis,
+            the sum constraint s, and kwargs that returns a 2-D array of
+            multipliers with shape (len(arr), 1).
+        arr:
+            A 2-D array of vectors whose components lie along the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        kwargs:
+            Any keyword arguments to pass to algorithm.
+
+    Returns:
+        A 2-D array of shape (len(arr), 3) of multipliers, iteration counts and
+        convergence flags (see columns).
+    """
+
+    if 'full_output' in inspect.signature(algorithm).parameters:
+        return algorithm(arr, s, full_output=True, **kwargs)
+
+    return columns(algorithm(arr, s, **kwargs))
+
+
+# pylint: disable-next=too-few-public-methods
+class ProjectionInfo:
+    """A record of the diagnostics of a batch of simplex projections.
+
+    An instance passed as the info argument of a simplexer is filled with the
+    Lagrange multipliers and the diagnostics of its projections. Each
+    attribute is an array with the shape of the projected array except along
+    the projection axis where its length is 1, so that the multipliers
+    broadcast against the projected array. Every attribute is None until the
+    info is filled.
+
+    Attributes:
+        multipliers:
+            The Lagrange multiplier of each vector's projection, theta for the
+            positive simplex and gamma for the capped simplex.
+        support_sizes:
+            The number of nonzero components of each projection.
+        cap_sizes:
+            The number of components of each projection at their upper bound
+            of 1. None for projections onto the positive simplex.
+        iterations:
+            The number of iterations taken to locate each multiplier by the
+            'root' and 'bisect' methods. Zero for the exact methods. If
+            a support bound was given and a vector was reprojected with all of
+            its components, this counts the iterations of the reprojection.
+        converged:
+            True for each multiplier located within tolerance. Iterative
+            methods raise a RuntimeError on failure unless told otherwise, e.g.
+            by passing disp=False to the 'root' method.
+
+    Examples:
+        >>> import numpy as np
+        >>> from simplexers import capped
+        >>> x = np.array([[0.2, 1.9, 0.7, -0.4], [0.5, 0.5, 0.5, 0.5]])
+        >>> info = ProjectionInfo()
+        >>> projection = capped.capped_simplexer(x, 2, info=info)
+        >>> info.support_sizes.ravel()
+        array([3, 4])
+        >>> info.cap_sizes.ravel()
+        array([1, 0])
+    """
+
+    def __init__(self) -> None:
+        """Initialize this info with no recorded diagnostics."""
+
+        self.multipliers: Optional[npt.NDArray] = None
+        self.support_sizes: Optional[npt.NDArray] = None
+        self.cap_sizes: Optional[npt.NDArray] = None
+        self.iterations: Optional[npt.NDArray] = None
+        self.converged: Optional[npt.NDArray] = None
+
+    def record(
+        self,
+        diagnostics: npt.NDArray,
+        projection: npt.NDArray,
+        axis: int = -1,
+        cap: Optional[float] = None,
+    ) -> None:
+        """Records the diagnostics of the projections of a batch.
+
+        Args:
+            diagnostics:
+                A 2-D array of multipliers, iteration counts and convergence
+                flags, one row per vector (see columns).
+            projection:
+                The projections of the vectors along axis.
+            axis:
+                The axis of projection containing each projection's components.
+            cap:
+                The upper bound of the projections' components or None if they
+                are unbounded above.
+        """
+
+        shape = projection.shape
+        unflatten = arraytools.unflatten_along_axis
+        self.multipliers = unflatten(diagnostics[:, :1], shape, axis)
+        iterations = diagnostics[:, 1:2].astype(int)
+        self.iterations = unflatten(iterations, shape, axis)
+        self.converged = unflatten(diagnostics[:, 2:] > 0, shape, axis)
+        self.support_sizes = np.count_nonzero(
+            projection, axis=axis, keepdims=True
+        )
+        self.cap_sizes = None
+        if cap is not None:
+            self.cap_sizes = np.count_nonzero(
+                projection == cap, axis=axis, keepdims=True
+            )
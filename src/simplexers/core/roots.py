@@ -0,0 +1,124 @@
+"""Module of vectorized root finders that locate the roots of many scalar
+functions simultaneously.
+
+Functions:
+    newton_bisect:
+        Locates the roots of a batch of monotonically increasing functions
+        using a safeguarded Newton-Raphson method that falls back to bisection.
+"""
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+def newton_bisect(
+    func: Callable[[npt.NDArray, npt.NDArray], Tuple[npt.NDArray, npt.NDArray]],
+    lows: npt.NDArray,
+    highs: npt.NDArray,
+    guess: Optional[npt.NDArray] = None,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+    iterations: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Locates the root of each function in a batch of monotonically
+    increasing functions with a safeguarded Newton-Raphson method.
+
+    Each function in the batch is evaluated at the same time so there is no
+    Python level loop over the batch. A Newton step is taken whenever it lands
+    within the current bracketing interval and a bisection step is taken
+    otherwise. A function's root is located when its bracket or its Newton
+    step is within tolerance. For the piecewise linear functions that arise in
+    simplex projections the Newton steps are exact once the bracket isolates
+    a linear piece so convergence typically requires only a handful of
+    iterations.
+
+    The roots are located in the floating dtype of lows and highs so batches
+    of float32 functions are solved in float32. Since no bracket can be
+    narrower than the spacing of floats, the tolerance on each bracket or
+    Newton step is never less than four units in the last place of x.
+
+    Args:
+        func:
+            A callable accepting a 1-D array of points, one per function, and
+            a 1-D integer array of indices identifying which functions of the
+            batch to evaluate. It must return a 2-tuple of 1-D arrays, the
+            function values and the function slopes at the points.
+        lows:
+            A 1-D array of lower bracket values at which each function is
+            non-positive.
+        highs:
+            A 1-D array of upper bracket values at which each function is
+            non-negative.
+        guess:
+            An optional 1-D array of starting points. Guesses outside the
+            bracket are clipped to it. If None, the midpoints of the brackets
+            are used.
+        xtol:
+            The absolute tolerance on the width of each bracket or Newton step.
+        rtol:
+            The relative tolerance on the width of each bracket or Newton step.
+        maxiter:
+            The maximum number of iterations before a RuntimeError is raised.
+        iterations:
+            An optional 1-D integer array in which the number of iterations
+            taken to locate each function's root is stored.
+
+    Returns:
+        A 1-D array of roots one per function in the batch.
+
+    Raises:
+        A RuntimeError is issued if any function fails to converge within
+        maxiter iterations.
+    """
+
+    dtype = np.result_type(lows, highs, 1.0)
+    lows = np.array(lows, dtype=dtype)
+    highs = np.array(highs, dtype=dtype)
+    x: npt.NDArray
+    if guess is None:
+        x = (lows + highs) / 2
+    else:
+        x = np.clip(np.array(guess, dtype=dtype), lows, highs)
+
+    # bracket ends not yet evaluated may themselves be roots
+    lows_open = np.ones(len(x), dtype=bool)
+    highs_open = np.ones(len(x), dtype=bool)
+
+    # indices of the functions whose roots are not yet located
+    active = np.arange(len(x))
+    counts = np.zeros(len(x), dtype=int)
+    for _ in range(maxiter):
+
+        xa, lo, hi = x[active], lows[active], highs[active]
+        fx, dfx = func(xa, active)
+        counts[active] += 1
+        lo = np.where(fx < 0, xa, lo)
+        hi = np.where(fx > 0, xa, hi)
+        lows[active], highs[active] = lo, hi
+        lows_open[active] &= fx >= 0
+        highs_open[active] &= fx <= 0
+
+        # converged if the bracket or the Newton step is within tolerance
+        tol = np.maximum(
+            xtol + rtol * np.abs(xa), 4 * np.spacing(np.abs(xa))
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.divide(fx, dfx, dtype=dtype)
+        newton = xa - step
+        done = (fx == 0) | (hi - lo <= tol) | ((dfx > 0) & (np.abs(step) <= tol))
+        above = (newton > lo) | ((newton == lo) & lows_open[active])
+        below = (newton < hi) | ((newton == hi) & highs_open[active])
+        inside = (dfx > 0) & above & below
+        x[active] = np.where(done, xa, np.where(inside, newton, (lo + hi) / 2))
+
+        active = active[~done]
+        if not active.size:
+            if iterations is not None:
+                iterations[:] = counts
+            return x
+
+    msg = f'Failed to converge after {maxiter} iterations'
+    raise RuntimeError(msg)
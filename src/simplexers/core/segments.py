@@ -0,0 +1,97 @@
+"""Module of tools for computing on variable length vectors stored end to end
+in a single 1-D array of values delimited by an array of offsets, the layout of
+a CSR sparse matrix's data and indptr arrays.
+
+Functions:
+    gather:
+        Returns the positions and segment ids of the values of selected
+        segments.
+    segment_reduce:
+        Reduces the values of each segment with a numpy ufunc.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+def gather(
+    offsets: npt.NDArray,
+    rows: npt.NDArray,
+) -> Tuple[npt.NDArray, npt.NDArray]:
+    """Returns the positions of the values of selected segments and the index
+    of each value's segment among the selected segments.
+
+    Args:
+        offsets:
+            A 1-D integer array of length m + 1 whose consecutive elements
+            delimit the values of m segments.
+        rows:
+            A 1-D integer array of the segments to select.
+
+    Returns:
+        A 2-tuple of 1-D integer arrays, the positions of the selected values
+        and, for each of these values, the index into rows of its segment.
+
+    Examples:
+        >>> offsets = np.array([0, 2, 2, 5])
+        >>> positions, ids = gather(offsets, np.array([0, 2]))
+        >>> positions
+        array([0, 1, 2, 3, 4])
+        >>> ids
+        array([0, 0, 1, 1, 1])
+    """
+
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    ids = np.repeat(np.arange(len(rows)), lengths)
+
+    # shift each selected value's rank in the output to its segment's start
+    ends = np.cumsum(lengths)
+    positions = np.arange(ends[-1] if len(ends) else 0)
+    positions += np.repeat(starts - ends + lengths, lengths)
+
+    return positions, ids
+
+
+def segment_reduce(
+    ufunc: np.ufunc,
+    values: npt.NDArray,
+    offsets: npt.NDArray,
+    initial: float,
+) -> npt.NDArray:
+    """Reduces the values of each segment with a ufunc.
+
+    Args:
+        ufunc:
+            A binary numpy ufunc such as np.maximum or np.add.
+        values:
+            A 1-D array of the values of all segments.
+        offsets:
+            A 1-D integer array of length m + 1 whose consecutive elements
+            delimit the values of m segments.
+        initial:
+            The reduction of an empty segment.
+
+    Returns:
+        A 1-D array of m reductions one per segment.
+
+    Examples:
+        >>> values = np.array([3, 1, 4, 1, 5])
+        >>> segment_reduce(np.maximum, values, np.array([0, 2, 2, 5]), 0)
+        array([3., 0., 5.])
+    """
+
+    result = np.full(len(offsets) - 1, initial, dtype=float)
+    lengths = np.diff(offsets)
+    nonempty = np.flatnonzero(lengths)
+    if nonempty.size:
+        # empty segments hold no values so each reduction ends where the next
+        # nonempty segment starts
+        start, stop = offsets[0], offsets[nonempty[-1] + 1]
+        result[nonempty] = ufunc.reduceat(
+            values[start:stop], offsets[nonempty] - start
+        )
+
+    return result
@@ -0,0 +1,73 @@
+"""Module of tools that exploit the support of simplex projections, the
+components of a projection that are nonzero, to reduce the cost of locating
+each projection's Lagrange multiplier.
+
+Functions:
+    topk_multipliers:
+        Computes the Lagrange multipliers of projections from only the k
+        largest components of each vector when the projection's support is
+        known to have at most k components.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import profiling
+
+
+def topk_multipliers(
+    algorithm: Callable[..., npt.NDArray],
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    k: Optional[int] = None,
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the Lagrange multiplier of each vector's projection from its
+    k largest components falling back to all of its components when the
+    projection's support is larger than k.
+
+    The projections onto the positive and capped simplices both zero every
+    component at or below the multiplier. If the largest component excluded
+    from the k candidates lies at or below the multiplier computed from the
+    candidates, the KKT conditions hold for the full vector and the multiplier
+    is exact. Isolating the candidates with a partition is O(n) so the cost of
+    the algorithm is reduced to the cost of projecting k components.
+
+    Args:
+        algorithm:
+            A callable accepting a 2-D array of vectors along its last axis,
+            the sum constraint s, and kwargs that returns a 2-D array of
+            multipliers with shape (len(arr), 1).
+        arr:
+            A 2-D array of vectors whose components lie along the last axis.
+        s:
+            A 2-D array of shape (len(arr), 1) of sum constraints one per
+            vector in arr.
+        k:
+            An upper bound on the number of nonzero components in each
+            projection. If None or if k is not less than the number of
+            components, all components are passed to the algorithm.
+        kwargs:
+            Any keyword arguments to pass to algorithm.
+
+    Returns:
+        A 2-D array of Lagrange multipliers of shape (len(arr), 1).
+    """
+
+    n = arr.shape[-1]
+    if k is None or k >= n:
+        return algorithm(arr, s, **kwargs)
+
+    # the (k+1)-th largest component of each vector precedes the k largest
+    with profiling.phase('support.partition'):
+        parted = np.partition(arr, n - k - 1, axis=-1)
+    multipliers = algorithm(parted[:, n - k :], s, **kwargs)
+
+    # vectors whose excluded components violate the KKT conditions are redone
+    invalid = np.flatnonzero(parted[:, n - k - 1] > multipliers[:, 0])
+    if invalid.size:
+        multipliers[invalid] = algorithm(arr[invalid], s[invalid], **kwargs)
+
+    return multipliers
@@ -0,0 +1,82 @@
+"""Module of reusable scratch memory for repeated projections.
+
+Classes:
+    Workspace:
+        A cache of named ndarray buffers that projection algorithms write their
+        intermediate arrays into.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class Workspace:
+    """A cache of named ndarray buffers reused across projections.
+
+    Projection algorithms request their full-size intermediate arrays, such as
+    sorted components and cumulative sums, from a workspace by name. A buffer
+    is allocated on its first request and returned on every later request with
+    the same shape and dtype. Passing one workspace to repeated projections of
+    same-shaped batches, as in an optimizer loop, therefore allocates each
+    intermediate array only once.
+
+    Attributes:
+        buffers:
+            A dict of ndarray buffers keyed on name.
+
+    Examples:
+        >>> import numpy as np
+        >>> ws = Workspace()
+        >>> a = ws.get('cumsum', (2, 3))
+        >>> b = ws.get('cumsum', (2, 3))
+        >>> a is b
+        True
+        >>> ws.nbytes
+        48
+    """
+
+    def __init__(self) -> None:
+        """Initialize this workspace with no buffers."""
+
+        self.buffers: Dict[str, npt.NDArray] = {}
+
+    def get(
+        self,
+        name: str,
+        shape: Tuple[int, ...],
+        dtype: npt.DTypeLike = float,
+    ) -> npt.NDArray:
+        """Returns an uninitialized buffer of shape and dtype stored under name.
+
+        Args:
+            name:
+                The name of the buffer. Buffers with distinct names never share
+                memory.
+            shape:
+                The required shape of the buffer.
+            dtype:
+                The required dtype of the buffer.
+
+        Returns:
+            An ndarray whose values are those left by its last use.
+        """
+
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buffer
+
+        return buffer
+
+    def clear(self) -> None:
+        """Releases all buffers of this workspace."""
+
+        self.buffers.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the total number of bytes held by this workspace."""
+
+        return sum(buffer.nbytes for buffer in self.buffers.values())
@@ -0,0 +1,226 @@
+"""Jacobian-vector and vector-Jacobian products of the positive and s-capped
+simplex projections for differentiating through the simplexers.
+
+The Jacobian of either projection with respect to the projected vector y is
+the matrix diag(a) - a @ a.T / sum(a), where a is the 0/1 indicator of the
+projection's active components: the nonzero components of a positive simplex
+projection and the components strictly between 0 and 1 of a capped simplex
+projection (Refs. 1 & 2). This matrix is symmetric so the JVP and VJP of
+a vector v are equal. Both are v restricted to the active components less its
+mean over the active components. The products therefore cost O(n) per vector
+and never build the n x n Jacobian. The active components are read from the
+projections so no multipliers need to be recomputed.
+
+Where a component lies exactly on a boundary of its bounds the projection is
+not differentiable. These products then use the generalized Jacobian that
+treats boundary components as inactive.
+
+Functions:
+    positive_jvp:
+        Computes the Jacobian-vector products of positive simplex projections.
+    positive_vjp:
+        Computes the vector-Jacobian products of positive simplex projections.
+    capped_jvp:
+        Computes the Jacobian-vector products of capped simplex projections.
+    capped_vjp:
+        Computes the vector-Jacobian products of capped simplex projections.
+
+References:
+    1. From Softmax to Sparsemax: A Sparse Model of Attention and Multi-Label
+       Classification. Martins, A. and Astudillo, R. ICML 2016.
+    2. Andersen Ang, Jianzhu Ma, Nianjun Liu, Kun Huang, Yijie Wang, Fast
+       Projection onto the Capped Simplex with Applications to Sparse
+       Regression in Bioinformatics. arXiv:2110.08471 [math.OC]
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers.core import arraytools
+
+
+def _center_active(
+    active: npt.NDArray,
+    vectors: npt.ArrayLike,
+    axis: int,
+    out: Optional[npt.NDArray],
+) -> npt.NDArray:
+    """Returns vectors less their mean over the active components along axis
+    with inactive components set to 0.
+
+    Raises:
+        A ValueError is issued if vectors and active differ in shape.
+    """
+
+    v = np.asarray(vectors)
+    if v.shape != active.shape:
+        msg = f'vectors shape {v.shape} must match projection {active.shape}'
+        raise ValueError(msg)
+
+    dtype = arraytools.result_dtype(np.result_type(v, active.dtype, 1.0))
+    counts = np.count_nonzero(active, axis=axis, keepdims=True)
+    sums = np.sum(v, axis=axis, where=active, keepdims=True, dtype=dtype)
+    # vectors without active components have a zero Jacobian
+    means = np.divide(sums, np.maximum(counts, 1), dtype=dtype)
+
+    result: npt.NDArray = np.subtract(v, means, out=out, dtype=dtype)
+    result[~active] = 0
+    return result
+
+
+def positive_jvp(
+    projection: npt.NDArray,
+    tangents: npt.ArrayLike,
+    axis: int = -1,
+    out: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Computes the Jacobian-vector product of each positive simplex projection
+    along axis with a tangent vector.
+
+    Args:
+        projection:
+            An N-D array of projections onto the positive simplex returned by
+            positive_simplexer.
+        tangents:
+            An array with the shape of projection of the perturbations of the
+            projected vectors.
+        axis:
+            The axis of projection containing vector components.
+        out:
+            An optional float array with the shape of projection in which to
+            store the products.
+
+    Returns:
+        An array with the shape of projection of the perturbations of the
+        projections.
+
+    Raises:
+        A ValueError is issued if tangents and projection differ in shape.
+
+    Examples:
+        >>> import numpy as np
+        >>> from simplexers.positive import positive_simplexer
+        >>> x = np.array([0.1, 1.2, 0.8, -0.3])
+        >>> p = positive_simplexer(x, 1)
+        >>> positive_jvp(p, np.array([1.0, 1.0, 0.0, 5.0]))
+        array([ 0. ,  0.5, -0.5,  0. ])
+    """
+
+    return _center_active(projection > 0, tangents, axis, out)
+
+
+def positive_vjp(
+    projection: npt.NDArray,
+    cotangents: npt.ArrayLike,
+    axis: int = -1,
+    out: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Computes the vector-Jacobian product of a cotangent vector with each
+    positive simplex projection along axis.
+
+    This is the product needed to backpropagate the gradient of a loss with
+    respect to the projections, such as sparsemax probabilities, to the
+    projected vectors.
+
+    Args:
+        projection:
+            An N-D array of projections onto the positive simplex returned by
+            positive_simplexer.
+        cotangents:
+            An array with the shape of projection of the gradients of a scalar
+            function with respect to the projections.
+        axis:
+            The axis of projection containing vector components.
+        out:
+            An optional float array with the shape of projection in which to
+            store the products.
+
+    Returns:
+        An array with the shape of projection of the gradients with respect to
+        the projected vectors.
+
+    Raises:
+        A ValueError is issued if cotangents and projection differ in shape.
+    """
+
+    # the Jacobian is symmetric
+    return _center_active(projection > 0, cotangents, axis, out)
+
+
+def capped_jvp(
+    projection: npt.NDArray,
+    tangents: npt.ArrayLike,
+    axis: int = -1,
+    out: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Computes the Jacobian-vector product of each capped simplex projection
+    along axis with a tangent vector.
+
+    Args:
+        projection:
+            An N-D array of projections onto the s-capped simplex returned by
+            capped_simplexer.
+        tangents:
+            An array with the shape of projection of the perturbations of the
+            projected vectors.
+        axis:
+            The axis of projection containing vector components.
+        out:
+            An optional float array with the shape of projection in which to
+            store the products.
+
+    Returns:
+        An array with the shape of projection of the perturbations of the
+        projections.
+
+    Raises:
+        A ValueError is issued if tangents and projection differ in shape.
+
+    Examples:
+        >>> import numpy as np
+        >>> from simplexers.capped import capped_simplexer
+        >>> x = np.array([0.2, 1.9, 0.7, -0.4])
+        >>> p = capped_simplexer(x, 2)
+        >>> capped_jvp(p, np.array([1.0, 1.0, 0.0, 1.0]))
+        array([ 0.5,  0. , -0.5,  0. ])
+    """
+
+    active = (projection > 0) & (projection < 1)
+    return _center_active(active, tangents, axis, out)
+
+
+def capped_vjp(
+    projection: npt.NDArray,
+    cotangents: npt.ArrayLike,
+    axis: int = -1,
+    out: Optional[npt.NDArray] = None,
+) -> npt.NDArray:
+    """Computes the vector-Jacobian product of a cotangent vector with each
+    capped simplex projection along axis.
+
+    Args:
+        projection:
+            An N-D array of projections onto the s-capped simplex returned by
+            capped_simplexer.
+        cotangents:
+            An array with the shape of projection of the gradients of a scalar
+            function with respect to the projections.
+        axis:
+            The axis of projection containing vector components.
+        out:
+            An optional float array with the shape of projection in which to
+            store the products.
+
+    Returns:
+        An array with the shape of projection of the gradients with respect to
+        the projected vectors.
+
+    Raises:
+        A ValueError is issued if cotangents and projection differ in shape.
+    """
+
+    # the Jacobian is symmetric
+    active = (projection > 0) & (projection < 1)
+    return _center_active(active, cotangents, axis, out)
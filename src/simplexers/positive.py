@@ -6,15 +6,35 @@ Functions:
             simplex.
 """
 
-from typing import Callable, Dict
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+from simplexers.core import arrayapi
 from simplexers.core import arraytools
+from simplexers.core import compiled
+from simplexers.core import costs
+from simplexers.core import feasibility
+from simplexers.core import parallel
+from simplexers.core import profiling
+from simplexers.core import results
+from simplexers.core import roots
+from simplexers.core import support
+from simplexers.core.workspace import Workspace
 
+# the bisect method, method selection & entry point duplicate those of
+# capped_simplexer but refactoring reduces clarity
+# pylint: disable=duplicate-code
 
-def _sorting_simplexer(arr: npt.NDArray, s: float) -> npt.NDArray:
+
+def _sorting_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
     """Computes the Euclidean projection of each 1-D array in y along axis onto
     the positive simplex using the sorting algorithm of Ref. 1.
 
@@ -26,12 +46,16 @@ def _sorting_simplexer(arr: npt.NDArray, s: float) -> npt.NDArray:
             A 2-D array, of vector(s) to project onto a simplex. It is assumed
             each vectors components lie along axis = 1.
         s:
-            A parameter that controls the position of the hyperplane in which
-            the resultant vector(s) must lie. A value of 1 forces all components
-            to be in [0,1] and sum(x_i) = 1 which is the standard probability
-            simplex.
+            A 2-D array of shape (len(arr), 1) of parameters, one per vector in
+            arr, that control the position of the hyperplane in which the
+            resultant vector(s) must lie.
+        workspace:
+            A Workspace whose buffers hold the sorted components, their
+            cumulative sums and the scratch arrays of this method. If None,
+            the buffers are allocated for this call only.
     Returns:
-        A 2-D array of vector projections one per vector in arr.
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        theta of each vector's projection, max(arr - theta, 0).
 
     References:
         1. Efficient Learning of Label Ranking by Soft Projections onto Polyhedra.
@@ -42,26 +66,287 @@ def _sorting_simplexer(arr: npt.NDArray, s: float) -> npt.NDArray:
            Ueda. ICPR 2014.
     """
 
-    v = np.atleast_2d(arr)
+    ws = Workspace() if workspace is None else workspace
     axis = -1
     # compute Lagrange multipliers 'thetas' (lemma 2 & 3 of Ref 1)
-    mus = arraytools.slice_along_axis(np.sort(v, axis=axis), step=-1, axis=axis)
-    css = np.cumsum(mus, axis=axis) - s
-    indices = np.arange(1, arr.shape[axis] + 1)
-    indices = arraytools.redim(indices, css.shape, axis=axis)
-    # mus descend so count_nonzeros to get rho
-    rho = np.count_nonzero(mus - css / indices > 0, axis=axis, keepdims=True)
-    thetas = np.take_along_axis(css, rho - 1, axis=axis) / rho
-
-    result: npt.NDArray = np.maximum(v - thetas, 0)
+    with profiling.phase('positive.sort.sort'):
+        mus = ws.get('sorted', arr.shape, arr.dtype)
+        np.copyto(mus, arr)
+        mus.sort(axis=axis)
+        mus = arraytools.slice_along_axis(mus, step=-1, axis=axis)
+    with profiling.phase('positive.sort.cumsum'):
+        css = ws.get('cumsum', arr.shape, arr.dtype)
+        np.cumsum(mus, axis=axis, out=css)
+        css -= s
+    with profiling.phase('positive.sort.partition'):
+        indices = np.arange(1, arr.shape[axis] + 1, dtype=arr.dtype)
+        indices = arraytools.redim(indices, css.shape, axis=axis)
+        # mus descend so count_nonzeros to get rho
+        scratch = ws.get('scratch', arr.shape, arr.dtype)
+        np.divide(css, indices, out=scratch)
+        np.subtract(mus, scratch, out=scratch)
+        mask = ws.get('mask', arr.shape, bool)
+        positives = np.greater(scratch, 0, out=mask)
+        rho = np.count_nonzero(positives, axis=axis, keepdims=True)
+        thetas: npt.NDArray = np.divide(
+            np.take_along_axis(css, rho - 1, axis=axis), rho, dtype=arr.dtype
+        )
+
+    return thetas
+
+
+def _filtering_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each 1-D array in arr onto the
+    positive simplex using the filtering algorithm of Ref. 1 with the
+    initialization of Ref. 2.
+
+    Starting from a lower bound on each vector's Lagrange multiplier theta,
+    components that are not greater than theta are discarded and theta is
+    recomputed from the remaining components until the remaining set no longer
+    changes. Each discarded component can never rejoin the support so the
+    candidates of every vector are compacted into a narrower array on each
+    pass. This avoids sorting and has an expected O(n) cost per vector, making
+    it suitable for large vectors whose projections have few nonzero
+    components.
+
+    Args:
+        arr:
+            A 2-D array, of vector(s) to project onto a simplex. It is assumed
+            each vectors components lie along axis = 1.
+        s:
+            A 2-D array of shape (len(arr), 1) of parameters, one per vector in
+            arr, that control the position of the hyperplane in which the
+            resultant vector(s) must lie.
+        workspace:
+            A Workspace whose buffer holds the mask of kept components. If None,
+            the buffer is allocated for this call only.
+    Returns:
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        theta of each vector's projection, max(arr - theta, 0).
+
+    References:
+        1. A finite algorithm for finding the projection of a point onto the
+           canonical simplex of R^n. Michelot, C. Journal of Optimization
+           Theory and Applications 50 (1986).
+        2. Fast projection onto the simplex and the l1 ball. Condat, L.
+           Mathematical Programming 158 (2016).
+    """
+
+    ws = Workspace() if workspace is None else workspace
+    n = arr.shape[1]
+    targets = s[:, 0]
+    # theta is bounded below by the mean shift and the shift of the largest
+    thetas = np.maximum(
+        (np.sum(arr, axis=1) - targets) / n, np.max(arr, axis=1) - targets
+    )
+
+    candidates = arr
+    sizes = np.full(len(arr), -1)
+    while True:
+        with profiling.phase('positive.filter.threshold'):
+            mask = ws.get('mask', arr.shape, bool)[:, : candidates.shape[1]]
+            keep = np.greater(candidates, thetas[:, np.newaxis], out=mask)
+            counts = np.count_nonzero(keep, axis=1)
+            sums = np.sum(candidates, axis=1, where=keep) - targets
+            thetas = np.divide(sums, counts, dtype=arr.dtype)
+        if np.array_equal(counts, sizes):
+            break
+        sizes = counts
+
+        with profiling.phase('positive.filter.compact'):
+            # move kept components to the front of a narrower array
+            rows, cols = np.nonzero(keep)
+            starts = np.cumsum(counts) - counts
+            positions = np.arange(len(rows)) - np.repeat(starts, counts)
+            candidates_ = np.full(
+                (len(arr), np.max(counts)), -np.inf, dtype=arr.dtype
+            )
+            candidates_[rows, positions] = candidates[rows, cols]
+            candidates = candidates_
+
+    result: npt.NDArray = thetas[:, np.newaxis]
+    return result
+
+
+def _bisection_simplexer(
+    arr: npt.NDArray,
+    s: npt.NDArray,
+    *,
+    guess: Optional[npt.NDArray] = None,
+    xtol: float = 2e-12,
+    rtol: float = 8.881784197001252e-16,
+    maxiter: int = 100,
+    full_output: bool = False,
+    workspace: Optional[Workspace] = None,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each 1-D array in arr onto the
+    positive simplex by simultaneously locating the critical points of every
+    vector's Lagrangian.
+
+    The sum of the projection's components, sum(max(y - theta, 0)), is
+    a decreasing piecewise linear function of theta that equals s within the
+    bracket [max(y) - s, max(y)]. A safeguarded Newton-Raphson method locates
+    theta for all vectors at once. Starting from a guess near the solution, as
+    when projecting nearly the same vectors repeatedly, the Newton steps are
+    exact after very few iterations.
+
+    Args:
+        arr:
+            A 2-D array, of vector(s) to project onto a simplex. It is assumed
+            each vectors components lie along axis = 1.
+        s:
+            A 2-D array of shape (len(arr), 1) of parameters, one per vector in
+            arr, that control the position of the hyperplane in which the
+            resultant vector(s) must lie.
+        guess:
+            An optional 2-D array of shape (len(arr), 1) of initial multipliers
+            such as those of a previous projection.
+        xtol:
+            The absolute tolerance of the located theta for each vector.
+        rtol:
+            The relative tolerance of the located theta for each vector.
+        maxiter:
+            The maximum number of Newton or bisection iterations.
+        full_output:
+            If True, the iteration count and convergence flag of each vector
+            follow its multiplier as two extra columns.
+        workspace:
+            A Workspace whose buffers hold the shifted components and the mask
+            of positive components of each iteration. If None, the buffers are
+            allocated for this call only.
+    Returns:
+        A 2-D array of shape (len(arr), 1) containing the Lagrange multiplier
+        theta of each vector's projection, max(arr - theta, 0).
+    """
+
+    ws = Workspace() if workspace is None else workspace
+    targets = s[:, 0]
+
+    def omega_prime(theta, rows):
+        """Derivative of the projection Lagrangian wrt theta and its slope for
+        the vectors of arr at rows."""
+
+        # rows are valid so clip mode lets take write to shifted unbuffered
+        shifted = ws.get('shifted', arr.shape, arr.dtype)[: len(rows)]
+        np.take(arr, rows, axis=0, out=shifted, mode='clip')
+        shifted -= theta[:, np.newaxis]
+        positives = ws.get('mask', arr.shape, bool)[: len(rows)]
+        np.greater(shifted, 0, out=positives)
+
+        value = targets[rows] - np.sum(shifted, axis=1, where=positives)
+        slope = np.count_nonzero(positives, axis=1)
+        return value, slope
+
+    maxima = np.max(arr, axis=1)
+    iterations = np.zeros(len(arr), dtype=int)
+    with profiling.phase('positive.bisect.newton'):
+        thetas = roots.newton_bisect(
+            omega_prime,
+            maxima - targets,
+            maxima,
+            guess=None if guess is None else guess[:, 0],
+            xtol=xtol,
+            rtol=rtol,
+            maxiter=maxiter,
+            iterations=iterations,
+        )
+
+    if full_output:
+        return results.columns(thetas, iterations)
+
+    result: npt.NDArray = thetas[:, np.newaxis]
     return result
 
 
+# the algorithms of the positive_simplexer keyed on method name
+METHODS: Dict[str, Callable[..., npt.NDArray]] = {
+    'sort': _sorting_simplexer,
+    'filter': _filtering_simplexer,
+    'bisect': _bisection_simplexer,
+}
+
+
+# the compiled algorithms of the positive_simplexer keyed on method name
+COMPILED_METHODS: Dict[str, Callable[..., npt.NDArray]] = {
+    'filter': compiled.positive_filter,
+}
+
+
+def _select_algorithm(
+    method: str,
+    backend: str,
+    shape: Tuple[int, int],
+    k: Optional[int],
+    keywords: Iterable[str],
+) -> Callable[..., npt.NDArray]:
+    """Returns the algorithm of a method and backend selecting the method
+    predicted to be fastest for a batch of shape if method is 'auto'.
+
+    'Auto' selects among the methods accepting the keyword arguments named in
+    keywords only. Compiled methods replace the NumPy methods only if they
+    accept these keywords.
+
+    Raises:
+        A ValueError is issued if no method accepts the keywords for 'auto' or
+        if the compiled method of the 'numba' backend does not accept them.
+    """
+
+    use_compiled = compiled.use_compiled(backend)
+    if method == 'auto':
+        candidates = [
+            name
+            for name, func in METHODS.items()
+            if costs.accepts(func, keywords)
+        ]
+        if not candidates:
+            msg = f'No method accepts the keyword arguments {sorted(keywords)}'
+            raise ValueError(msg)
+
+        m, n = shape
+        method = costs.get_model().select(
+            'positive',
+            candidates,
+            m,
+            n if k is None else min(k, n),
+            'numba' if use_compiled else 'numpy',
+        )
+
+    if not use_compiled or method not in COMPILED_METHODS:
+        return METHODS[method]
+
+    if costs.accepts(COMPILED_METHODS[method], keywords):
+        return COMPILED_METHODS[method]
+
+    if backend == 'numba':
+        msg = (
+            f"The compiled '{method}' method does not accept the keyword "
+            f"arguments {sorted(keywords)}"
+        )
+        raise ValueError(msg)
+
+    return METHODS[method]
+
+
+@profiling.instrument('positive')
+# pylint: disable-next=too-many-arguments
 def positive_simplexer(
     arr: npt.NDArray,
-    s: float,
+    s: npt.ArrayLike,
     axis: int = -1,
     method: str = 'sort',
+    *,
+    k: Optional[int] = None,
+    out: Optional[npt.NDArray] = None,
+    inplace: bool = False,
+    workspace: Optional[Workspace] = None,
+    n_jobs: Optional[int | Executor] = None,
+    backend: str = 'auto',
+    check_feasible: bool = True,
+    info: Optional[results.ProjectionInfo] = None,
     **kwargs,
 ) -> npt.NDArray:
     """Computes the Euclidean projection of each 1-D array in y along axis onto
@@ -76,15 +361,83 @@ def positive_simplexer(
     positive orthant and lie on the hyperplane x.T * np.ones = s.
     Args:
         arr:
-            A 2-D array, of vector(s) to project onto a simplex.
+            An N-D array, of vector(s) to project onto a simplex.
+            Float32 and float64 arrays are projected in their own precision
+            while float16 arrays are projected with float32 multipliers.
+            Arrays of other array API libraries, such as CuPy, PyTorch or
+            JAX, are projected in their own namespace by the 'sort' and
+            'bisect' methods of simplexers.core.arrayapi.
         s:
             A parameter that controls the position of the hyperplane in which
             the resultant vector(s) must lie. A value of 1 forces all components
             to be in [0,1] and sum(x_i) = 1 which is the standard probability
-            simplex.
+            simplex. A scalar applies the same parameter to every vector while
+            an array broadcastable to the shape of arr with axis removed gives
+            each vector its own parameter.
         axis:
             The axis of arr containing the components to project onto the
-            positive simplex .
+            positive simplex. Any axis may be given.
+        method:
+            A string method name specifying the algorithm used to make the
+            projection. Must be one of {'sort', 'filter', 'bisect', 'auto'}.
+            The 'sort' method is the O(n*log(n)) sorting algorithm of Ref. 1.
+            'Filter' discards components that can not be in the support of the
+            projection until the support is found (Refs. 3 & 4). It has an
+            expected O(n) cost and is the faster choice for large vectors whose
+            projections have few nonzero components. 'Bisect' locates the
+            critical points of the Lagrangian for all vectors at once using
+            a safeguarded Newton-Raphson method and accepts the xtol, rtol and
+            maxiter tolerances as keyword arguments. 'Auto' selects the method,
+            among those accepting the given keyword arguments, predicted to be
+            fastest for the shape of the batch and the backend by the cost
+            model of simplexers.core.costs, which simplexers.tuning.calibrate
+            fits to this machine. The model ignores the dtype and the sum
+            constraints of the batch.
+        k:
+            An optional upper bound on the number of nonzero components in each
+            projection. If given, the method is applied to only the k largest
+            components of each vector and vectors whose projections turn out to
+            have more than k nonzero components are reprojected using all of
+            their components. For large vectors with sparse projections this
+            avoids most of the cost of sorting.
+        out:
+            An optional float array with the same shape as arr in which to
+            store the projections.
+        inplace:
+            If True, arr is overwritten with its projections and out is
+            ignored. Arr must then be a float array.
+        workspace:
+            An optional Workspace whose buffers hold the intermediate arrays of
+            the method. Reusing one workspace across calls that project
+            same-shaped arrays avoids reallocating these arrays on every call.
+        n_jobs:
+            The number of worker threads or a concurrent.futures Executor
+            across which chunks of vectors are projected. A negative number
+            uses one thread per CPU. The vectorized methods release the GIL
+            in NumPy and scale with threads while methods that loop over
+            vectors in Python require a ProcessPoolExecutor. If None, the
+            vectors are projected in this thread.
+        backend:
+            The implementation of the method. One of 'auto', 'numpy' or
+            'numba'. The 'numba' backend runs a compiled loop for the 'filter'
+            method and requires numba. 'Auto' uses this loop whenever numba is
+            installed and the NumPy methods otherwise. Other methods always
+            run in NumPy.
+        check_feasible:
+            If True, vectors already lying on the simplex are detected in one
+            vectorized pass and returned without running the method. The pass
+            speeds up iterative solvers whose vectors are mostly feasible but
+            adds a few percent to the time of batches of infeasible vectors,
+            which may skip it by passing False.
+        info:
+            An optional ProjectionInfo that is filled with the multipliers,
+            support sizes, iteration counts and convergence flags of the
+            projections. Computing these costs one extra pass over the
+            projections rather than a second projection.
+
+    Returns:
+        An array of vector projections with the same shape as arr. Floating
+        arrays keep their dtype and other arrays are projected in float64.
 
     References:
         1. Efficient Learning of Label Ranking by Soft Projections onto Polyhedra.
@@ -93,21 +446,57 @@ def positive_simplexer(
         2. Large-scale Multiclass Support Vector Machine Training via Euclidean
            Projection onto the Simplex Mathieu Blondel, Akinori Fujino, and Naonori
            Ueda. ICPR 2014.
+        3. A finite algorithm for finding the projection of a point onto the
+           canonical simplex of R^n. Michelot, C. Journal of Optimization
+           Theory and Applications 50 (1986).
+        4. Fast projection onto the simplex and the l1 ball. Condat, L.
+           Mathematical Programming 158 (2016).
     """
 
-    if arr.ndim > 2:
-        msg = 'Array(s) to project must have at most 2 dimensions'
-        raise ValueError(msg)
-
-    # more methods such as bisection will later be added
-    # duplicates capped_simplexer but refactoring reduces clarity
-    # pylint: disable=duplicate-code
-    methods: Dict[str, Callable] = {'sort': _sorting_simplexer}
-    algorithm = methods[method]
+    if not isinstance(arr, np.ndarray):
+        # options requiring ndarrays are rejected by the array API methods
+        return arrayapi.project(
+            'positive',
+            arr,
+            s,
+            axis,
+            method,
+            k=k,
+            out=out,
+            inplace=inplace,
+            n_jobs=n_jobs,
+            info=info,
+            **kwargs,
+        )
 
-    z = np.atleast_2d(arr)
-    z = z.T if axis == 0 else z
-    result: npt.NDArray = algorithm(z, s, **kwargs)
-    # pylint: enable=duplicate-code
+    with profiling.phase('positive.flatten'):
+        dtype = arraytools.working_dtype(arr.dtype)
+        z = arraytools.flatten_along_axis(arr, axis, dtype)
+        sums = arraytools.flatten_batch(s, arr.shape, axis, dtype)
+    algorithm = _select_algorithm(method, backend, z.shape, k, kwargs)
+    if check_feasible:
+        # vectors already on the simplex are their own projections
+        algorithm = partial(
+            feasibility.feasible_multipliers, algorithm, cap=None
+        )
+    if info is not None:
+        algorithm = partial(results.diagnose, algorithm)
+    algorithm = partial(support.topk_multipliers, algorithm, k=k, **kwargs)
+    with profiling.phase('positive.multipliers'):
+        diagnostics = parallel.map_rows(algorithm, z, sums, n_jobs, workspace)
+    with profiling.phase('positive.project'):
+        # project in arr's own memory layout by broadcasting the multipliers
+        thetas = arraytools.unflatten_along_axis(
+            diagnostics[:, :1], arr.shape, axis
+        )
+        if out is None and not inplace:
+            # float16 projections are rounded once from float32 differences
+            out = np.empty_like(arr, dtype=arraytools.result_dtype(arr.dtype))
+        result: npt.NDArray = np.subtract(
+            arr, thetas, out=arr if inplace else out
+        )
+        np.maximum(result, 0, out=result)
+    if info is not None:
+        info.record(diagnostics, result, axis, cap=None)
 
-    return result.T if axis == 0 else result
+    return result
@@ -0,0 +1,256 @@
+"""Simplexers that project variable length vectors stored end to end in a flat
+array of values delimited by offsets onto the positive and s-capped simplices.
+
+A batch of vectors of differing lengths can not be stored in a rectangular
+array without padding and padded components change the projections. These
+simplexers instead take the values of all vectors in one 1-D array and an
+array of offsets delimiting each vector, the layout of a CSR matrix's data and
+indptr arrays. Vectors of similar length are padded into the rows of a few
+2-D arrays, one per length bucket, that are projected by the dense simplexers
+so the cost of a Python call is paid per bucket rather than per vector.
+
+Functions:
+    ragged_positive_simplexer:
+        Computes the Euclidean projection of each segment of a flat array onto
+        the positive simplex.
+    ragged_capped_simplexer:
+        Computes the Euclidean projection of each segment of a flat array onto
+        the s-capped simplex.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers import capped
+from simplexers import positive
+from simplexers.core import arraytools
+from simplexers.core import segments
+
+# the dense simplexer that projects the padded segments of each simplex
+SIMPLEXERS = {
+    'positive': positive.positive_simplexer,
+    'capped': capped.capped_simplexer,
+}
+
+
+def _validate_offsets(
+    values: npt.NDArray,
+    offsets: npt.ArrayLike,
+) -> npt.NDArray:
+    """Returns offsets as a 1-D integer array after checking that they delimit
+    nonempty segments spanning values.
+
+    Raises:
+        A ValueError is issued if offsets do not start at 0, end at the length
+        of values, or strictly increase.
+    """
+
+    offsets = np.asarray(offsets)
+    if values.ndim != 1 or offsets.ndim != 1 or len(offsets) < 2:
+        msg = 'values and offsets must be 1-D with at least one segment'
+        raise ValueError(msg)
+
+    if offsets[0] != 0 or offsets[-1] != len(values):
+        msg = f'offsets must start at 0 and end at len(values)={len(values)}'
+        raise ValueError(msg)
+
+    # an empty vector has no projection onto a simplex
+    if np.any(np.diff(offsets) <= 0):
+        msg = 'offsets must strictly increase'
+        raise ValueError(msg)
+
+    return offsets.astype(np.intp, copy=False)
+
+
+def _widths(lengths: npt.NDArray) -> npt.NDArray:
+    """Returns the padded width of each segment, the smallest power of sqrt(2)
+    rounded up to an integer that is at least the segment's length, so that
+    padding at most adds 42% to a segment's length."""
+
+    exponents = np.ceil(2 * np.log2(lengths)) / 2
+    widths: npt.NDArray = np.ceil(2**exponents).astype(int)
+    return widths
+
+
+def _pads(
+    simplex: str,
+    z: npt.NDArray,
+    offsets: npt.NDArray,
+    s: npt.NDArray,
+) -> npt.NDArray:
+    """Returns a value for each segment of z that lies below the multiplier of
+    the segment's projection so that it projects to 0.
+
+    The positive simplex multiplier theta is at least max(y) - s and the
+    capped simplex multiplier gamma is at least min(y) - 1.
+    """
+
+    if simplex == 'positive':
+        maxima = segments.segment_reduce(np.maximum, z, offsets, -np.inf)
+        pads: npt.NDArray = (maxima - s - 1).astype(z.dtype)
+    else:
+        minima = segments.segment_reduce(np.minimum, z, offsets, np.inf)
+        pads = (minima - 2).astype(z.dtype)
+
+    return pads
+
+
+def _ragged_simplexer(
+    simplex: str,
+    values: npt.ArrayLike,
+    offsets: npt.ArrayLike,
+    s: npt.ArrayLike,
+    method: str,
+    **kwargs,
+) -> npt.NDArray:
+    """Projects the segments of values onto the positive or capped simplex.
+
+    Segments of similar length are gathered into the rows of a 2-D array
+    padded with a value that lies below the row's multiplier. Padding then
+    projects to 0 without changing the projection of the segment so each
+    2-D array is projected by the vectorized dense simplexer.
+
+    Args:
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        values:
+            A 1-D array of the components of all vectors stored end to end.
+        offsets:
+            A 1-D integer array of length m + 1 delimiting m vectors.
+        s:
+            A scalar or 1-D array of sum constraints one per vector.
+        method:
+            The name of a method of the dense simplexer.
+        kwargs:
+            Any keyword arguments of the dense simplexer.
+
+    Returns:
+        A 1-D array of the projections of the vectors stored end to end.
+
+    Raises:
+        A ValueError is issued if offsets are invalid.
+    """
+
+    arr = np.asarray(values)
+    offsets = _validate_offsets(arr, offsets)
+    z = arr.astype(arraytools.working_dtype(arr.dtype), copy=False)
+    m = len(offsets) - 1
+    sums = arraytools.flatten_batch(s, (m, 1), dtype=z.dtype)[:, 0]
+
+    pads = _pads(simplex, z, offsets, sums)
+    lengths = np.diff(offsets)
+    widths = _widths(lengths)
+    result = np.empty(len(z), dtype=arraytools.result_dtype(arr.dtype))
+    if simplex == 'capped':
+        # every component of a segment whose sum equals its length is 1 and
+        # the multiplier of such a segment has no bracketing interval
+        full = sums == lengths
+        positions, _ = segments.gather(offsets, np.flatnonzero(full))
+        result[positions] = 1
+        widths[full] = 0
+    for width in np.unique(widths[widths > 0]):
+        rows = np.flatnonzero(widths == width)
+        positions, ids = segments.gather(offsets, rows)
+        columns = positions - offsets[rows][ids]
+        padded = np.repeat(pads[rows, np.newaxis], width, axis=1)
+        padded[ids, columns] = z[positions]
+        projection = SIMPLEXERS[simplex](
+            padded, sums[rows], method=method, **kwargs
+        )
+        result[positions] = projection[ids, columns]
+
+    return result
+
+
+def ragged_positive_simplexer(
+    values: npt.ArrayLike,
+    offsets: npt.ArrayLike,
+    s: npt.ArrayLike = 1,
+    method: str = 'sort',
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each vector of a flat array of
+    variable length vectors onto the positive simplex.
+
+    Args:
+        values:
+            A 1-D array of the components of all vectors stored end to end.
+        offsets:
+            A 1-D integer array of length m + 1, like a CSR matrix's indptr,
+            whose consecutive elements delimit the components of m nonempty
+            vectors. It must start at 0 and end at len(values).
+        s:
+            The sum constraint for each vector. A scalar applies the same
+            constraint to every vector while a 1-D array gives each vector its
+            own constraint.
+        method:
+            A method of positive_simplexer. One of {'sort', 'filter',
+            'bisect', 'auto'}.
+        kwargs:
+            Any keyword arguments of positive_simplexer except axis, out,
+            inplace and info, such as the tolerances of the 'bisect' method,
+            k, n_jobs or backend.
+
+    Returns:
+        A 1-D array of the projections of the vectors stored end to end with
+        the layout of values. Floating values keep their dtype and other
+        values are projected in float64.
+
+    Raises:
+        A ValueError is issued if offsets are invalid.
+
+    Examples:
+        >>> x = np.array([0.3, 1.2, 0.9, -0.5, 2.0, 0.4, 0.6])
+        >>> ragged_positive_simplexer(x, [0, 3, 4, 7])
+        array([0.  , 0.65, 0.35, 1.  , 1.  , 0.  , 0.  ])
+    """
+
+    return _ragged_simplexer('positive', values, offsets, s, method, **kwargs)
+
+
+def ragged_capped_simplexer(
+    values: npt.ArrayLike,
+    offsets: npt.ArrayLike,
+    s: npt.ArrayLike = 1,
+    method: str = 'root',
+    **kwargs,
+) -> npt.NDArray:
+    """Computes the Euclidean projection of each vector of a flat array of
+    variable length vectors onto the s-capped simplex.
+
+    Args:
+        values:
+            A 1-D array of the components of all vectors stored end to end.
+        offsets:
+            A 1-D integer array of length m + 1, like a CSR matrix's indptr,
+            whose consecutive elements delimit the components of m nonempty
+            vectors. It must start at 0 and end at len(values).
+        s:
+            The sum constraint for each vector. A scalar applies the same
+            constraint to every vector while a 1-D array gives each vector its
+            own constraint. Each constraint must not exceed the length of its
+            vector and vectors whose constraint equals their length project
+            to vectors of ones.
+        method:
+            A method of capped_simplexer. One of {'root', 'bisect',
+            'breakpoint', 'sort', 'auto'}.
+        kwargs:
+            Any keyword arguments of capped_simplexer except axis, out,
+            inplace and info.
+
+    Returns:
+        A 1-D array of the projections of the vectors stored end to end with
+        the layout of values. Floating values keep their dtype and other
+        values are projected in float64.
+
+    Raises:
+        A ValueError is issued if offsets are invalid.
+
+    Examples:
+        >>> x = np.array([0.2, 1.9, 0.7, -0.4, 0.5, 0.5, 3.0])
+        >>> ragged_capped_simplexer(x, [0, 4, 7], s=2)
+        array([0.25, 1.  , 0.75, 0.  , 0.5 , 0.5 , 1.  ])
+    """
+
+    return _ragged_simplexer('capped', values, offsets, s, method, **kwargs)
@@ -0,0 +1,272 @@
+"""Simplexers that project the rows of CSR sparse matrices onto the positive
+and s-capped simplices without densifying them.
+
+Functions:
+    sparse_positive_simplexer:
+        Computes the Euclidean projection of each row of a sparse matrix onto
+        the positive simplex.
+    sparse_capped_simplexer:
+        Computes the Euclidean projection of each row of a sparse matrix onto
+        the s-capped simplex.
+"""
+
+from typing import Callable, Tuple
+
+import numpy as np
+import numpy.typing as npt
+from scipy import sparse
+
+from simplexers.core import arraytools
+from simplexers.core import roots
+from simplexers.core import segments
+
+# the lower and upper component bounds of each simplex's projection
+BOUNDS = {'positive': (0, np.inf), 'capped': (0, 1)}
+
+
+def _as_csr(matrix) -> sparse.csr_array:
+    """Returns a canonical CSR array of a scipy sparse matrix or array.
+
+    Raises:
+        A TypeError is issued if matrix is not a scipy sparse matrix or array.
+    """
+
+    if not sparse.issparse(matrix):
+        msg = f'A scipy sparse matrix or array is required not {type(matrix)}'
+        raise TypeError(msg)
+
+    csr = sparse.csr_array(matrix)
+    if not csr.has_canonical_format:
+        csr = csr.copy()
+        csr.sum_duplicates()
+
+    return csr
+
+
+def _omega_prime(
+    csr: sparse.csr_array,
+    s: npt.NDArray,
+    bounds: Tuple[float, float],
+) -> Callable[[npt.NDArray, npt.NDArray], Tuple[npt.NDArray, npt.NDArray]]:
+    """Returns the derivative of the projection Lagrangian wrt the multiplier
+    and its slope for the rows of csr.
+
+    The stored values of each row are shifted and clipped to the bounds while
+    the row's implicit zeros, which share a single shifted value, are counted
+    rather than materialized.
+    """
+
+    low, high = bounds
+    zeros = csr.shape[1] - np.diff(csr.indptr)
+
+    def func(multiplier, rows):
+        """Returns the values & slopes of the Lagrangian derivatives at rows."""
+
+        positions, ids = segments.gather(csr.indptr, rows)
+        shifted = csr.data[positions] - multiplier[ids]
+        interior = (shifted > low) & (shifted < high)
+        np.clip(shifted, low, high, out=shifted)
+
+        implicit = np.clip(-multiplier, low, high)
+        implicit_interior = (-multiplier > low) & (-multiplier < high)
+
+        # bincount returns integers if no row of the batch stores a value
+        total = np.bincount(ids, weights=shifted, minlength=len(rows))
+        total = total.astype(float, copy=False)
+        total += zeros[rows] * implicit
+        slope = np.bincount(ids, weights=interior, minlength=len(rows))
+        slope = slope.astype(float, copy=False)
+        slope += zeros[rows] * implicit_interior
+        return s[rows, 0] - total, slope
+
+    return func
+
+
+def _project(
+    csr: sparse.csr_array,
+    multipliers: npt.NDArray,
+    bounds: Tuple[float, float],
+) -> sparse.csr_array:
+    """Returns the sparse projection of each row of csr given the Lagrange
+    multiplier of each row.
+
+    Rows whose implicit zeros project to a nonzero value, rows with negative
+    multipliers, are stored densely in the result. Their components are
+    written directly into the result's arrays so no temporary arrays larger
+    than a row are allocated.
+    """
+
+    m, n = csr.shape
+    counts = np.diff(csr.indptr)
+    ids = np.repeat(np.arange(m), counts)
+    data = np.clip(csr.data - multipliers[ids], *bounds)
+    fills = np.clip(-multipliers, *bounds)
+    dense = fills != 0
+
+    # copy the structure since eliminating zeros rewrites it in place
+    indices, indptr = csr.indices.copy(), csr.indptr.copy()
+    if dense.any():
+        indptr = np.zeros(m + 1, dtype=np.intp)
+        np.cumsum(np.where(dense, n, counts), out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=csr.indices.dtype)
+        values = np.empty(indptr[-1], dtype=data.dtype)
+
+        # sparse rows keep the structure of their stored components
+        rows = np.flatnonzero(~dense)
+        sources, _ = segments.gather(csr.indptr, rows)
+        targets, _ = segments.gather(indptr, rows)
+        indices[targets] = csr.indices[sources]
+        values[targets] = data[sources]
+
+        # dense rows store every column overwriting the fill at stored ones
+        columns = np.arange(n)
+        for row in np.flatnonzero(dense):
+            start, stored = indptr[row], slice(*csr.indptr[row : row + 2])
+            indices[start : start + n] = columns
+            values[start : start + n] = fills[row]
+            values[start + csr.indices[stored]] = data[stored]
+        data = values
+
+    result = sparse.csr_array((data, indices, indptr), shape=(m, n))
+    result.eliminate_zeros()
+    return result
+
+
+def _sparse_simplexer(
+    simplex: str,
+    matrix,
+    s: npt.ArrayLike,
+    **kwargs,
+):
+    """Projects the rows of a sparse matrix onto the positive or capped simplex.
+
+    Args:
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        matrix:
+            A scipy sparse matrix or array of vectors stored in rows.
+        s:
+            A scalar or 1-D array of sum constraints one per row.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the root finder.
+
+    Returns:
+        A CSR sparse array of projections, or a CSR sparse matrix if matrix is
+        a scipy sparse matrix.
+    """
+
+    bounds = BOUNDS[simplex]
+    csr = _as_csr(matrix)
+    m, n = csr.shape
+    sums = arraytools.flatten_batch(s, (m, n))
+
+    # the extreme components of each row including any implicit zeros
+    has_zeros = np.diff(csr.indptr) < n
+    maxima = segments.segment_reduce(np.maximum, csr.data, csr.indptr, -np.inf)
+    minima = segments.segment_reduce(np.minimum, csr.data, csr.indptr, np.inf)
+    maxima[has_zeros] = np.maximum(maxima[has_zeros], 0)
+    minima[has_zeros] = np.minimum(minima[has_zeros], 0)
+
+    # each simplex's critical point lies within the dense simplexer's bracket
+    lows = maxima - sums[:, 0] if simplex == 'positive' else minima - 1
+    multipliers = roots.newton_bisect(
+        _omega_prime(csr, sums, bounds), lows, maxima, **kwargs
+    )
+
+    result = _project(csr, multipliers, bounds)
+    if isinstance(matrix, sparse.sparray):
+        return result
+
+    return sparse.csr_matrix(result)
+
+
+def sparse_positive_simplexer(
+    matrix,
+    s: npt.ArrayLike = 1,
+    **kwargs,
+):
+    """Computes the Euclidean projection of each row of a sparse matrix onto
+    the positive simplex.
+
+    The projection max(y - theta, 0) of a row y is located from the row's
+    stored values alone. The implicit zeros of a row all share one shifted
+    value so they enter the sum constraint through their count and are never
+    densified. The multipliers of all rows are located at once with
+    a safeguarded Newton-Raphson method on segments of the CSR data.
+
+    Args:
+        matrix:
+            A scipy sparse matrix or array of vectors to project stored in
+            rows. Matrices in other formats are converted to CSR.
+        s:
+            The sum constraint for each row. A scalar applies the same
+            constraint to every row while a 1-D array gives each row its own
+            constraint.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the root finder.
+
+    Returns:
+        A CSR sparse array of row projections or a CSR sparse matrix if matrix
+        is a scipy sparse matrix. A row whose multiplier is negative, one whose
+        positive components sum to less than s, projects its implicit zeros to
+        a positive value and is stored densely.
+
+    Raises:
+        A TypeError is issued if matrix is not a scipy sparse matrix or array.
+
+    Examples:
+        >>> from scipy import sparse
+        >>> x = sparse.csr_array([[0, 3, 0, 1], [2, 0, 0, 0]])
+        >>> sparse_positive_simplexer(x, s=2).toarray()
+        array([[0., 2., 0., 0.],
+               [2., 0., 0., 0.]])
+    """
+
+    return _sparse_simplexer('positive', matrix, s, **kwargs)
+
+
+def sparse_capped_simplexer(
+    matrix,
+    s: npt.ArrayLike = 1,
+    **kwargs,
+):
+    """Computes the Euclidean projection of each row of a sparse matrix onto
+    the s-capped simplex.
+
+    The projection clip(y - gamma, 0, 1) of a row y is located from the row's
+    stored values alone. The implicit zeros of a row all share one shifted
+    value so they enter the sum constraint through their count and are never
+    densified. The multipliers of all rows are located at once with
+    a safeguarded Newton-Raphson method on segments of the CSR data.
+
+    Args:
+        matrix:
+            A scipy sparse matrix or array of vectors to project stored in
+            rows. Matrices in other formats are converted to CSR.
+        s:
+            The sum constraint for each row. A scalar applies the same
+            constraint to every row while a 1-D array gives each row its own
+            constraint. Each constraint must be less than the number of
+            columns.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the root finder.
+
+    Returns:
+        A CSR sparse array of row projections or a CSR sparse matrix if matrix
+        is a scipy sparse matrix. A row whose multiplier is negative, one whose
+        components clipped to [0, 1] sum to less than s, projects its implicit
+        zeros to a positive value and is stored densely.
+
+    Raises:
+        A TypeError is issued if matrix is not a scipy sparse matrix or array.
+
+    Examples:
+        >>> from scipy import sparse
+        >>> x = sparse.csr_array([[0, 3, 0, 2], [2, 0, 0, 1.5]])
+        >>> sparse_capped_simplexer(x, s=2).toarray()
+        array([[0., 1., 0., 1.],
+               [1., 0., 0., 1.]])
+    """
+
+    return _sparse_simplexer('capped', matrix, s, **kwargs)
@@ -0,0 +1,217 @@
+"""Simplexers that project the rows of out-of-core arrays onto the positive or
+s-capped simplex one cache-sized chunk of rows at a time.
+
+Functions:
+    iter_projections:
+        Yields the projections of consecutive chunks of rows from an array,
+        memory-mapped .npy file or iterator of row blocks.
+    project_to:
+        Writes the projections of all rows of an array or memory-mapped .npy
+        file to an output array or memory-mapped .npy file.
+"""
+
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers import capped
+from simplexers import positive
+from simplexers.core import arraytools
+from simplexers.core.workspace import Workspace
+
+# the simplexer projecting onto each simplex
+SIMPLEXERS: Dict[str, Callable[..., npt.NDArray]] = {
+    'positive': positive.positive_simplexer,
+    'capped': capped.capped_simplexer,
+}
+
+# the default number of bytes of rows in each chunk, chunks of ~1 MiB keep the
+# intermediate arrays of the simplexers in cache
+CHUNK_BYTES = 2**20
+
+
+def _open(source: str | os.PathLike | npt.NDArray | Iterable[npt.NDArray]):
+    """Returns source or, if source is a path, a read-only memory map of the
+    .npy file at source."""
+
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode='r')
+
+    return source
+
+
+def _chunks(
+    source: npt.NDArray | Iterable[npt.NDArray],
+    chunksize: Optional[int] = None,
+) -> Iterator[npt.NDArray]:
+    """Yields consecutive chunks of rows of an array or of each block of an
+    iterable of 2-D row blocks.
+
+    If chunksize is None, each chunk holds about CHUNK_BYTES of rows.
+    """
+
+    blocks = [source] if isinstance(source, np.ndarray) else source
+    for block in blocks:
+        block = np.asanyarray(block)
+        rowbytes = max(block[0].nbytes, 1) if len(block) else 1
+        rows = chunksize or max(CHUNK_BYTES // rowbytes, 1)
+        for start in range(0, len(block), rows):
+            yield block[start : start + rows]
+
+
+def _project_chunks(
+    source: str | os.PathLike | npt.NDArray | Iterable[npt.NDArray],
+    simplex: str,
+    s: npt.ArrayLike,
+    chunksize: Optional[int],
+    out: Optional[npt.NDArray],
+    **kwargs,
+) -> Iterator[npt.NDArray]:
+    """Yields the projection of each chunk of rows of source writing them to
+    the matching rows of out if out is not None.
+
+    Raises:
+        A ValueError is issued if simplex is not 'positive' or 'capped'.
+    """
+
+    if simplex not in SIMPLEXERS:
+        msg = f'simplex must be one of {list(SIMPLEXERS)} not {simplex}'
+        raise ValueError(msg)
+
+    simplexer = SIMPLEXERS[simplex]
+    sums = np.asarray(s)
+    workspace = Workspace()
+    start = 0
+    for chunk in _chunks(_open(source), chunksize):
+        stop = start + len(chunk)
+        targets = sums[start:stop] if sums.ndim else sums
+        rows = None if out is None else out[start:stop]
+        yield simplexer(
+            chunk, targets, out=rows, workspace=workspace, **kwargs
+        )
+        start = stop
+
+
+def iter_projections(
+    source: str | os.PathLike | npt.NDArray | Iterable[npt.NDArray],
+    simplex: str = 'capped',
+    s: npt.ArrayLike = 1,
+    *,
+    chunksize: Optional[int] = None,
+    **kwargs,
+) -> Iterator[npt.NDArray]:
+    """Yields the projections of consecutive chunks of rows of source onto the
+    positive or s-capped simplex.
+
+    Only one chunk of rows and its projection are held in memory at a time and
+    the intermediate arrays of the simplexer are allocated once in a workspace
+    shared by all chunks.
+
+    Args:
+        source:
+            A 2-D array or np.memmap of vectors stored in rows, a path to a .npy
+            file of such an array that will be memory-mapped, or an iterable of
+            2-D row blocks.
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        s:
+            The sum constraint for each row. A scalar applies the same
+            constraint to every row while a 1-D array with one element per row
+            of source gives each row its own constraint.
+        chunksize:
+            The number of rows in each chunk. If None, each chunk holds about
+            CHUNK_BYTES of rows. Blocks of an iterable source are split into
+            chunks but never merged.
+        kwargs:
+            Any keyword argument of the simplexer such as method.
+
+    Yields:
+        2-D arrays of row projections one per chunk of rows.
+
+    Raises:
+        A ValueError is issued if simplex is not 'positive' or 'capped'.
+
+    Examples:
+        >>> x = np.random.default_rng(0).uniform(0, 3, size=(10, 4))
+        >>> chunks = list(iter_projections(x, 'capped', s=2, chunksize=4))
+        >>> [len(chunk) for chunk in chunks]
+        [4, 4, 2]
+    """
+
+    yield from _project_chunks(source, simplex, s, chunksize, None, **kwargs)
+
+
+def project_to(
+    source: str | os.PathLike | npt.NDArray,
+    out: str | os.PathLike | npt.NDArray,
+    simplex: str = 'capped',
+    s: npt.ArrayLike = 1,
+    *,
+    chunksize: Optional[int] = None,
+    **kwargs,
+) -> npt.NDArray:
+    """Writes the projections of the rows of source onto the positive or
+    s-capped simplex to out one chunk of rows at a time.
+
+    Args:
+        source:
+            A 2-D array or np.memmap of vectors stored in rows or a path to
+            a .npy file of such an array that will be memory-mapped.
+        out:
+            A float array or np.memmap with the shape of source or a path at
+            which a memory-mapped .npy file of projections is created. The
+            file's dtype is that of source if it is a float array and float64
+            otherwise.
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        s:
+            The sum constraint for each row. A scalar applies the same
+            constraint to every row while a 1-D array with one element per row
+            of source gives each row its own constraint.
+        chunksize:
+            The number of rows in each chunk. If None, each chunk holds about
+            CHUNK_BYTES of rows.
+        kwargs:
+            Any keyword argument of the simplexer such as method.
+
+    Returns:
+        The out array or, if out is a path, the memory map of the created .npy
+        file.
+
+    Raises:
+        A ValueError is issued if simplex is not 'positive' or 'capped' or if
+        out and source differ in shape.
+
+    Examples:
+        >>> x = np.random.default_rng(0).normal(size=(10, 4))
+        >>> result = project_to(x, np.empty_like(x), 'positive', chunksize=3)
+        >>> np.allclose(np.sum(result, axis=1), 1)
+        True
+    """
+
+    arr = _open(source)
+    result: npt.NDArray
+    if isinstance(out, (str, os.PathLike)):
+        result = np.lib.format.open_memmap(
+            out,
+            mode='w+',
+            dtype=arraytools.result_dtype(arr.dtype),
+            shape=arr.shape,
+        )
+    else:
+        result = out
+    if result.shape != arr.shape:
+        msg = f'out shape {result.shape} must match source shape {arr.shape}'
+        raise ValueError(msg)
+
+    for _ in _project_chunks(arr, simplex, s, chunksize, result, **kwargs):
+        pass
+
+    if isinstance(result, np.memmap):
+        result.flush()
+
+    return result
@@ -0,0 +1,131 @@
+"""Tools for calibrating the cost model that selects the fastest projection
+method for method='auto' on this machine.
+
+Functions:
+    calibrate:
+        Times each method of the positive and capped simplexers on a grid of
+        batch shapes and fits a cost model to the timings.
+
+Typical usage example:
+    >>> from simplexers import tuning
+    >>> model = tuning.calibrate() # doctest: +SKIP
+    >>> model.save('simplexers_costs.json') # doctest: +SKIP
+    >>> # in later sessions
+    >>> from simplexers.core import costs
+    >>> costs.set_model(costs.CostModel.load('simplexers_costs.json'))
+    ... # doctest: +SKIP
+"""
+
+from functools import partial
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers import capped
+from simplexers import positive
+from simplexers.core import compiled
+from simplexers.core import costs
+
+# the simplexer of each simplex
+SIMPLEXERS: Dict[str, Callable[..., npt.NDArray]] = {
+    'positive': positive.positive_simplexer,
+    'capped': capped.capped_simplexer,
+}
+
+# the batch shapes (m, n) timed by default
+SHAPES = tuple(
+    (m, n)
+    for m in (1, 16, 256, 4096)
+    for n in (4, 16, 64, 256, 1024, 4096)
+    if m * n <= 2**20
+)
+
+
+def _best_time(func: Callable[[], object], repeats: int) -> float:
+    """Returns the shortest of repeats timings of a call to func."""
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def _fit(timings: List[Tuple[int, int, float]]) -> List[float]:
+    """Returns the nonnegative coefficients of the cost features that
+    minimize the relative error of the predicted timings."""
+
+    # scipy is imported on first use to keep importing simplexers fast
+    # pylint: disable-next=import-outside-toplevel
+    from scipy import optimize
+
+    design = np.array([costs.features(m, n) for m, n, _ in timings])
+    seconds = np.array([t for _, _, t in timings])
+    # scale each feature to unit size so that nnls is well conditioned
+    scales = np.max(design, axis=0)
+    weighted = design / scales / seconds[:, np.newaxis]
+    coeffs, _ = optimize.nnls(weighted, np.ones(len(seconds)))
+    return [float(c) for c in coeffs / scales]
+
+
+def calibrate(
+    shapes: Sequence[Tuple[int, int]] = SHAPES,
+    repeats: int = 3,
+    budget: float = 0.5,
+    seed: Optional[int] = 0,
+) -> costs.CostModel:
+    """Times each method of the positive and capped simplexers with each
+    available backend and fits a cost model to the timings.
+
+    Each method is timed on random normal batches of each shape in order of
+    increasing size. Once a method takes longer than budget on a shape, larger
+    shapes are skipped for that method and its cost is extrapolated by the
+    fitted model. A calibration therefore takes seconds to a few minutes.
+
+    Args:
+        shapes:
+            A sequence of (m, n) batch shapes of m vectors of n components.
+        repeats:
+            The number of timings of each method and shape of which the
+            shortest is used.
+        budget:
+            The number of seconds after which a method is not timed on larger
+            shapes.
+        seed:
+            The seed of the random batches.
+
+    Returns:
+        A CostModel fitted to the timings that can be passed to
+        costs.set_model and saved for later sessions.
+    """
+
+    rng = np.random.default_rng(seed)
+    ordered = sorted(shapes, key=lambda shape: shape[0] * shape[1])
+    backends = ['numpy', 'numba'] if compiled.AVAILABLE else ['numpy']
+
+    coefficients: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+    for backend in backends:
+        coefficients[backend] = {}
+        for simplex, simplexer in SIMPLEXERS.items():
+            module = positive if simplex == 'positive' else capped
+            coefficients[backend][simplex] = {}
+            for method in module.METHODS:
+
+                timings = []
+                for m, n in ordered:
+                    arr = rng.normal(size=(m, n))
+                    call = partial(
+                        simplexer, arr, 1, method=method, backend=backend
+                    )
+                    seconds = _best_time(call, repeats)
+                    timings.append((m, n, seconds))
+                    if seconds > budget:
+                        break
+
+                coefficients[backend][simplex][method] = _fit(timings)
+
+    return costs.CostModel(coefficients)
@@ -0,0 +1,142 @@
+"""A stateful simplexer that warm-starts each projection from the Lagrange
+multipliers of its previous projection.
+
+Classes:
+    WarmSimplexer:
+        A callable that projects arrays onto the positive or s-capped simplex
+        reusing the multipliers and memory of its previous projection.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from simplexers import capped
+from simplexers import positive
+from simplexers.core import arraytools
+from simplexers.core.workspace import Workspace
+
+# the lower and upper component bounds of each simplex's projection
+BOUNDS: Dict[str, Tuple[float, Optional[float]]] = {
+    'positive': (0, None),
+    'capped': (0, 1),
+}
+
+
+class WarmSimplexer:
+    """A callable that warm-starts the projection of arrays onto a simplex
+    from the Lagrange multipliers of its previous projection.
+
+    Iterative solvers such as projected gradient descent project nearly the
+    same vectors on every iteration. The multipliers of these projections
+    change little between iterations so this simplexer starts the bisect
+    method of the positive or capped simplexer from the multipliers of the
+    last projection. Once the support of the projections stops changing,
+    each projection needs only one or two Newton iterations. The workspace
+    buffers of the method are also reused across calls.
+
+    Attributes:
+        simplex:
+            The name of the simplex to project onto. One of {'positive',
+            'capped'}.
+        s:
+            The sum constraint of each vector. A scalar or an array
+            broadcastable to the shape of the projected arrays with axis
+            removed.
+        axis:
+            The axis of the projected arrays containing vector components.
+        multipliers:
+            The Lagrange multipliers of the last projection with the shape of
+            the last projected array except along axis where the length is 1.
+            None before the first projection.
+        workspace:
+            The Workspace holding the intermediate arrays of the projections.
+        kwargs:
+            The xtol, rtol and maxiter tolerances of the bisect method.
+
+    Examples:
+        >>> import numpy as np
+        >>> rng = np.random.default_rng(0)
+        >>> x = rng.uniform(0, 3, size=(4, 100))
+        >>> simplexer = WarmSimplexer('capped', s=2)
+        >>> for _ in range(3):
+        ...     projection = simplexer(x)
+        ...     x = x - 0.01 * rng.normal(size=x.shape)
+        >>> np.allclose(np.sum(projection, axis=-1), 2)
+        True
+    """
+
+    def __init__(
+        self,
+        simplex: str = 'capped',
+        s: npt.ArrayLike = 1,
+        axis: int = -1,
+        **kwargs,
+    ) -> None:
+        """Initialize this simplexer with no previous multipliers.
+
+        Raises:
+            A ValueError is issued if simplex is not 'positive' or 'capped'.
+        """
+
+        if simplex not in BOUNDS:
+            msg = f'simplex must be one of {list(BOUNDS)} not {simplex}'
+            raise ValueError(msg)
+
+        self.simplex = simplex
+        self.s = s
+        self.axis = axis
+        self.kwargs = kwargs
+        self.multipliers: Optional[npt.NDArray] = None
+        self.workspace = Workspace()
+
+    def reset(self) -> None:
+        """Discards the multipliers of the last projection so that the next
+        projection starts cold."""
+
+        self.multipliers = None
+
+    def __call__(
+        self,
+        arr: npt.NDArray,
+        out: Optional[npt.NDArray] = None,
+    ) -> npt.NDArray:
+        """Projects each 1-D array of arr along axis onto this simplex.
+
+        Args:
+            arr:
+                An N-D array of vectors to project. If its number of vectors
+                differs from that of the last projection, the projection starts
+                cold.
+            out:
+                An optional float array with the same shape as arr in which to
+                store the projections.
+
+        Returns:
+            An array of vector projections with the same shape as arr.
+        """
+
+        methods = {'positive': positive.METHODS, 'capped': capped.METHODS}
+        algorithm = methods[self.simplex]['bisect']
+
+        dtype = arraytools.working_dtype(arr.dtype)
+        z = arraytools.flatten_along_axis(arr, self.axis, dtype)
+        sums = arraytools.flatten_batch(self.s, arr.shape, self.axis, dtype)
+        guess = None
+        if self.multipliers is not None and self.multipliers.size == len(z):
+            guess = arraytools.flatten_along_axis(self.multipliers, self.axis)
+
+        multipliers = algorithm(
+            z, sums, guess=guess, workspace=self.workspace, **self.kwargs
+        )
+        self.multipliers = arraytools.unflatten_along_axis(
+            multipliers, arr.shape, self.axis
+        )
+
+        if out is None:
+            out = np.empty_like(arr, dtype=arraytools.result_dtype(arr.dtype))
+        result: npt.NDArray = np.subtract(arr, self.multipliers, out=out)
+        np.clip(result, *BOUNDS[self.simplex], out=result)
+
+        return result
@@ -0,0 +1,93 @@
+"""A module for testing the array API methods of the simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_arrayapi
+    >>> # test specific function
+    >>> !pytest test_arrayapi::test_methods
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive
+from simplexers.core import arrayapi
+
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize(
+    'simplex, method',
+    [
+        ('positive', 'sort'),
+        ('positive', 'bisect'),
+        ('capped', 'root'),
+        ('capped', 'bisect'),
+    ],
+)
+@pytest.mark.parametrize('axis', [0, 1, -1])
+def test_methods(rng, simplex, method, axis):
+    """Validates that the array API methods run in NumPy's namespace match
+    the NumPy simplexers for per-vector sum constraints."""
+
+    simplexers = {
+        'positive': positive.positive_simplexer,
+        'capped': capped.capped_simplexer,
+    }
+    arr = rng.normal(scale=2, size=(6, 20, 30))
+    shape = list(arr.shape)
+    shape.pop(axis)
+    s = rng.uniform(1, 5, size=shape)
+
+    result = arrayapi.project(simplex, arr, s, axis, method)
+    expected = simplexers[simplex](arr, s, axis=axis)
+    assert np.allclose(result, expected)
+
+@pytest.mark.parametrize(
+    'dtype, expected',
+    [
+        (np.float32, np.float32),
+        (np.float16, np.float16),
+        (np.int64, np.float64),
+    ],
+)
+def test_dtypes(rng, dtype, expected):
+    """Validates that floating arrays keep their dtype and other arrays are
+    projected in float64."""
+
+    arr = rng.normal(scale=4, size=(20, 30)).astype(dtype)
+    result = arrayapi.project('positive', arr, 1)
+    assert result.dtype == expected
+    assert np.allclose(result.sum(axis=-1), 1, atol=1e-2)
+
+def test_unsupported_options(rng):
+    """Validates that methods and options that require ndarrays raise
+    ValueErrors."""
+
+    arr = rng.normal(size=(4, 10))
+    with pytest.raises(ValueError):
+        arrayapi.project('positive', arr, 1, method='filter')
+
+    for option in ({'k': 3}, {'inplace': True}, {'n_jobs': 2}):
+        with pytest.raises(ValueError):
+            arrayapi.project('capped', arr, 2, **option)
+
+def test_strict_dispatch(rng):
+    """Validates that the simplexers project arrays of a non-NumPy namespace
+    without converting them to NumPy arrays."""
+
+    xp = pytest.importorskip('array_api_strict')
+    arr = rng.normal(scale=2, size=(10, 40))
+    for simplexer, s in [
+        (positive.positive_simplexer, 1),
+        (capped.capped_simplexer, 3),
+    ]:
+        result = simplexer(xp.asarray(arr), s, axis=0)
+        assert not isinstance(result, np.ndarray)
+        assert np.allclose(np.asarray(result), simplexer(arr, s, axis=0))
@@ -0,0 +1,111 @@
+"""A module for testing the weighted box-constrained simplexer.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_boxed
+    >>> # test specific function
+    >>> !pytest test_boxed::test_boxed_constraints
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import boxed, capped, positive
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_boxed_capped_agreement(rng, s, axis):
+    """Validates that unit weights and unit boxes reproduce the capped
+    simplex projection and unbounded boxes the positive simplex projection."""
+
+    arr = rng.uniform(0, 3, size=(40, 50))
+
+    expected = capped.capped_simplexer(arr, s=s, axis=axis)
+    assert np.allclose(boxed.boxed_simplexer(arr, s=s, axis=axis), expected)
+
+    expected = positive.positive_simplexer(arr, s=s, axis=axis)
+    projection = boxed.boxed_simplexer(arr, s=s, axis=axis, upper=np.inf)
+    assert np.allclose(projection, expected)
+
+@pytest.mark.parametrize('axis', [0, 1])
+def test_boxed_constraints(rng, axis):
+    """Validates that projections with per-component weights and bounds
+    satisfy the weighted sum and bound constraints."""
+
+    arr = rng.normal(scale=3, size=(40, 50))
+    shape = [1, 1]
+    shape[axis] = arr.shape[axis]
+    weights = rng.uniform(0.5, 2, size=shape)
+    lower = rng.uniform(-1, 0, size=shape)
+    upper = lower + rng.uniform(0.5, 2, size=shape)
+    sums = rng.uniform(0, 5, size=arr.shape[1 - axis])
+
+    projection = boxed.boxed_simplexer(
+        arr, s=sums, axis=axis, weights=weights, lower=lower, upper=upper
+    )
+
+    assert np.allclose(np.sum(weights * projection, axis=axis), sums)
+    assert np.all((projection >= lower) & (projection <= upper))
+
+def test_boxed_optimality(rng):
+    """Validates the KKT conditions of a weighted projection, each component
+    strictly inside its bounds must lie on a common line y - gamma * w."""
+
+    arr = rng.normal(scale=3, size=(20, 30))
+    weights = rng.uniform(0.5, 2, size=30)
+    lower, upper = -1, 1
+    projection = boxed.boxed_simplexer(
+        arr, s=4, weights=weights, lower=lower, upper=upper
+    )
+
+    gammas = (arr - projection) / weights
+    for gamma, proj in zip(gammas, projection):
+        interior = (proj > lower) & (proj < upper)
+        assert np.allclose(gamma[interior], gamma[interior][0])
+        assert np.all(gamma[proj == upper] >= gamma[interior][0] - 1e-9)
+        assert np.all(gamma[proj == lower] <= gamma[interior][0] + 1e-9)
+
+def test_boxed_infeasible(rng):
+    """Validates that a ValueError is raised if the sum constraint can not be
+    met or if components are unbounded in both directions."""
+
+    arr = rng.uniform(size=(4, 10))
+    with pytest.raises(ValueError):
+        boxed.boxed_simplexer(arr, s=20)
+
+    with pytest.raises(ValueError):
+        boxed.boxed_simplexer(arr, s=1, lower=-np.inf, upper=np.inf)
+
+@pytest.mark.parametrize('weight', [0, -1])
+def test_boxed_weights(rng, weight):
+    """Validates that a ValueError is raised if any weight is not positive."""
+
+    arr = rng.uniform(size=(4, 10))
+    weights = rng.uniform(1, 2, size=(4, 10))
+    weights[2, 3] = weight
+    with pytest.raises(ValueError):
+        boxed.boxed_simplexer(arr, s=1, weights=weights)
+
+def test_boxed_float32(rng):
+    """Validates that float32 arrays are projected in float32 and agree with
+    float64 projections of the same values."""
+
+    arr = rng.normal(scale=3, size=(20, 30)).astype(np.float32)
+    weights = rng.uniform(0.5, 2, size=30)
+    expected = boxed.boxed_simplexer(
+        arr.astype(float), s=4, weights=weights, lower=-1, upper=1
+    )
+    projection = boxed.boxed_simplexer(
+        arr, s=4, weights=weights, lower=-1, upper=1
+    )
+
+    assert projection.dtype == np.float32
+    assert np.allclose(projection, expected, atol=1e-5)
@@ -0,0 +1,97 @@
+"""A module for testing the compiled kernels and the backend option of the
+simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_compiled
+    >>> # test specific function
+    >>> !pytest test_compiled::test_kernel_agreement
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive
+from simplexers.core import compiled
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('s', [0.5, 1, 3, 7.5])
+def test_kernel_agreement(rng, s):
+    """Validates that the compiled kernels, or their Python loops if numba is
+    not installed, agree with the NumPy methods."""
+
+    arr = rng.normal(scale=2, size=(40, 30))
+    sums = np.full((40, 1), s)
+
+    expected = positive.METHODS['sort'](arr, sums)
+    assert np.allclose(compiled.positive_filter(arr, sums), expected)
+
+    # capped multipliers are not unique for integer s so compare projections
+    expected = np.clip(arr - capped.METHODS['root'](arr, sums), 0, 1)
+    for kernel in [compiled.capped_sort, compiled.capped_root]:
+        projection = np.clip(arr - kernel(arr, sums), 0, 1)
+        assert np.allclose(projection, expected)
+
+@pytest.mark.parametrize('simplexer, method', [
+    (positive.positive_simplexer, 'filter'),
+    (capped.capped_simplexer, 'sort'),
+    (capped.capped_simplexer, 'root'),
+])
+def test_numba_backend(rng, simplexer, method):
+    """Validates that the numba backend agrees with the numpy backend."""
+
+    pytest.importorskip('numba')
+    arr = rng.normal(scale=2, size=(3, 40, 30))
+    expected = simplexer(arr, 2, axis=1, method=method, backend='numpy')
+    projection = simplexer(arr, 2, axis=1, method=method, backend='numba')
+
+    assert np.allclose(projection, expected)
+
+def test_backend_errors(rng):
+    """Validates that unknown backends raise a ValueError and that the numba
+    backend raises an ImportError if numba is not installed."""
+
+    arr = rng.normal(size=(4, 10))
+    with pytest.raises(ValueError):
+        capped.capped_simplexer(arr, backend='cython')
+
+    if not compiled.AVAILABLE:
+        with pytest.raises(ImportError):
+            positive.positive_simplexer(arr, 1, backend='numba')
+
+def test_brentq_kwargs(rng):
+    """Validates that the default root method accepts brentq keyword arguments
+    and that the numba backend rejects them with a ValueError."""
+
+    arr = rng.normal(scale=2, size=(5, 20))
+    projection = capped.capped_simplexer(arr, 2, disp=False)
+    assert np.allclose(np.sum(projection, axis=-1), 2)
+
+    if compiled.AVAILABLE:
+        with pytest.raises(ValueError):
+            capped.capped_simplexer(arr, 2, backend='numba', disp=False)
+
+def test_zero_sum_filter(rng):
+    """Validates that the filter kernel projects vectors onto the zero sum
+    positive simplex."""
+
+    arr = rng.normal(size=(6, 15))
+    thetas = compiled.positive_filter(arr, np.zeros((6, 1)))
+    assert np.allclose(np.maximum(arr - thetas, 0), 0)
+
+def test_float32_root(rng):
+    """Validates that the root kernel converges on float32 vectors with
+    tolerances below the spacing of float32s."""
+
+    arr = rng.normal(scale=2, size=(20, 50)).astype(np.float32)
+    sums = np.full((20, 1), 3, dtype=np.float32)
+    gammas = compiled.capped_root(arr, sums, maxiter=60)
+    projection = np.clip(arr - gammas, 0, 1)
+    assert np.allclose(np.sum(projection, axis=-1), 3, atol=1e-4)
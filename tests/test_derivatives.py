@@ -0,0 +1,91 @@
+"""A module for testing the Jacobian-vector and vector-Jacobian products of the
+simplex projections.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_derivatives
+    >>> # test specific function
+    >>> !pytest test_derivatives::test_finite_differences
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, derivatives, positive
+
+# the simplexer & products of each simplex
+SIMPLICES = {
+    'positive': (
+        positive.positive_simplexer,
+        derivatives.positive_jvp,
+        derivatives.positive_vjp,
+    ),
+    'capped': (
+        capped.capped_simplexer,
+        derivatives.capped_jvp,
+        derivatives.capped_vjp,
+    ),
+}
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('simplex', ['positive', 'capped'])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_finite_differences(rng, simplex, axis):
+    """Validates that the JVPs match central finite differences of the
+    projections."""
+
+    simplexer, jvp, _ = SIMPLICES[simplex]
+    arr = rng.normal(scale=2, size=(20, 30))
+    tangents = rng.normal(size=arr.shape)
+    projection = simplexer(arr, 3, axis=axis, method='sort')
+
+    eps = 1e-7
+    upper = simplexer(arr + eps * tangents, 3, axis=axis, method='sort')
+    lower = simplexer(arr - eps * tangents, 3, axis=axis, method='sort')
+    expected = (upper - lower) / (2 * eps)
+
+    assert np.allclose(jvp(projection, tangents, axis=axis), expected)
+
+@pytest.mark.parametrize('simplex', ['positive', 'capped'])
+def test_dense_jacobians(rng, simplex):
+    """Validates that the products of each vector match products with its
+    dense Jacobian diag(a) - a @ a.T / sum(a)."""
+
+    simplexer, jvp, vjp = SIMPLICES[simplex]
+    arr = rng.normal(scale=2, size=(10, 15))
+    vectors = rng.normal(size=arr.shape)
+    projection = simplexer(arr, 2)
+
+    jvps = jvp(projection, vectors)
+    vjps = vjp(projection, vectors)
+    for p, v, jv, vj in zip(projection, vectors, jvps, vjps):
+        upper = np.inf if simplex == 'positive' else 1
+        active = (p > 0) & (p < upper)
+        a = active.astype(float)[:, np.newaxis]
+        jacobian = np.diag(a[:, 0]) - a @ a.T / max(a.sum(), 1)
+        assert np.allclose(jv, jacobian @ v)
+        assert np.allclose(vj, v @ jacobian)
+
+def test_products_dtype_out(rng):
+    """Validates that products keep the projection's float32 dtype and may be
+    stored to out."""
+
+    arr = rng.normal(scale=2, size=(3, 4, 50)).astype(np.float32)
+    projection = positive.positive_simplexer(arr, 1)
+    cotangents = rng.normal(size=arr.shape).astype(np.float32)
+
+    result = derivatives.positive_vjp(projection, cotangents)
+    assert result.dtype == np.float32
+    out = np.empty_like(result)
+    assert derivatives.positive_vjp(projection, cotangents, out=out) is out
+    assert np.array_equal(out, result)
+
+    with pytest.raises(ValueError):
+        derivatives.positive_vjp(projection, cotangents[..., :-1])
@@ -0,0 +1,49 @@
+"""A module for testing the lazy imports of the simplexers package.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_imports
+    >>> # test specific function
+    >>> !pytest test_imports::test_no_scipy_on_import
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import simplexers
+from simplexers import capped, positive
+
+@pytest.mark.parametrize('module', ['simplexers', 'simplexers.positive',
+                                    'simplexers.capped'])
+def test_no_scipy_on_import(module):
+    """Validates that importing the simplexers in a fresh interpreter does not
+    import scipy or numba."""
+
+    code = (
+        f'import sys, {module}\n'
+        'heavy = [m for m in sys.modules if m.startswith(("scipy", "numba"))]\n'
+        'print(len(heavy))'
+    )
+    completed = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert int(completed.stdout) == 0
+
+def test_top_level_simplexers():
+    """Validates that the package exposes the simplexers of its modules."""
+
+    assert simplexers.positive_simplexer is positive.positive_simplexer
+    assert simplexers.capped_simplexer is capped.capped_simplexer
+    assert {'positive_simplexer', 'capped_simplexer'} <= set(dir(simplexers))
+
+def test_missing_attribute():
+    """Validates that accessing an undefined attribute raises an
+    AttributeError."""
+
+    with pytest.raises(AttributeError):
+        _ = simplexers.not_a_simplexer
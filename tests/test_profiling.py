@@ -0,0 +1,108 @@
+"""A module for testing the profiling instrumentation of the simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_profiling
+    >>> # test specific function
+    >>> !pytest test_profiling::test_phases
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive
+from simplexers.core import profiling
+from simplexers.core.results import ProjectionInfo
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('simplex, method, phase', [
+    ('positive', 'sort', 'positive.sort.cumsum'),
+    ('positive', 'filter', 'positive.filter.threshold'),
+    ('positive', 'bisect', 'positive.bisect.newton'),
+    ('capped', 'sort', 'capped.sort.partition'),
+    ('capped', 'root', 'capped.root.brentq'),
+    ('capped', 'bisect', 'capped.bisect.newton'),
+    ('capped', 'breakpoint', 'capped.breakpoint.sort'),
+])
+def test_phases(rng, simplex, method, phase):
+    """Validates that the phases of each method are timed and that profiling
+    leaves the projections unchanged."""
+
+    simplexers = {
+        'positive': positive.positive_simplexer,
+        'capped': capped.capped_simplexer,
+    }
+    arr = rng.normal(scale=2, size=(30, 20))
+    expected = simplexers[simplex](arr, 2, method=method, backend='numpy')
+    with profiling.profile() as prof:
+        projection = simplexers[simplex](
+            arr, 2, method=method, backend='numpy'
+        )
+
+    assert np.allclose(projection, expected)
+    assert prof.seconds[phase] >= 0
+    assert prof.counts[f'{simplex}.multipliers'] == 1
+    assert prof.rows == 30
+    assert prof.calls[0]['components'] == 20
+    assert prof.calls[0]['method'] == method
+
+@pytest.mark.parametrize('method', ['root', 'bisect'])
+def test_iterations(rng, method):
+    """Validates that the solver iterations of the iterative methods are
+    recorded only for calls given a ProjectionInfo."""
+
+    arr = rng.normal(scale=2, size=(10, 50))
+    with profiling.profile() as prof:
+        capped.capped_simplexer(arr, 3, method=method, backend='numpy')
+    assert prof.iterations == 0
+
+    with profiling.profile() as prof:
+        capped.capped_simplexer(
+            arr, 3, method=method, backend='numpy', info=ProjectionInfo()
+        )
+    assert prof.iterations >= len(arr)
+
+def test_callback(rng):
+    """Validates that the callback receives the record of each call."""
+
+    records = []
+    arr = rng.normal(scale=2, size=(8, 12))
+    with profiling.profile(callback=records.append, memory=True) as prof:
+        positive.positive_simplexer(arr, 1)
+        capped.capped_simplexer(arr, 2)
+
+    assert [r['simplexer'] for r in records] == ['positive', 'capped']
+    assert records == prof.calls
+    assert prof.peak_bytes > 0
+
+def test_disabled(rng):
+    """Validates that nothing is recorded outside of a profile."""
+
+    with profiling.profile() as prof:
+        pass
+    capped.capped_simplexer(rng.normal(size=(4, 5)), 2)
+
+    assert not profiling.enabled()
+    assert not prof.calls and not prof.seconds
+    assert profiling.phase('capped.root.brentq') is profiling.phase('')
+
+def test_given_info(rng):
+    """Validates that a profiled call fills the ProjectionInfo it is given and
+    records the call's batch size along any axis."""
+
+    arr = rng.normal(scale=2, size=(6, 25, 4))
+    info = ProjectionInfo()
+    with profiling.profile() as prof:
+        capped.capped_simplexer(arr, 2, axis=1, method='bisect', info=info)
+
+    assert info.iterations.shape == (6, 1, 4)
+    assert prof.iterations == np.sum(info.iterations)
+    assert prof.calls[0]['rows'] == 24
+    assert prof.calls[0]['components'] == 25
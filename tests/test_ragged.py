@@ -0,0 +1,85 @@
+"""A module for testing the ragged simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_ragged
+    >>> # test specific function
+    >>> !pytest test_ragged::test_ragged_agreement
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive, ragged
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('s', [0.5, 2, 'per-vector'])
+def test_ragged_agreement(rng, dtype, s):
+    """Validates that ragged projections agree with dense projections of each
+    vector for every method."""
+
+    lengths = rng.integers(3, 150, size=40)
+    lengths[5] = 3
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = rng.normal(scale=3, size=offsets[-1]).astype(dtype)
+    sums = rng.uniform(1, 3, size=40) if s == 'per-vector' else np.full(40, s)
+    vectors = np.split(values, offsets[1:-1])
+
+    tol = 1e-5 if dtype == np.float32 else 1e-8
+    for method in ['sort', 'filter', 'bisect']:
+        projection = ragged.ragged_positive_simplexer(
+            values, offsets, sums, method=method
+        )
+        assert projection.dtype == dtype
+        expected = np.concatenate([
+            positive.positive_simplexer(v, t) for v, t in zip(vectors, sums)
+        ])
+        assert np.allclose(projection, expected, atol=tol)
+
+    for method in ['root', 'bisect', 'sort']:
+        projection = ragged.ragged_capped_simplexer(
+            values, offsets, sums, method=method
+        )
+        expected = np.concatenate([
+            capped.capped_simplexer(v, t) for v, t in zip(vectors, sums)
+        ])
+        assert np.allclose(projection, expected, atol=tol)
+
+def test_ragged_errors(rng):
+    """Validates that offsets that do not delimit nonempty segments of values
+    raise ValueErrors."""
+
+    values = rng.normal(size=10)
+    for offsets in ([0, 4, 9], [1, 4, 10], [0, 4, 4, 10], [[0, 10]]):
+        with pytest.raises(ValueError):
+            ragged.ragged_positive_simplexer(values, offsets)
+
+@pytest.mark.parametrize('method', ['root', 'bisect', 'breakpoint', 'sort'])
+def test_ragged_full_segments(rng, method):
+    """Validates that segments whose sum constraint equals their length,
+    including length-1 segments, project to ones."""
+
+    lengths = np.array([1, 4, 1, 3, 7])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = rng.normal(scale=3, size=offsets[-1])
+    sums = np.array([1, 2, 1, 3, 2.5])
+    vectors = np.split(values, offsets[1:-1])
+
+    projection = ragged.ragged_capped_simplexer(
+        values, offsets, sums, method=method
+    )
+    full = np.repeat(sums == lengths, lengths)
+    assert np.all(projection[full] == 1)
+    expected = np.concatenate([
+        capped.capped_simplexer(v, t, method=method)
+        for v, t, n in zip(vectors, sums, lengths) if t < n
+    ])
+    assert np.allclose(projection[~full], expected)
@@ -7,11 +7,15 @@ Typical usage example:
     >>> !pytest test_simplexers::test_positive_sums
 """
 
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pytest
 from pytest_lazyfixture import lazy_fixture
 
 from simplexers import positive, capped
+from simplexers.core.results import ProjectionInfo
+from simplexers.core.workspace import Workspace
 
 @pytest.fixture(scope='module')
 def rng():
@@ -52,6 +56,32 @@ def test_positive_sums(arr, s, axis):
     projection = positive.positive_simplexer(arr, s=s, axis=axis)
     assert np.allclose(np.sum(projection, axis=axis), s)
 
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_positive_filter_agreement(arr, s, axis):
+    """Validates that the filter and sort methods of the positive_simplexer
+    agree."""
+
+    sort_proj = positive.positive_simplexer(arr, s=s, axis=axis)
+    filter_proj = positive.positive_simplexer(
+        arr, s=s, axis=axis, method='filter'
+    )
+    assert np.allclose(sort_proj, filter_proj)
+
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_positive_bisect_agreement(arr, s, axis):
+    """Validates that the bisect and sort methods of the positive_simplexer
+    agree."""
+
+    sort_proj = positive.positive_simplexer(arr, s=s, axis=axis)
+    bisect_proj = positive.positive_simplexer(
+        arr, s=s, axis=axis, method='bisect'
+    )
+    assert np.allclose(sort_proj, bisect_proj)
+
 @pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
 @pytest.mark.parametrize('s', [1, 2, 3])
 @pytest.mark.parametrize('axis', [0, 1])
@@ -72,6 +102,28 @@ def test_capped_sums_sort(arr, s, axis):
     projection = capped.capped_simplexer(arr, s=s, axis=axis, method='sort')
     assert np.allclose(np.sum(projection, axis=axis), s)
 
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_capped_sums_bisect(arr, s, axis):
+    """Validates that a projection onto the capped simplex using the bisect
+    method of the capped simplexer satisfies the sum constraint."""
+
+    projection = capped.capped_simplexer(arr, s=s, axis=axis, method='bisect')
+    assert np.allclose(np.sum(projection, axis=axis), s)
+
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_capped_sums_breakpoint(arr, s, axis):
+    """Validates that a projection onto the capped simplex using the breakpoint
+    method of the capped simplexer satisfies the sum constraint."""
+
+    projection = capped.capped_simplexer(
+        arr, s=s, axis=axis, method='breakpoint'
+    )
+    assert np.allclose(np.sum(projection, axis=axis), s)
+
 @pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
 @pytest.mark.parametrize('s', [1, 2, 3])
 @pytest.mark.parametrize('axis', [0, 1])
@@ -120,11 +172,345 @@ def test_projection_agreement(arr, axis, s):
 
     assert np.allclose(root_proj, sort_proj)
 
-def test_shape_error(rng):
-    """Validates that a ValueError is raised if the input arr to
-    a positive_simplexer or capped simplexer has more than 2 dims."""
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_bisect_agreement(arr, axis, s):
+    """Validates that root and bisect capped projections agree."""
+
+    root_proj = capped.capped_simplexer(arr, s=s, axis=axis, method='root')
+    bisect_proj = capped.capped_simplexer(arr, s=s, axis=axis, method='bisect')
+
+    assert np.allclose(root_proj, bisect_proj)
+
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('s', [1, 2, 3])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_breakpoint_agreement(arr, axis, s):
+    """Validates that root and breakpoint capped projections agree."""
+
+    root_proj = capped.capped_simplexer(arr, s=s, axis=axis, method='root')
+    break_proj = capped.capped_simplexer(
+        arr, s=s, axis=axis, method='breakpoint'
+    )
+
+    assert np.allclose(root_proj, break_proj)
+
+def test_breakpoint_large(rng):
+    """Validates that the breakpoint and bisect methods agree on vectors with
+    thousands of components."""
+
+    arr = rng.normal(scale=3, size=(20, 5000))
+    break_proj = capped.capped_simplexer(arr, s=40, method='breakpoint')
+    bisect_proj = capped.capped_simplexer(arr, s=40, method='bisect')
+
+    assert np.allclose(break_proj, bisect_proj)
+
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('k', [1, 5, 1000])
+@pytest.mark.parametrize('method', ['sort', 'filter', 'bisect'])
+def test_positive_topk(arr, k, method):
+    """Validates that positive projections with a support bound k agree with
+    unbounded projections whether or not the bound holds."""
+
+    expected = positive.positive_simplexer(arr, s=2, method=method)
+    projection = positive.positive_simplexer(arr, s=2, method=method, k=k)
+
+    assert np.allclose(expected, projection)
+
+@pytest.mark.parametrize('arr', [lazy_fixture('random2D')])
+@pytest.mark.parametrize('k', [1, 5, 1000])
+@pytest.mark.parametrize('method', ['root', 'bisect', 'breakpoint', 'sort'])
+def test_capped_topk(arr, k, method):
+    """Validates that capped projections with a support bound k agree with
+    unbounded projections whether or not the bound holds."""
+
+    expected = capped.capped_simplexer(arr, s=2, method=method)
+    projection = capped.capped_simplexer(arr, s=2, method=method, k=k)
+
+    assert np.allclose(expected, projection)
+
+def test_topk_sparse(rng):
+    """Validates that a valid support bound on a large vector with a sparse
+    projection reproduces the unbounded projection."""
+
+    arr = rng.normal(size=(10, 100000))
+    expected = positive.positive_simplexer(arr, s=1)
+    projection = positive.positive_simplexer(arr, s=1, k=100)
+
+    assert np.count_nonzero(expected, axis=1).max() <= 100
+    assert np.allclose(expected, projection)
+
+def test_bisect_maxiter(rng):
+    """Validates that a RuntimeError is raised if the bisect method fails to
+    converge within maxiter iterations."""
+
+    arr = rng.uniform(0, 3, size=(10, 1000))
+    with pytest.raises(RuntimeError):
+        capped.capped_simplexer(arr, s=2, method='bisect', maxiter=1)
+
+@pytest.mark.parametrize('axis', [0, 1, 2, -1])
+def test_ndim_projections(rng, axis):
+    """Validates that projections of a 3-D array along any axis match the
+    projections of each of its 2-D slices."""
+
+    arr = rng.uniform(0, 3, size=(3, 10, 20))
+    positive_proj = positive.positive_simplexer(arr, s=2, axis=axis)
+    capped_proj = capped.capped_simplexer(arr, s=2, axis=axis)
+
+    assert positive_proj.shape == capped_proj.shape == arr.shape
+    other = 1 if axis == 0 else 0
+    sub_axis = axis - 1 if axis > other else axis
+    for idx in range(arr.shape[other]):
+        sub = np.take(arr, idx, axis=other)
+        expected = positive.positive_simplexer(sub, s=2, axis=sub_axis)
+        assert np.allclose(np.take(positive_proj, idx, axis=other), expected)
+        expected = capped.capped_simplexer(sub, s=2, axis=sub_axis)
+        assert np.allclose(np.take(capped_proj, idx, axis=other), expected)
+
+def test_1D_projections(rng):
+    """Validates that a 1-D array is projected to a 1-D array."""
+
+    arr = rng.uniform(0, 3, size=20)
+    projection = capped.capped_simplexer(arr, s=2, method='bisect')
+
+    assert projection.shape == arr.shape
+    assert np.isclose(np.sum(projection), 2)
+
+@pytest.mark.parametrize('simplexer, method', [
+    (positive.positive_simplexer, 'sort'),
+    (positive.positive_simplexer, 'filter'),
+    (capped.capped_simplexer, 'root'),
+    (capped.capped_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'breakpoint'),
+    (capped.capped_simplexer, 'sort'),
+])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_out_inplace_workspace(rng, simplexer, method, axis):
+    """Validates that projections stored to out, made inplace, or made with
+    a reused workspace match projections that allocate their own memory."""
+
+    arr = rng.uniform(0, 3, size=(30, 40))
+    expected = simplexer(arr, s=2, axis=axis, method=method)
+
+    out = np.empty_like(arr)
+    result = simplexer(arr, s=2, axis=axis, method=method, out=out)
+    assert result is out
+    assert np.allclose(out, expected)
+
+    ws = Workspace()
+    for _ in range(2):
+        result = simplexer(arr, s=2, axis=axis, method=method, workspace=ws)
+        assert np.allclose(result, expected)
+
+    copied = arr.copy()
+    result = simplexer(copied, s=2, axis=axis, method=method, inplace=True)
+    assert result is copied
+    assert np.allclose(copied, expected)
+
+@pytest.mark.parametrize('simplexer, method', [
+    (positive.positive_simplexer, 'sort'),
+    (positive.positive_simplexer, 'filter'),
+    (capped.capped_simplexer, 'root'),
+    (capped.capped_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'breakpoint'),
+    (capped.capped_simplexer, 'sort'),
+])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_per_vector_sums(rng, simplexer, method, axis):
+    """Validates that an array of sum constraints gives each vector its own
+    constraint and matches projecting each vector separately."""
+
+    arr = rng.uniform(0, 3, size=(30, 40))
+    sums = rng.integers(1, 5, size=arr.shape[1 - axis])
+    projection = simplexer(arr, s=sums, axis=axis, method=method)
+
+    assert np.allclose(np.sum(projection, axis=axis), sums)
+    for idx, s in enumerate(sums):
+        vector = np.take(arr, idx, axis=1 - axis)
+        expected = simplexer(vector, s=s, method=method)
+        assert np.allclose(np.take(projection, idx, axis=1 - axis), expected)
+
+def test_per_vector_sums_topk(rng):
+    """Validates that support bounds are honored with per-vector sums."""
+
+    arr = rng.normal(size=(3, 4, 500))
+    sums = np.array([1, 2, 3])[:, np.newaxis]
+    expected = capped.capped_simplexer(arr, s=sums, method='bisect')
+    projection = capped.capped_simplexer(arr, s=sums, method='bisect', k=20)
+
+    assert np.allclose(np.sum(projection, axis=-1), sums)
+    assert np.allclose(projection, expected)
+
+@pytest.mark.parametrize('simplexer, method', [
+    (positive.positive_simplexer, 'sort'),
+    (positive.positive_simplexer, 'filter'),
+    (positive.positive_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'root'),
+    (capped.capped_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'breakpoint'),
+])
+@pytest.mark.parametrize('n_jobs', [2, -1])
+def test_n_jobs(rng, simplexer, method, n_jobs):
+    """Validates that projections split across worker threads agree with
+    serial projections."""
+
+    arr = rng.normal(scale=2, size=(3, 50, 40))
+    expected = simplexer(arr, 2, axis=1, method=method)
+    projection = simplexer(arr, 2, axis=1, method=method, n_jobs=n_jobs)
+
+    assert np.allclose(projection, expected)
+
+def test_process_executor(rng):
+    """Validates that projections split across a process pool agree with
+    serial projections."""
+
+    arr = rng.normal(scale=2, size=(50, 40))
+    sums = rng.uniform(1, 3, size=(50,))
+    expected = capped.capped_simplexer(arr, sums, method='root')
+    with ProcessPoolExecutor(2) as executor:
+        projection = capped.capped_simplexer(
+            arr, sums, method='root', k=10, n_jobs=executor
+        )
+
+    assert np.allclose(projection, expected)
+
+@pytest.mark.parametrize('simplexer, method', [
+    (positive.positive_simplexer, 'sort'),
+    (positive.positive_simplexer, 'filter'),
+    (positive.positive_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'root'),
+    (capped.capped_simplexer, 'bisect'),
+    (capped.capped_simplexer, 'breakpoint'),
+    (capped.capped_simplexer, 'sort'),
+])
+@pytest.mark.parametrize('backend', ['numpy', 'auto'])
+@pytest.mark.parametrize('dtype, tol', [
+    (np.float32, 1e-5),
+    (np.float16, 1e-3),
+])
+def test_reduced_precision(rng, simplexer, method, backend, dtype, tol):
+    """Validates that float32 and float16 arrays are projected without
+    upcasting and that their projections lie within tol of the float64
+    projections of the same values and meet their sum constraints within
+    10 * tol."""
+
+    arr = rng.normal(scale=2, size=(20, 500)).astype(dtype)
+    expected = simplexer(arr.astype(float), 5, method='bisect')
+    projection = simplexer(arr, 5, method=method, backend=backend)
+
+    assert projection.dtype == dtype
+    assert np.allclose(projection, expected, rtol=tol, atol=tol)
+    sums = np.sum(projection, axis=1, dtype=float)
+    assert np.allclose(sums, 5, atol=10 * tol)
+
+    out = np.empty_like(arr)
+    simplexer(arr, 5, method=method, backend=backend, out=out)
+    assert np.array_equal(out, projection)
+
+def test_integer_arrays(rng):
+    """Validates that integer arrays are projected in float64."""
+
+    arr = rng.integers(-5, 5, size=(10, 20))
+    expected = capped.capped_simplexer(arr.astype(float), 3)
+    projection = capped.capped_simplexer(arr, 3)
+
+    assert projection.dtype == np.float64
+    assert np.allclose(projection, expected)
+
+@pytest.mark.parametrize('simplexer, method, cap', [
+    (positive.positive_simplexer, 'sort', None),
+    (positive.positive_simplexer, 'filter', None),
+    (positive.positive_simplexer, 'bisect', None),
+    (capped.capped_simplexer, 'root', 1),
+    (capped.capped_simplexer, 'bisect', 1),
+    (capped.capped_simplexer, 'breakpoint', 1),
+    (capped.capped_simplexer, 'sort', 1),
+])
+@pytest.mark.parametrize('backend', ['numpy', 'auto'])
+@pytest.mark.parametrize('kwargs', [{}, {'k': 10, 'n_jobs': 2}])
+def test_projection_info(rng, simplexer, method, cap, backend, kwargs):
+    """Validates that the recorded multipliers reproduce the projections and
+    that the recorded diagnostics match those of the projections."""
+
+    arr = rng.normal(scale=2, size=(6, 30, 5))
+    info = ProjectionInfo()
+    projection = simplexer(
+        arr, 3, axis=1, method=method, backend=backend, info=info, **kwargs
+    )
+
+    assert info.multipliers.shape == (6, 1, 5)
+    upper = np.inf if cap is None else cap
+    assert np.allclose(np.clip(arr - info.multipliers, 0, upper), projection)
+    support = np.count_nonzero(projection, axis=1, keepdims=True)
+    assert np.array_equal(info.support_sizes, support)
+    if cap is None:
+        assert info.cap_sizes is None
+    else:
+        caps = np.count_nonzero(projection == 1, axis=1, keepdims=True)
+        assert np.array_equal(info.cap_sizes, caps)
+
+    iterative = method in ('root', 'bisect')
+    assert np.all(info.iterations > 0) == iterative
+    assert np.all(info.converged)
+
+def test_projection_info_status(rng):
+    """Validates that brentq's convergence status is recorded when it is told
+    not to raise on failure."""
+
+    arr = rng.normal(scale=2, size=(10, 50))
+    info = ProjectionInfo()
+    capped.capped_simplexer(
+        arr, 2, method='root', backend='numpy', info=info, maxiter=2,
+        disp=False,
+    )
+
+    assert not np.all(info.converged)
+    assert np.all(info.iterations <= 2)
+
+@pytest.mark.parametrize('simplexer, method, s', [
+    (positive.positive_simplexer, 'sort', 1),
+    (positive.positive_simplexer, 'bisect', 1),
+    (positive.positive_simplexer, 'filter', 1),
+    (capped.capped_simplexer, 'root', 3),
+    (capped.capped_simplexer, 'breakpoint', 3),
+    (capped.capped_simplexer, 'sort', 3),
+    ])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_feasible_vectors(rng, simplexer, method, s, dtype):
+    """Validates that vectors already on the simplex are returned unchanged
+    without iterating and that the remaining vectors are projected."""
+
+    arr = rng.normal(scale=2, size=(40, 60)).astype(dtype)
+    # feasible rows of exactly representable components summing exactly to s
+    components = np.array([1] * (s - 1) + [0.5, 0.25, 0.25], dtype=dtype)
+    mixed = np.zeros_like(arr)
+    for row in mixed:
+        row[rng.permutation(arr.shape[1])[: len(components)]] = components
+    mixed[::4] = arr[::4]
+
+    info = ProjectionInfo()
+    projection = simplexer(mixed, s, method=method, info=info)
+    assert np.array_equal(projection[1::4], mixed[1::4])
+    assert np.all(info.multipliers[1::4] == 0)
+    assert np.all(info.iterations[1::4] == 0)
+    expected = simplexer(arr[::4], s, method=method)
+    assert np.allclose(projection[::4], expected, atol=1e-5)
+
+@pytest.mark.parametrize('simplexer, method, s', [
+    (positive.positive_simplexer, 'bisect', 1),
+    (capped.capped_simplexer, 'bisect', 3),
+    ])
+def test_skip_feasible(rng, simplexer, method, s):
+    """Validates that skipping the feasibility pass runs the method on feasible
+    vectors and leaves the projections unchanged."""
+
+    arr = rng.normal(scale=2, size=(20, 30))
+    feasible = simplexer(arr, s, method=method)
 
-    arr = rng.uniform(size=(3, 10, 100))
-    with pytest.raises(ValueError):
-        positive.positive_simplexer(arr, s=1, axis=1)
-        capped.capped_simplexer(arr, s=1, axis=1)
+    info = ProjectionInfo()
+    projection = simplexer(
+        feasible, s, method=method, check_feasible=False, info=info
+    )
+    assert np.allclose(projection, feasible)
+    assert np.all(info.iterations > 0)
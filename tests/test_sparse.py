@@ -0,0 +1,76 @@
+"""A module for testing the sparse simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_sparse
+    >>> # test specific function
+    >>> !pytest test_sparse::test_sparse_agreement
+"""
+
+import numpy as np
+import pytest
+from scipy import sparse as sp
+
+from simplexers import capped, positive, sparse
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('density', [0.01, 0.2, 1])
+@pytest.mark.parametrize('s', [0.5, 2, 30])
+def test_sparse_agreement(rng, density, s):
+    """Validates that sparse projections agree with dense projections including
+    rows whose implicit zeros project to nonzero values."""
+
+    matrix = sp.random_array((50, 80), density=density, rng=rng, format='csr')
+    matrix.data = rng.normal(scale=3, size=matrix.nnz)
+    dense = matrix.toarray()
+
+    projection = sparse.sparse_positive_simplexer(matrix, s=s)
+    expected = positive.positive_simplexer(dense, s=s)
+    assert isinstance(projection, sp.csr_array)
+    assert np.allclose(projection.toarray(), expected)
+
+    projection = sparse.sparse_capped_simplexer(matrix, s=s)
+    expected = capped.capped_simplexer(dense, s=s)
+    assert np.allclose(projection.toarray(), expected)
+
+    # the input's structure must be left untouched
+    assert np.array_equal(matrix.toarray(), dense)
+
+def test_sparse_formats(rng):
+    """Validates that per-row sums, non-CSR formats, sparse matrices and empty
+    rows are supported and that dense input raises a TypeError."""
+
+    dense = rng.uniform(0, 3, size=(20, 30)) * (rng.uniform(size=(20, 30)) < 0.2)
+    dense[3] = 0
+    sums = rng.uniform(1, 4, size=20)
+
+    projection = sparse.sparse_capped_simplexer(sp.coo_matrix(dense), s=sums)
+    assert isinstance(projection, sp.csr_matrix)
+    assert np.allclose(projection.toarray(), capped.capped_simplexer(dense, sums))
+    assert np.allclose(projection.sum(axis=1).ravel(), sums)
+
+    with pytest.raises(TypeError):
+        sparse.sparse_positive_simplexer(dense)
+
+@pytest.mark.parametrize('s', [1, 3])
+def test_implicit_rows(s):
+    """Validates that matrices storing no values are projected onto each
+    simplex like dense arrays of zeros."""
+
+    matrix = sp.csr_array((5, 10))
+    dense = np.zeros((5, 10))
+
+    projection = sparse.sparse_positive_simplexer(matrix, s=s)
+    expected = positive.positive_simplexer(dense, s=s)
+    assert np.allclose(projection.toarray(), expected)
+
+    projection = sparse.sparse_capped_simplexer(matrix, s=s)
+    expected = capped.capped_simplexer(dense, s=s)
+    assert np.allclose(projection.toarray(), expected)
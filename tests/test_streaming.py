@@ -0,0 +1,77 @@
+"""A module for testing the streaming simplexers.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_streaming
+    >>> # test specific function
+    >>> !pytest test_streaming::test_iter_projections
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive, streaming
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('chunksize', [None, 1, 7, 1000])
+def test_iter_projections(rng, chunksize):
+    """Validates that chunked projections of arrays and of iterables of row
+    blocks agree with projections of the whole array."""
+
+    arr = rng.normal(scale=2, size=(50, 30))
+    sums = rng.uniform(1, 3, size=50)
+
+    chunks = streaming.iter_projections(
+        arr, 'positive', sums, chunksize=chunksize, method='filter'
+    )
+    expected = positive.positive_simplexer(arr, sums)
+    assert np.allclose(np.concatenate(list(chunks)), expected)
+
+    blocks = np.array_split(arr, 4)
+    chunks = streaming.iter_projections(blocks, 'capped', 2, chunksize=chunksize)
+    expected = capped.capped_simplexer(arr, 2)
+    assert np.allclose(np.concatenate(list(chunks)), expected)
+
+def test_project_to_memmap(rng, tmp_path):
+    """Validates that projections of a memory-mapped .npy file written to
+    a created .npy file agree with in-memory projections."""
+
+    arr = rng.normal(scale=2, size=(100, 20))
+    np.save(tmp_path / 'source.npy', arr)
+
+    result = streaming.project_to(
+        tmp_path / 'source.npy', tmp_path / 'out.npy', 'capped', 3, chunksize=9
+    )
+    expected = capped.capped_simplexer(arr, 3)
+    assert isinstance(result, np.memmap)
+    assert np.allclose(np.load(tmp_path / 'out.npy'), expected)
+
+def test_project_to_float32(rng, tmp_path):
+    """Validates that the .npy file created for a float32 source is float32."""
+
+    arr = rng.normal(scale=2, size=(100, 20)).astype(np.float32)
+    np.save(tmp_path / 'source.npy', arr)
+
+    result = streaming.project_to(
+        tmp_path / 'source.npy', tmp_path / 'out.npy', 'positive', chunksize=9
+    )
+    assert result.dtype == np.float32
+    assert np.allclose(result, positive.positive_simplexer(arr, 1))
+
+def test_streaming_errors(rng):
+    """Validates that unknown simplices and mismatched outputs raise
+    ValueErrors."""
+
+    arr = rng.normal(size=(10, 5))
+    with pytest.raises(ValueError):
+        list(streaming.iter_projections(arr, 'boxed'))
+
+    with pytest.raises(ValueError):
+        streaming.project_to(arr, np.empty((5, 5)))
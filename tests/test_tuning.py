@@ -0,0 +1,76 @@
+"""A module for testing automatic method selection and its calibration.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_tuning
+    >>> # test specific function
+    >>> !pytest test_tuning::test_auto_agreement
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive, tuning
+from simplexers.core import costs
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('shape', [(1, 5), (200, 8), (20, 3000), (500, 500)])
+def test_auto_agreement(rng, shape):
+    """Validates that auto selected methods agree with fixed methods for
+    shapes that favor different methods."""
+
+    arr = rng.normal(scale=2, size=shape)
+
+    expected = positive.positive_simplexer(arr, 2, method='sort')
+    projection = positive.positive_simplexer(arr, 2, method='auto')
+    assert np.allclose(projection, expected)
+
+    expected = capped.capped_simplexer(arr, 2, method='bisect')
+    projection = capped.capped_simplexer(arr, 2, method='auto', k=50)
+    assert np.allclose(projection, expected)
+
+def test_auto_tolerances():
+    """Validates that auto selects a method accepting the given keyword
+    arguments."""
+
+    # methods that reject the keywords would raise a TypeError
+    arr = np.random.default_rng(0).normal(size=(10, 4))
+    projection = positive.positive_simplexer(arr, 1, method='auto', maxiter=50)
+    assert np.allclose(np.sum(projection, axis=-1), 1)
+
+    projection = capped.capped_simplexer(arr, 2, method='auto', xtol=1e-12)
+    assert np.allclose(np.sum(projection, axis=-1), 2)
+
+    # only brentq accepts disp
+    projection = capped.capped_simplexer(arr, 2, method='auto', disp=False)
+    assert np.allclose(np.sum(projection, axis=-1), 2)
+
+    with pytest.raises(ValueError):
+        positive.positive_simplexer(arr, 1, method='auto', disp=False)
+
+def test_calibrate_save_load(tmp_path):
+    """Validates that a calibrated model covers every method and survives
+    a save and load round trip."""
+
+    model = tuning.calibrate(shapes=[(1, 4), (8, 16), (32, 64)], repeats=1)
+    for simplex, module in [('positive', positive), ('capped', capped)]:
+        for method in module.METHODS:
+            assert np.isfinite(model.predict(simplex, method, 100, 100))
+
+    model.save(tmp_path / 'costs.json')
+    loaded = costs.CostModel.load(tmp_path / 'costs.json')
+    assert loaded.coefficients == model.coefficients
+
+    previous = costs.get_model()
+    costs.set_model(loaded)
+    try:
+        assert costs.get_model() is loaded
+    finally:
+        costs.set_model(previous)
@@ -0,0 +1,64 @@
+"""A module for testing the warm-started simplexer.
+
+Typical usage example:
+    >>> #run all test
+    >>> !pytest test_warm
+    >>> # test specific function
+    >>> !pytest test_warm::test_warm_agreement
+"""
+
+import numpy as np
+import pytest
+
+from simplexers import capped, positive
+from simplexers.warm import WarmSimplexer
+
+@pytest.fixture(scope='module')
+def rng():
+    """Returns a reusable numpy default_rng object for creating reproducible but
+    random arrays."""
+
+    seed = 0
+    return np.random.default_rng(seed)
+
+@pytest.mark.parametrize('simplex', ['positive', 'capped'])
+@pytest.mark.parametrize('axis', [0, 1])
+def test_warm_agreement(rng, simplex, axis):
+    """Validates that warm-started projections of slowly changing arrays agree
+    with cold projections."""
+
+    simplexers = {
+        'positive': positive.positive_simplexer,
+        'capped': capped.capped_simplexer,
+    }
+    arr = rng.normal(scale=2, size=(60, 80))
+    simplexer = WarmSimplexer(simplex, s=3, axis=axis)
+    for _ in range(4):
+        projection = simplexer(arr)
+        expected = simplexers[simplex](arr, s=3, axis=axis)
+        assert np.allclose(projection, expected)
+        arr = arr + 1e-3 * rng.normal(size=arr.shape)
+
+@pytest.mark.parametrize('simplex', ['positive', 'capped'])
+def test_warm_iterations(rng, simplex):
+    """Validates that projections warm-started near their multipliers converge
+    within a few iterations."""
+
+    arr = rng.normal(scale=2, size=(200, 300))
+    simplexer = WarmSimplexer(simplex, s=3)
+    simplexer(arr)
+
+    simplexer.kwargs['maxiter'] = 5
+    projection = simplexer(arr + 1e-4 * rng.normal(size=arr.shape))
+    assert np.allclose(np.sum(projection, axis=-1), 3)
+
+    # without the multipliers of the last projection more iterations are needed
+    simplexer.reset()
+    with pytest.raises(RuntimeError):
+        simplexer(arr)
+
+def test_warm_simplex_error():
+    """Validates that a ValueError is raised for an unknown simplex."""
+
+    with pytest.raises(ValueError):
+        WarmSimplexer('boxed')